@@ -1,77 +1,101 @@
 import random
-import math
-from collections import defaultdict
-from .utils import get_neighbors, get_move_direction
-from .informed import heuristic
-from constants import MOVE_COSTS
+from array import array
+from .utils import requires_solvable
+from .space import encode_problem, MOVE_COST_LIST
+from .heuristics import get_heuristic
+from .stats import PathList, SearchStats
 
+@requires_solvable
 def q_learning(initial_state, goal_state,
                episodes=2000, alpha=0.1, gamma=0.9,
                epsilon_start=1.0, epsilon_end=0.01,
                max_steps=100,
-               Q=None, distance_cache=None,
+               Q=None, heuristic_name=None,
                **kwargs):
-    if Q is None:
-        Q = defaultdict(lambda: defaultdict(float))
-    else:
-        Q = defaultdict(lambda: defaultdict(float), Q)
-    if distance_cache is None:
-        distance_cache = {}
+    """Tabular Q-learning over state codes, then a greedy walk along the learned values.
+
+    ``Q`` is the space's action-value table (``new_action_values``), read at
+    ``code * 4 + move``: a flat array of 181440 * 4 floats on the 8-puzzle,
+    a sparse dict on bigger boards. Pass the table of an earlier run with
+    the same goal to keep training it. The reward of a step from s to s' is
+    the potential-based shaping ``gamma * P(s') - P(s)`` with potential
+    P = -h, i.e. ``h(s) - gamma * h(s')``, which leaves the optimal policy
+    unchanged. h is not precomputed: each state's h is evaluated the first
+    time an episode reaches it and kept in a byte per code (-1 until then),
+    which also marks the states the greedy walk can follow, so memory is
+    fixed by the board size.
+    """
+    space, start_code, goal_code = encode_problem(initial_state, goal_state)
+    if not Q:
+        Q = space.new_action_values()
+    estimate = get_heuristic(heuristic_name, goal_state)
+    # h fits a signed byte up to 3x3; bigger boards keep a sparse map
+    potential = array('b', [-1]) * space.count if space.count else space.new_costs()
+    successors, cells = space.successors, space.cells
+    rand = random.random
+    potential[start_code] = estimate.evaluate(cells(start_code))
+    stats = SearchStats()
     epsilon = epsilon_start
     eps_decay = (epsilon_start - epsilon_end) / episodes
+    expanded = generated = max_depth = 0
+    evaluations = 1
 
-    def state_key(s): return str(s)
-
+    stats.setup_done()
     for ep in range(episodes):
-        state = initial_state
+        code = start_code
+        h = potential[code]
+        children = successors(code)
+        best = max(children, key=lambda mc: Q[code * 4 + mc[0]])
         for step in range(max_steps):
-            sk = state_key(state)
-            neigh = get_neighbors(state)
-            acts = [(get_move_direction(state, n), n) for n in neigh]
-
-            if random.random() < epsilon:
-                action, next_s = random.choice(acts)
+            expanded += 1
+            generated += len(children)
+            if rand() < epsilon:
+                move, child = children[int(rand() * len(children))]
             else:
-                vals = {a: Q[sk][a] for a, _ in acts}
-                action, next_s = max(acts, key=lambda x: vals.get(x[0], 0))
+                move, child = best
 
-            h_cur = heuristic(state, goal_state)
-            h_next = heuristic(next_s, goal_state)
-            reward = (h_cur - h_next)
+            h_next = potential[child]
+            if h_next < 0:
+                h_next = potential[child] = estimate.evaluate(cells(child))
+                evaluations += 1
+            next_children = successors(child)
 
-            nk = state_key(next_s)
-            future = Q[nk].values() and max(Q[nk].values()) or 0
-            Q[sk][action] += alpha * (reward + gamma * future - Q[sk][action])
+            # the child's best action is both the bootstrap target and the next greedy move
+            next_base = child * 4
+            best, future = None, None
+            for pair in next_children:
+                value = Q[next_base + pair[0]]
+                if future is None or value > future:
+                    best, future = pair, value
+            index = code * 4 + move
+            Q[index] += alpha * (h - gamma * h_next + gamma * future - Q[index])
 
-            state = next_s
-            if state == goal_state:
+            code, h, children = child, h_next, next_children
+            if code == goal_code:
                 break
+        max_depth = max(max_depth, step + 1)
 
         epsilon = max(epsilon_end, epsilon - eps_decay)
+    stats.iterations = episodes
+    stats.nodes_expanded, stats.nodes_generated = expanded, generated
+    stats.heuristic_evaluations, stats.max_depth = evaluations, max_depth
+    stats.search_done()
 
-    path = [initial_state]
+    codes = [start_code]
     costs = [0]
-    cur = initial_state
-    visited = {initial_state}
-    while cur != goal_state:
-        sk = state_key(cur)
-        if sk not in Q or not Q[sk]:
-            break
-        action = max(Q[sk].items(), key=lambda kv: kv[1])[0]
-        for n in get_neighbors(cur):
-            if get_move_direction(cur, n) == action:
-                nxt = n
-                break
-        else:
-            break
-
-        direction = action.lower()
-        step_cost = MOVE_COSTS.get(direction, 1)
-        costs.append(costs[-1] + step_cost)
-        path.append(nxt)
+    visited = {start_code}
+    code = start_code
+    # a state no episode reached has no values to follow
+    while code != goal_code and potential[code] >= 0:
+        base = code * 4
+        move, nxt = max(successors(code), key=lambda mc: Q[base + mc[0]])
+        costs.append(costs[-1] + MOVE_COST_LIST[move])
+        codes.append(nxt)
         if nxt in visited:
             break
         visited.add(nxt)
-        cur = nxt
+        code = nxt
 
-    return path, costs, []
\ No newline at end of file
+    path = space.decode_path(codes)
+    stats.path_done()
+    return path, costs, PathList(stats=stats)
@@ -1,15 +1,22 @@
 from .uninformed import bfs, dfs, ucs, ids
 from .informed import greedy, astar, ida_star
+from .parallel import parallel_ida_star
+from .bidirectional import bidirectional_bfs, bidirectional_ucs, bidirectional_astar
 from .local import simple_hill_climbing, stochastic_hill_climbing, simulated_annealing, beam_search, genetic_algorithm, steepest_ascent_hill_climbing
 from.complex import and_or_graph_search, no_observation_belief_state_search, partially_observable_search
 from .constraint import solve as solve
 from .Reforcement_learning import q_learning
+from .database import table_lookup, table_lookup_cost
+from .runner import ALGORITHMS
+from .stats import SearchStats, search_stats
+from .hooks import observing, SearchHook, NodeRate, FrontierHistogram, ProfileWindow
 
 ALGORITHM_CATEGORIES = {
-    "Uninformed": ["BFS", "DFS", "UCS", "IDS"],
-    "Informed": ["Greedy", "A*", "IDA*"],
+    "Uninformed": ["BFS", "DFS", "UCS", "IDS", "Bidirectional BFS", "Bidirectional UCS"],
+    "Informed": ["Greedy", "A*", "IDA*", "Bidirectional A*"],
     "Local": ["Simple HC", "Stochastic HC", "Simulated Annealing", "Beam Search", "Steepest Ascent HC", "Genetic Algorithm"],
     "Complex": ["And-Or Graph Search", "No Observation Belief State Search", "Partially Observable Search"],
     "Constraint": ["Backtracking", "AC-3", "Forward Checking"],
-    "Reinforcement": ["Q-Learning"]
+    "Reinforcement": ["Q-Learning"],
+    "Database": ["Table Lookup", "Table Lookup (Cost)"]
 }
\ No newline at end of file
@@ -0,0 +1,57 @@
+class BucketQueue:
+    """Priority queue for small non-negative integer keys: lowest f first, then highest g.
+
+    ``_buckets[f][g]`` is a LIFO list of codes. Popping scans forward from the
+    lowest non-empty f, and trailing empty g lists are trimmed as it goes, so
+    push and pop are amortised O(1) instead of O(log n) tuple compares.
+    """
+
+    def __init__(self):
+        self._buckets = []
+        self._f = 0
+        self._size = 0
+
+    def push(self, f, g, code):
+        buckets = self._buckets
+        while len(buckets) <= f:
+            buckets.append([])
+        row = buckets[f]
+        while len(row) <= g:
+            row.append([])
+        row[g].append(code)
+        self._size += 1
+        if f < self._f:
+            self._f = f
+
+    def _top(self):
+        # advance to the lowest f with a code left, trimming empty g lists
+        if not self._size:
+            raise IndexError("empty BucketQueue")
+        buckets, f = self._buckets, self._f
+        while True:
+            row = buckets[f]
+            while row and not row[-1]:
+                row.pop()
+            if row:
+                break
+            f += 1
+        self._f = f
+        return row
+
+    def peek(self):
+        """(f, g) of the entry ``pop`` would return, without removing it."""
+        row = self._top()
+        return self._f, len(row) - 1
+
+    def pop(self):
+        """Remove and return (f, g, code) of the best entry."""
+        row = self._top()
+        self._size -= 1
+        g = len(row) - 1
+        return self._f, g, row[g].pop()
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
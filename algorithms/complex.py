@@ -1,24 +1,32 @@
 import random
 import itertools
 from collections import deque
-from .utils import get_neighbors, get_move_direction, calculate_costs, get_zero_position
+from .utils import calculate_costs, get_zero_position, requires_solvable
 from .informed import heuristic
+from .stats import PathList, SearchStats
+from .space import encode_problem, MOVES, MOVE_OFFSETS
 from constants import MOVE_COSTS
 
 def get_possible_actions(state):
+    size = len(state)
     zero_i, zero_j = get_zero_position(state)
     return [
         action for action, (di, dj) in [
             ("up", (-1, 0)), ("down", (1, 0)), ("left", (0, -1)), ("right", (0, 1))
-        ] if 0 <= zero_i + di < 3 and 0 <= zero_j + dj < 3
+        ] if 0 <= zero_i + di < size and 0 <= zero_j + dj < size
     ]
 
 def result(state, action):
-    neighbors = get_neighbors(state)
-    for neighbor in neighbors:
-        if get_move_direction(state, neighbor) == action:
-            return neighbor
-    return state
+    """The board after moving the blank by ``action``, or ``state`` itself if that leaves the board."""
+    size = len(state)
+    zero_i, zero_j = get_zero_position(state)
+    di, dj = MOVE_OFFSETS[MOVES.index(action)]
+    i, j = zero_i + di, zero_j + dj
+    if not (0 <= i < size and 0 <= j < size):
+        return state
+    rows = [list(row) for row in state]
+    rows[zero_i][zero_j], rows[i][j] = rows[i][j], 0
+    return tuple(tuple(row) for row in rows)
 
 def goal_test(state, goal):
     return state == goal
@@ -26,75 +34,114 @@ def goal_test(state, goal):
 def results(state, action):
     return [result(state, action)]
 
+@requires_solvable
 def and_or_graph_search(start, goal, max_depth=100):
-    result = or_search(start, goal, {}, 0, max_depth)
+    """AND-OR search over state codes; every action has the single outcome ``space.successor``.
+
+    Each OR node that tries its moves counts as one expansion, and reaching
+    a state already on the path as a pruned duplicate.
+    """
+    stats = SearchStats()
+    space, start_code, goal_code = encode_problem(start, goal)
+    stats.setup_done()
+    result = or_search(space, start_code, goal_code, space.new_path_flags(), 0, max_depth, stats)
+    stats.search_done()
     if result == 'failure':
-        return None, None, []
-    path = extract_path(result, start, goal)
+        return None, None, PathList(stats=stats)
+    path = space.decode_path(extract_path(space, result, start_code))
     costs = calculate_costs(path)
-    all_paths = [(path[:i+1], costs[i]) for i in range(len(path))]
+    all_paths = PathList(((path[:i+1], costs[i]) for i in range(len(path))), stats)
+    stats.path_done()
     return path, costs, all_paths
 
-def or_search(state, goal, path, depth, max_depth):
+def or_search(space, code, goal_code, on_path, depth, max_depth, stats):
+    """Plan ``[move, {outcome: plan}]`` from ``code``; ``on_path`` flags the states above it and is restored on return.
+
+    ``depth`` counts OR and AND levels, two per move.
+    """
     if depth > max_depth:
         return 'failure'
-    if goal_test(state, goal):
+    if code == goal_code:
         return []
-    if state in path:
+    if on_path[code]:
+        stats.duplicates_pruned += 1
+        return 'failure'
+
+    on_path[code] = 1
+    children = space.successors(code)
+    stats.nodes_expanded += 1
+    stats.nodes_generated += len(children)
+    if depth // 2 > stats.max_depth:
+        stats.max_depth = depth // 2
+    try:
+        for move, child in children:
+            plan = and_search(space, [child], goal_code, on_path, depth + 1, max_depth, stats)
+            if plan != 'failure':
+                return [move, plan]
         return 'failure'
-    
-    path = path.copy()
-    path[state] = True
-    for action in get_possible_actions(state):
-        result_states = results(state, action)
-        plan = and_search(result_states, goal, path, depth + 1, max_depth)
-        if plan != 'failure':
-            return [action, plan]
-    return 'failure'
-
-def and_search(states, goal, path, depth, max_depth):
-    path = path.copy()
+    finally:
+        if isinstance(on_path, dict):
+            del on_path[code]
+        else:
+            on_path[code] = 0
+
+def and_search(space, codes, goal_code, on_path, depth, max_depth, stats):
     plans = {}
-    for state in states:
-        plan = or_search(state, goal, path, depth + 1, max_depth)
+    for code in codes:
+        plan = or_search(space, code, goal_code, on_path, depth + 1, max_depth, stats)
         if plan == 'failure':
             return 'failure'
-        plans[state] = plan
+        plans[code] = plan
     return plans
 
-def extract_path(solution, start, goal):
-    path = [start]
-    if not solution:
-        return path
-    if isinstance(solution, list) and len(solution) == 2:
-        action, and_plan = solution
-        next_state = results(start, action)[0]
-        if next_state in and_plan:
-            return path + extract_path(and_plan[next_state], next_state, goal)
+def extract_path(space, solution, code):
+    """Codes from ``code`` along the plan's single outcomes."""
+    path = [code]
+    while solution:
+        move, and_plan = solution
+        code = space.successor(code, move)
+        if code not in and_plan:
+            break
+        path.append(code)
+        solution = and_plan[code]
     return path
 
 def no_observation_belief_state_search(initial_states, goal_states, max_steps=500):
+    """BFS over belief states (sets of boards) with the actions every board in the belief allows.
+
+    A popped belief counts as one expansion, each distinct next belief as
+    generated and one seen before as a pruned duplicate.
+    """
+    stats = SearchStats()
     belief = set(initial_states)
     goal_set = set(goal_states)
     queue = deque([(belief, [], 0)])
     visited = {tuple(sorted(belief))}
-    all_paths = []
+    all_paths = PathList(stats=stats)
     representative_state = next(iter(belief))
+    stats.setup_done()
 
     while queue and len(all_paths) < max_steps:
         current_belief, actions, cost = queue.popleft()
+        stats.nodes_expanded += 1
+        stats.max_depth = max(stats.max_depth, len(actions))
         goal_hit = next((s for s in current_belief if s in goal_set), None)
         if goal_hit:
+            stats.search_done()
             path = [representative_state]
             for action in actions:
                 path.append(result(path[-1], action))
+            stats.path_done()
             return path, calculate_costs(path), all_paths
 
         common_actions = set.intersection(*[set(get_possible_actions(s)) for s in current_belief])
         for action in common_actions:
             next_belief = {result(s, action) for s in current_belief}
+            stats.nodes_generated += 1
             belief_key = tuple(sorted(next_belief))
-            if belief_key not in visited:
+            if belief_key in visited:
+                stats.duplicates_pruned += 1
+            else:
                 visited.add(belief_key)
                 new_cost = cost + MOVE_COSTS.get(action, 1)
                 new_actions = actions + [action]
@@ -103,23 +150,26 @@ def no_observation_belief_state_search(initial_states, goal_states, max_steps=50
                 for a in new_actions:
                     path.append(result(path[-1], a))
                 all_paths.append((path, new_cost))
+        stats.max_frontier = max(stats.max_frontier, len(queue))
 
+    stats.search_done()
     return None, None, all_paths
 
 def partially_observable_search(visible_state, initial_states, goal_states, max_steps=500):
+    size = len(visible_state)
     present = {v for row in visible_state for v in row if v is not None}
-    missing = list(set(range(9)) - present)
-    blanks = [(i, j) for i in range(3) for j in range(3) if visible_state[i][j] is None]
+    missing = list(set(range(size * size)) - present)
+    blanks = [(i, j) for i in range(size) for j in range(size) if visible_state[i][j] is None]
 
     initial_belief = set()
     for state in initial_states:
         if all(visible_state[i][j] is None or state[i][j] == visible_state[i][j]
-               for i in range(3) for j in range(3)):
+               for i in range(size) for j in range(size)):
             initial_belief.add(state)
 
     if not initial_belief and len(missing) <= 4:
         for perm in itertools.permutations(missing):
-            board = [[visible_state[i][j] for j in range(3)] for i in range(3)]
+            board = [[visible_state[i][j] for j in range(size)] for i in range(size)]
             for (i, j), value in zip(blanks, perm):
                 board[i][j] = value
             initial_belief.add(tuple(tuple(row) for row in board))
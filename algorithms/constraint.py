@@ -6,13 +6,14 @@ def create_grid_from_assignment(assignment, size=3):
         grid[row][col] = value
     return [row[:] for row in grid]
 
-def create_constraints():
+def create_constraints(size=3):
     constraints = []
-    top_bottom_pairs = [('X1', 'X4'), ('X2', 'X5'), ('X3', 'X6'), ('X4', 'X7'), ('X5', 'X8')]
+    last = size * size
+    top_bottom_pairs = [(f'X{i}', f'X{i + size}') for i in range(1, last - size + 1) if i + size != last]
     for top, bottom in top_bottom_pairs:
-        constraints.append((top, bottom, lambda t, b: b == t + 3 and t != 0))
+        constraints.append((top, bottom, lambda t, b: b == t + size and t != 0))
 
-    left_right_pairs = [('X1', 'X2'), ('X2', 'X3'), ('X4', 'X5'), ('X5', 'X6'), ('X7', 'X8')]
+    left_right_pairs = [(f'X{i}', f'X{i + 1}') for i in range(1, last) if i % size and i + 1 != last]
     for left, right in left_right_pairs:
         constraints.append((left, right, lambda l, r: r == l + 1 and l != 0))
 
@@ -58,7 +59,7 @@ def backtrack(assignment, index, csp, nodes_expanded, max_depth, path, use_forwa
     nodes_expanded[0] += 1
     max_depth[0] = max(max_depth[0], len(assignment))
     if assignment:
-        path.append(create_grid_from_assignment(assignment))
+        path.append(create_grid_from_assignment(assignment, csp['size']))
 
     if index == len(csp['variables']):
         return assignment
@@ -69,7 +70,7 @@ def backtrack(assignment, index, csp, nodes_expanded, max_depth, path, use_forwa
     for value in csp['domains'][variable][:]:
         if is_consistent(variable, value, assignment, csp['constraints']):
             assignment[variable] = value
-            path.append(create_grid_from_assignment(assignment))
+            path.append(create_grid_from_assignment(assignment, csp['size']))
             if not use_forward or forward_checking(variable, value, assignment, csp['domains'], csp['constraints']):
                 result = backtrack(assignment, index + 1, csp, nodes_expanded, max_depth, path, use_forward)
                 if result:
@@ -77,7 +78,7 @@ def backtrack(assignment, index, csp, nodes_expanded, max_depth, path, use_forwa
             # Khôi phục miền cho mỗi biến
             csp['domains'] = {v: original_domains[v].copy() for v in csp['variables']}
             del assignment[variable]
-            path.append(create_grid_from_assignment(assignment))
+            path.append(create_grid_from_assignment(assignment, csp['size']))
     return None
 def forward_checking(variable, value, assignment, domains, constraints):
     unassigned = [v for v in domains if v not in assignment]
@@ -105,8 +106,7 @@ def forward_checking(variable, value, assignment, domains, constraints):
     return True
 
 def ac3(csp):
-    pairs = [('X1', 'X4'), ('X2', 'X5'), ('X3', 'X6'), ('X4', 'X7'), ('X5', 'X8'),
-             ('X1', 'X2'), ('X2', 'X3'), ('X4', 'X5'), ('X5', 'X6'), ('X7', 'X8')]
+    pairs = [(first, second) for first, second, _ in csp['constraints']]
     queue = list(pairs)
     while queue:
         first_var, second_var = queue.pop(0)
@@ -131,15 +131,17 @@ def remove_inconsistent_values(first_var, second_var, csp):
     return removed
 
 def solve(initial_state, method='backtracking'):
+    size = len(initial_state)
     flat_state = [num for row in initial_state for num in row]
-    variables = [f"X{i+1}" for i in range(9)]
+    variables = [f"X{i+1}" for i in range(size * size)]
     value_order = flat_state.copy()
     domains = {var: value_order.copy() for var in variables}
-    constraints = create_constraints()
+    constraints = create_constraints(size)
     csp = {
         'variables': variables,
         'domains': domains,
-        'constraints': constraints
+        'constraints': constraints,
+        'size': size
     }
 
     nodes_expanded = [0]
@@ -167,5 +169,5 @@ def solve(initial_state, method='backtracking'):
         'path': path,
         'nodes_expanded': nodes_expanded[0],
         'max_depth': max_depth[0],
-        'solution': create_grid_from_assignment(result) if result else None 
+        'solution': create_grid_from_assignment(result, size) if result else None 
     }
@@ -0,0 +1,115 @@
+import os
+import heapq
+from array import array
+from collections import deque
+from .utils import calculate_costs, requires_solvable
+from .space import encode_problem, map_cache_file, save_cache_file, MOVE_COST_LIST
+from .stats import PathList, SearchStats
+from constants import CACHE_DIR
+
+# Each entry is (distance << 2) | best move; all bits set means unreachable.
+UNREACHABLE = {False: 0xFF, True: 0xFFFF}
+
+_tables = {}
+
+def _table_file(space, goal_code, weighted):
+    # cost tables are only valid for the MOVE_COSTS they were built with
+    kind = "cost" + "-".join(map(str, MOVE_COST_LIST)) if weighted else "steps"
+    return os.path.join(CACHE_DIR, f"distances_{space.size}x{space.size}_p{space.parity}_{goal_code}_{kind}.bin")
+
+def build_step_table(space, goal_code):
+    """Retrograde BFS from the goal: optimal move count and best next move per rank."""
+    table = bytearray(b"\xff") * space.count
+    table[goal_code] = 0
+    queue = deque([goal_code])
+    successor_table = space.table
+    while queue:
+        code = queue.popleft()
+        entry = ((table[code] >> 2) + 1) << 2
+        base = code * 4
+        for move in range(4):
+            prev = successor_table[base + move]
+            if prev >= 0 and table[prev] == 0xFF:
+                # prev reaches code with the inverse move
+                table[prev] = entry | (move ^ 1)
+                queue.append(prev)
+    return table
+
+def build_cost_table(space, goal_code):
+    """Backward Dijkstra from the goal under MOVE_COSTS; same entry layout as the step table."""
+    best = array('H', [0xFFFF]) * space.count
+    best[goal_code] = 0
+    pq = [(0, goal_code)]
+    successor_table = space.table
+    while pq:
+        cost, code = heapq.heappop(pq)
+        if cost != best[code] >> 2:
+            continue
+        base = code * 4
+        for move in range(4):
+            prev = successor_table[base + move]
+            if prev < 0:
+                continue
+            back = move ^ 1
+            new_cost = cost + MOVE_COST_LIST[back]
+            if new_cost < best[prev] >> 2:
+                best[prev] = (new_cost << 2) | back
+                heapq.heappush(pq, (new_cost, prev))
+    return best
+
+def load_distance_table(space, goal_code, weighted=False):
+    """Memory-mapped distance table for one goal, built and saved when missing or truncated."""
+    if space.count is None:
+        raise ValueError(f"Exact distance tables are only available for 3x3 boards, not {space.size}x{space.size}")
+    key = (space.size, space.parity, goal_code, weighted)
+    table = _tables.get(key)
+    if table is not None:
+        return table
+    path = _table_file(space, goal_code, weighted)
+    typecode = 'H' if weighted else 'B'
+    mapped = map_cache_file(path, space.count * array(typecode).itemsize)
+    if mapped is not None:
+        table = _tables[key] = memoryview(mapped).cast(typecode)
+        return table
+    table = build_cost_table(space, goal_code) if weighted else build_step_table(space, goal_code)
+    try:
+        save_cache_file(path, [table])
+    except OSError:
+        pass
+    _tables[key] = table
+    return table
+
+def distance_to_goal(start, goal, weighted=False):
+    """Optimal move count (or cost when weighted) from start to goal, None if unreachable."""
+    space, start_code, goal_code = encode_problem(start, goal)
+    if goal_code < 0:
+        return None
+    entry = load_distance_table(space, goal_code, weighted)[start_code]
+    if entry == UNREACHABLE[weighted]:
+        return None
+    return entry >> 2
+
+@requires_solvable
+def table_lookup(start, goal, weighted=False):
+    stats = SearchStats()
+    space, code, goal_code = encode_problem(start, goal)
+    table = load_distance_table(space, goal_code, weighted)
+    stats.setup_done()
+    if table[code] == UNREACHABLE[weighted]:
+        return None, None, PathList(stats=stats)
+    path = [code]
+    while code != goal_code:
+        code = space.successor(code, table[code] & 3)
+        path.append(code)
+    stats.search_done()
+    path = space.decode_path(path)
+    costs = calculate_costs(path)
+    # one table read per state on the path, no search beyond it
+    stats.nodes_expanded = stats.heuristic_evaluations = len(path)
+    stats.max_depth = len(path) - 1
+    all_paths = PathList(((path[:i+1], costs[i]) for i in range(len(path))), stats)
+    stats.path_done()
+    return path, costs, all_paths
+
+def table_lookup_cost(start, goal):
+    return table_lookup(start, goal, weighted=True)
@@ -0,0 +1,263 @@
+from collections import deque
+from functools import lru_cache
+from .utils import flatten_state
+
+class ManhattanTable:
+    """Manhattan distance to one goal, read from a (tile, cell) table.
+
+    ``table[tile * n + cell]`` is the distance of ``tile`` standing on ``cell``
+    from its goal cell (0 for the blank), so a full evaluation is one lookup
+    per cell and a single move changes h by ``delta``.
+    """
+
+    def __init__(self, goal):
+        cells = flatten_state(goal)
+        self.size = len(goal)
+        self.cell_count = n = len(cells)
+        self.goal_cells = cells
+        self.table = table = [0] * (n * n)
+        for target, tile in enumerate(cells):
+            if tile:
+                tr, tc = divmod(target, self.size)
+                for cell in range(n):
+                    r, c = divmod(cell, self.size)
+                    table[tile * n + cell] = abs(r - tr) + abs(c - tc)
+
+    def evaluate(self, cells):
+        table, n = self.table, self.cell_count
+        return sum(table[tile * n + cell] for cell, tile in enumerate(cells))
+
+    def delta(self, tile, src, dst):
+        """Change of h when ``tile`` slides from cell ``src`` to cell ``dst``."""
+        row = tile * self.cell_count
+        return self.table[row + dst] - self.table[row + src]
+
+    def update(self, h, cells, tile, src, dst):
+        row = tile * self.cell_count
+        return h + self.table[row + dst] - self.table[row + src]
+
+@lru_cache(maxsize=32)
+def manhattan_table(goal):
+    return ManhattanTable(goal)
+
+def _line_conflicts(size):
+    """Tiles to remove from a line so the rest are in goal order, for every line key.
+
+    A key has one base-(size + 1) digit per position: 0 for a tile that does
+    not belong to the line, otherwise its goal position in the line plus one.
+    """
+    conflicts = []
+    for key in range((size + 1) ** size):
+        seq = []
+        for _ in range(size):
+            key, digit = divmod(key, size + 1)
+            if digit:
+                seq.append(digit)
+        seq.reverse()
+        longest = [1] * len(seq)
+        for i in range(len(seq)):
+            for j in range(i):
+                if seq[j] < seq[i]:
+                    longest[i] = max(longest[i], longest[j] + 1)
+        conflicts.append(len(seq) - max(longest, default=0))
+    return conflicts
+
+class LinearConflictTable(ManhattanTable):
+    """Manhattan distance plus two moves per tile that must leave its line to let others pass.
+
+    ``row_digit``/``col_digit`` hold each (tile, cell)'s share of its row and
+    column keys, and ``conflicts`` maps a key to the line's conflict count,
+    so a line costs ``size`` lookups and a move touches at most three lines.
+    """
+
+    def __init__(self, goal):
+        super().__init__(goal)
+        size, n = self.size, self.cell_count
+        self.conflicts = _line_conflicts(size)
+        self.row_digit = row_digit = [0] * (n * n)
+        self.col_digit = col_digit = [0] * (n * n)
+        for target, tile in enumerate(self.goal_cells):
+            if tile:
+                tr, tc = divmod(target, size)
+                for cell in range(n):
+                    r, c = divmod(cell, size)
+                    if r == tr:
+                        row_digit[tile * n + cell] = (tc + 1) * (size + 1) ** (size - 1 - c)
+                    if c == tc:
+                        col_digit[tile * n + cell] = (tr + 1) * (size + 1) ** (size - 1 - r)
+
+    def _row_key(self, cells, r):
+        n, start = self.cell_count, r * self.size
+        return sum(self.row_digit[cells[cell] * n + cell] for cell in range(start, start + self.size))
+
+    def _col_key(self, cells, c):
+        n = self.cell_count
+        return sum(self.col_digit[cells[cell] * n + cell] for cell in range(c, n, self.size))
+
+    def evaluate(self, cells):
+        conflicts = self.conflicts
+        lines = sum(conflicts[self._row_key(cells, i)] + conflicts[self._col_key(cells, i)]
+                    for i in range(self.size))
+        return super().evaluate(cells) + 2 * lines
+
+    def update(self, h, cells, tile, src, dst):
+        size, n, conflicts = self.size, self.cell_count, self.conflicts
+        row = tile * n
+        h += self.table[row + dst] - self.table[row + src]
+        (sr, sc), (dr, dc) = divmod(src, size), divmod(dst, size)
+        for r in {sr, dr}:
+            old = self._row_key(cells, r)
+            new = old - (self.row_digit[row + src] if r == sr else 0) + (self.row_digit[row + dst] if r == dr else 0)
+            h += 2 * (conflicts[new] - conflicts[old])
+        for c in {sc, dc}:
+            old = self._col_key(cells, c)
+            new = old - (self.col_digit[row + src] if c == sc else 0) + (self.col_digit[row + dst] if c == dc else 0)
+            h += 2 * (conflicts[new] - conflicts[old])
+        return h
+
+@lru_cache(maxsize=32)
+def linear_conflict_table(goal):
+    return LinearConflictTable(goal)
+
+@lru_cache(maxsize=8)
+def _walking_distances(size, blank_line):
+    """Walking distance of every reachable (line x goal line) count matrix, by BFS from the goal.
+
+    Keys pack ``count[i][j]`` (tiles in line i whose goal line is j) as
+    base-(size + 1) digits, times ``size``, plus the blank's line.
+    """
+    weights = [(size + 1) ** k * size for k in range(size * size)]
+    counts = [0] * (size * size)
+    for i in range(size):
+        counts[i * size + i] = size - (i == blank_line)
+    start = sum(c * w for c, w in zip(counts, weights)) + blank_line
+    distances = {start: 0}
+    queue = deque([(tuple(counts), blank_line, start)])
+    while queue:
+        counts, blank, key = queue.popleft()
+        dist = distances[key] + 1
+        for line in (blank - 1, blank + 1):
+            if not 0 <= line < size:
+                continue
+            for j in range(size):
+                if counts[line * size + j]:
+                    child = key - weights[line * size + j] + weights[blank * size + j] + line - blank
+                    if child not in distances:
+                        distances[child] = dist
+                        moved = list(counts)
+                        moved[line * size + j] -= 1
+                        moved[blank * size + j] += 1
+                        queue.append((tuple(moved), line, child))
+    return distances
+
+class WalkingDistanceTable:
+    """Walking distance: vertical moves needed to sort tiles into their goal rows, plus the same for columns.
+
+    ``row_key[tile * n + cell]`` is each tile's share of the packed row count
+    matrix (the blank's entry is its row), so a board's key is one lookup per
+    cell; a vertical move only changes the row key and a horizontal move only
+    the column key.
+    """
+
+    def __init__(self, goal):
+        cells = flatten_state(goal)
+        self.size = size = len(goal)
+        self.cell_count = n = len(cells)
+        blank_row, blank_col = divmod(cells.index(0), size)
+        self.row_distances = _walking_distances(size, blank_row)
+        self.col_distances = _walking_distances(size, blank_col)
+        self.row_key = row_key = [0] * (n * n)
+        self.col_key = col_key = [0] * (n * n)
+        for target, tile in enumerate(cells):
+            tr, tc = divmod(target, size)
+            for cell in range(n):
+                r, c = divmod(cell, size)
+                if tile:
+                    row_key[tile * n + cell] = (size + 1) ** (r * size + tr) * size
+                    col_key[tile * n + cell] = (size + 1) ** (c * size + tc) * size
+                else:
+                    row_key[cell] = r
+                    col_key[cell] = c
+        self._keys(cells)
+
+    def _keys(self, cells):
+        n, row_key, col_key = self.cell_count, self.row_key, self.col_key
+        keys = (sum(row_key[tile * n + cell] for cell, tile in enumerate(cells)),
+                sum(col_key[tile * n + cell] for cell, tile in enumerate(cells)))
+        self._board, self._board_keys = list(cells), keys
+        self._board_blank = self._board.index(0)
+        return keys
+
+    def _parent_keys(self, cells, blank):
+        """Keys of the board ``cells`` (blank on ``blank``), carried over from the last board seen.
+
+        Siblings share their parent's board and IDA* moves one tile between
+        expansions, so the keys are usually the remembered ones or one move
+        away from them; anything else is summed afresh.
+        """
+        board = self._board
+        if cells == board:
+            return self._board_keys
+        last_blank = self._board_blank
+        tile = cells[last_blank]
+        if tile and board[blank] == tile:
+            board[last_blank], board[blank] = tile, 0
+            if cells == board:
+                # ``tile`` slid from ``blank`` onto ``last_blank``
+                n, row_key, col_key = self.cell_count, self.row_key, self.col_key
+                rows, cols = self._board_keys
+                self._board_keys = (
+                    rows - row_key[tile * n + blank] + row_key[tile * n + last_blank] - row_key[last_blank] + row_key[blank],
+                    cols - col_key[tile * n + blank] + col_key[tile * n + last_blank] - col_key[last_blank] + col_key[blank])
+                self._board_blank = blank
+                return self._board_keys
+        return self._keys(cells)
+
+    def evaluate(self, cells):
+        rows, cols = self._keys(cells)
+        return self.row_distances[rows] + self.col_distances[cols]
+
+    def update(self, h, cells, tile, src, dst):
+        """h after ``tile`` slides from ``src`` onto the blank at ``dst``; only one of the two keys changes."""
+        n = self.cell_count
+        rows, cols = self._parent_keys(cells, dst)
+        if src // self.size != dst // self.size:
+            keys, distances, old = self.row_key, self.row_distances, rows
+        else:
+            keys, distances, old = self.col_key, self.col_distances, cols
+        new = old - keys[tile * n + src] + keys[tile * n + dst] - keys[dst] + keys[src]
+        return h - distances[old] + distances[new]
+
+@lru_cache(maxsize=32)
+def walking_distance_table(goal):
+    return WalkingDistanceTable(goal)
+
+HEURISTICS = {
+    "manhattan": manhattan_table,
+    "linear_conflict": linear_conflict_table,
+    "walking_distance": walking_distance_table,
+}
+
+def get_heuristic(name, goal):
+    """Evaluator for ``goal`` by name: a key of HEURISTICS, "pdb" or "pdb:<layout>" such as "pdb:6-6-3".
+
+    ``None`` picks Manhattan up to 3x3 and the default pattern database on bigger boards.
+    """
+    if name is None:
+        name = "manhattan" if len(goal) <= 3 else "pdb"
+    if name in HEURISTICS:
+        return HEURISTICS[name](goal)
+    if name == "pdb" or name.startswith("pdb:"):
+        from .pdb import pattern_database
+        return pattern_database(goal, name[4:] or None)
+    raise ValueError(f"Unknown heuristic: {name}")
+
+def scored_successors(space, code, h, heuristic):
+    """(move, child, child h) for every successor, h updated incrementally from the parent's."""
+    cells = space.cells(code)
+    blank = space.blank(code)
+    scored = []
+    for move, child in space.successors(code):
+        moved_from = space.blank(child)
+        scored.append((move, child, heuristic.update(h, cells, cells[moved_from], moved_from, blank)))
+    return scored
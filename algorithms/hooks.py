@@ -0,0 +1,240 @@
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+EVENTS = ("expand", "generate", "prune", "improve")
+
+class SearchHook:
+    """Observer of the search loops; override the events of interest.
+
+    ``node`` is whatever the solver works on: a state-space code, a board
+    tuple in the genetic algorithm, or IDA*'s board list itself, which
+    changes after the call (copy it to keep it). Each hook gets every
+    ``every``-th event of each kind, so a sampled hook that counts should
+    count ``every`` per call.
+    """
+    every = 1
+
+    def start(self):
+        """Called when the ``observing`` block is entered."""
+
+    def finish(self):
+        """Called when the ``observing`` block is left, even on an exception."""
+
+    def expand(self, node, cost, frontier):
+        """``node`` is expanded at path cost ``cost`` with ``frontier`` nodes open (stack depth for depth-first searches)."""
+
+    def generate(self, node, count):
+        """``count`` successors of ``node`` were generated."""
+
+    def prune(self, node, count):
+        """``count`` of those were dropped: already reached, on the path, or over the bound."""
+
+    def improve(self, node, value):
+        """``node`` has the best heuristic value (or fitness) the search has seen so far."""
+
+class Observer:
+    """Fans the solvers' events out to the hooks that override them, applying each hook's sampling."""
+
+    def __init__(self, hooks):
+        self.hooks = hooks
+        self._targets = {}
+        self._seen = {}
+        self._direct = {}
+        for kind in EVENTS:
+            methods = [(getattr(hook, kind), max(1, hook.every)) for hook in hooks
+                       if getattr(type(hook), kind) is not getattr(SearchHook, kind)]
+            self._targets[kind] = methods
+            self._seen[kind] = [0] * len(methods)
+            # the common case of one unsampled hook skips the sampling loop
+            if len(methods) == 1 and methods[0][1] == 1:
+                self._direct[kind] = methods[0][0]
+
+    def _fire(self, kind, *args):
+        seen = self._seen[kind]
+        for i, (method, every) in enumerate(self._targets[kind]):
+            seen[i] += 1
+            if seen[i] >= every:
+                seen[i] = 0
+                method(*args)
+
+    def expand(self, node, cost, frontier, generated, pruned):
+        """One expansion as the solvers report it: the expand, generate and prune events together."""
+        targets, direct = self._targets, self._direct
+        if "expand" in direct:
+            direct["expand"](node, cost, frontier)
+        elif targets["expand"]:
+            self._fire("expand", node, cost, frontier)
+        if generated and targets["generate"]:
+            self._fire("generate", node, generated)
+        if pruned and targets["prune"]:
+            self._fire("prune", node, pruned)
+
+    def improve(self, node, value):
+        self._fire("improve", node, value)
+
+_observer = None
+
+def current_observer():
+    """The Observer of the innermost ``observing`` block, or None.
+
+    Solvers read it once on entry and test it against None per expansion,
+    which is all a search pays when nothing observes it.
+    """
+    return _observer
+
+@contextmanager
+def observing(*hooks):
+    """Report the events of every search run in this process inside the block to ``hooks``.
+
+    Events raised in worker processes (parallel IDA*, the batch pool) are not collected.
+    """
+    global _observer
+    previous, _observer = _observer, Observer(hooks)
+    for hook in hooks:
+        hook.start()
+    try:
+        yield _observer
+    finally:
+        _observer = previous
+        for hook in hooks:
+            hook.finish()
+
+class NodeRate(SearchHook):
+    """Expansions per second, overall and per ``interval`` seconds."""
+
+    def __init__(self, interval=1.0, every=1):
+        self.interval = interval
+        self.every = every
+        self.nodes = 0
+        self.samples = []
+        self.elapsed = 0.0
+
+    def start(self):
+        self._began = self._mark = time.perf_counter()
+        self._marked_nodes = 0
+
+    def expand(self, node, cost, frontier):
+        self.nodes += self.every
+        now = time.perf_counter()
+        if now - self._mark >= self.interval:
+            self.samples.append((now - self._began, self.nodes, (self.nodes - self._marked_nodes) / (now - self._mark)))
+            self._mark, self._marked_nodes = now, self.nodes
+
+    def finish(self):
+        self.elapsed = time.perf_counter() - self._began
+
+    @property
+    def rate(self):
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    def report(self):
+        lines = [f"{self.nodes} expansions in {self.elapsed:.3f}s, {self.rate:,.0f}/s"]
+        lines += [f"  {at:8.2f}s {nodes:>12} {rate:>12,.0f}/s" for at, nodes, rate in self.samples]
+        return "\n".join(lines)
+
+class FrontierHistogram(SearchHook):
+    """Open-node counts seen at expansion time, in power-of-two buckets."""
+
+    def __init__(self, every=1):
+        self.every = every
+        self.buckets = Counter()
+        self.peak = 0
+
+    def expand(self, node, cost, frontier):
+        self.buckets[frontier.bit_length()] += self.every
+        if frontier > self.peak:
+            self.peak = frontier
+
+    def report(self):
+        total = sum(self.buckets.values()) or 1
+        lines = [f"frontier peak {self.peak}"]
+        for bits in sorted(self.buckets):
+            low, high = (1 << bits) >> 1, (1 << bits) - 1
+            share = self.buckets[bits] / total
+            lines.append(f"  {low:>9}-{high:<9} {self.buckets[bits]:>10} {'#' * round(share * 40)}")
+        return "\n".join(lines)
+
+class ProfileWindow(SearchHook):
+    """cProfile (and optionally tracemalloc) over expansions ``first`` to ``first + length``.
+
+    Leaves the window's ``pstats.Stats`` in ``profile`` and its allocation
+    snapshot in ``snapshot``; a search that ends inside the window closes it.
+    """
+
+    def __init__(self, first=0, length=100000, memory=True, every=1):
+        self.first = first
+        self.length = length
+        self.memory = memory
+        self.every = every
+        self.seen = 0
+        self.profile = None
+        self.snapshot = None
+        self._profiler = None
+
+    def expand(self, node, cost, frontier):
+        self.seen += self.every
+        if self._profiler is None:
+            if self.profile is None and self.seen > self.first:
+                self._open()
+        elif self.seen > self.first + self.length:
+            self._close()
+
+    def _open(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        else:
+            self.memory = False
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+
+    def _close(self):
+        self._profiler.disable()
+        self.profile = pstats.Stats(self._profiler)
+        self._profiler = None
+        if self.memory:
+            self.snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+
+    def finish(self):
+        if self._profiler is not None:
+            self._close()
+
+    def report(self, limit=15):
+        if self.profile is None:
+            return f"profile window never opened ({self.seen} expansions, window starts after {self.first})"
+        out = io.StringIO()
+        self.profile.stream = out
+        self.profile.sort_stats("tottime").print_stats(limit)
+        if self.snapshot is not None:
+            out.write("top allocations:\n")
+            for stat in self.snapshot.statistics("lineno")[:limit]:
+                out.write(f"  {stat}\n")
+        return out.getvalue()
+
+class BudgetExceeded(Exception):
+    """Raised out of a search once its NodeBudget runs out."""
+
+class NodeBudget(SearchHook):
+    """Stops the search by raising BudgetExceeded after ``limit`` expansions.
+
+    ``progress``, if given, is called with the expansions so far every
+    ``report_every`` expansions.
+    """
+
+    def __init__(self, limit=None, progress=None, report_every=1000):
+        self.limit = limit
+        self.progress = progress
+        self.report_every = report_every
+        self.nodes = 0
+
+    def expand(self, node, cost, frontier):
+        self.nodes += 1
+        if self.limit and self.nodes > self.limit:
+            raise BudgetExceeded(self.nodes - 1)
+        if self.progress is not None and not self.nodes % self.report_every:
+            self.progress(self.nodes)
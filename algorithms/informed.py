@@ -1,78 +1,255 @@
 import heapq
-from .utils import get_neighbors, get_move_direction, calculate_costs
-from constants import MOVE_COSTS
+from .utils import calculate_costs, flatten_state, requires_solvable
+from .space import encode_problem, reconstruct_path, pruned_moves, MOVE_COST_LIST
+from .heuristics import get_heuristic, scored_successors
+from .trace import SearchTrace
+from .hooks import current_observer
+from .buckets import BucketQueue
 
-def heuristic(state, goal):
-    return sum(abs(i - x) + abs(j - y)
-              for i, row in enumerate(state)
-              for j, val in enumerate(row)
-              if val
-              for x, goal_row in enumerate(goal)
-              for y, v in enumerate(goal_row)
-              if v == val)
+def heuristic(state, goal, name=None):
+    return get_heuristic(name, goal).evaluate(flatten_state(state))
 
-def greedy(start, goal):
-    pq = [(heuristic(start, goal), start, [start], 0)]
-    visited = {start}
-    all_paths = []
+@requires_solvable
+def greedy(start, goal, trace=None, heuristic_name=None):
+    space, start_code, goal_code = encode_problem(start, goal)
+    parents = space.new_parents()
+    trace = SearchTrace.attach(trace, space, parents)
+    stats = trace.stats
+    estimate = get_heuristic(heuristic_name, goal)
+    pq = [(estimate.evaluate(space.cells(start_code)), start_code, 0)]
+    parents[start_code] = start_code
+    depths = space.new_costs()
+    depths[start_code] = 0
+    observer = current_observer()
+    best_h = float('inf')
+    stats.setup_done()
+    expanded = generated = deepest = 0
+    max_frontier = 1
+    code = start_code
     while pq:
-        _, state, path, cost = heapq.heappop(pq)
-        all_paths.append((path, cost))
-        if state == goal:
-            return path, calculate_costs(path), all_paths
-        for neighbor in get_neighbors(state):
-            if neighbor not in visited:
-                visited.add(neighbor)
-                direction = get_move_direction(state, neighbor)
-                new_cost = cost + (MOVE_COSTS[direction] if direction else 0)
-                heapq.heappush(pq, (heuristic(neighbor, goal), neighbor, path + [neighbor], new_cost))
-    return None, None, all_paths
+        h, code, cost = heapq.heappop(pq)
+        expanded += 1
+        trace.record(code, parents[code], cost)
+        depth = depths[code]
+        if depth > deepest:
+            deepest = depth
+        if code == goal_code:
+            break
+        children = scored_successors(space, code, h, estimate)
+        generated += len(children)
+        if observer is not None:
+            observer.expand(code, cost, len(pq), len(children),
+                            sum(parents[child] != -1 for _, child, _ in children))
+            if h < best_h:
+                best_h = h
+                observer.improve(code, h)
+        for move, child, child_h in children:
+            if parents[child] == -1:
+                parents[child] = code
+                depths[child] = depth + 1
+                new_cost = cost + MOVE_COST_LIST[move]
+                heapq.heappush(pq, (child_h, child, new_cost))
+        if len(pq) > max_frontier:
+            max_frontier = len(pq)
+    stats.nodes_expanded, stats.nodes_generated, stats.max_frontier = expanded, generated, max_frontier
+    stats.duplicates_pruned = generated - (expanded + len(pq) - 1)
+    stats.heuristic_evaluations = generated + 1
+    stats.max_depth = deepest
+    stats.search_done()
+    if code != goal_code:
+        return None, None, trace
+    path = space.decode_path(reconstruct_path(parents, code))
+    stats.path_done()
+    return path, calculate_costs(path), trace
 
-def astar(start, goal):
-    pq = [(heuristic(start, goal), 0, start, [start], 0)]
-    visited = {start}
-    all_paths = []
-    while pq:
-        f, g, state, path, cost = heapq.heappop(pq)
-        all_paths.append((path, cost))
-        if state == goal:
-            return path, calculate_costs(path), all_paths
-        for neighbor in get_neighbors(state):
-            if neighbor not in visited:
-                visited.add(neighbor)
-                direction = get_move_direction(state, neighbor)
-                new_cost = cost + (MOVE_COSTS[direction] if direction else 0)
-                g_new = g + (MOVE_COSTS[direction] if direction else 0)
-                f_new = g_new + heuristic(neighbor, goal)
-                heapq.heappush(pq, (f_new, g_new, neighbor, path + [neighbor], new_cost))
-    return None, None, all_paths
+@requires_solvable
+def astar(start, goal, trace=None, heuristic_name=None):
+    space, start_code, goal_code = encode_problem(start, goal)
+    parents = space.new_parents()
+    trace = SearchTrace.attach(trace, space, parents)
+    stats = trace.stats
+    estimate = get_heuristic(heuristic_name, goal)
+    open_list = BucketQueue()
+    open_list.push(estimate.evaluate(space.cells(start_code)), 0, start_code)
+    parents[start_code] = start_code
+    best_g = space.new_costs()
+    best_g[start_code] = 0
+    depths = space.new_costs()
+    depths[start_code] = 0
+    observer = current_observer()
+    best_h = float('inf')
+    stats.setup_done()
+    expanded = generated = duplicates = deepest = 0
+    max_frontier = 1
+    code = start_code
+    while open_list:
+        f, g, code = open_list.pop()
+        if g > best_g[code]:
+            duplicates += 1
+            continue  # stale entry: a cheaper path to code was pushed after it
+        expanded += 1
+        trace.record(code, parents[code], g)
+        depth = depths[code]
+        if depth > deepest:
+            deepest = depth
+        if code == goal_code:
+            break
+        children = scored_successors(space, code, f - g, estimate)
+        generated += len(children)
+        if observer is not None:
+            observer.expand(code, g, len(open_list), len(children),
+                            sum(best_g[child] != -1 and g + MOVE_COST_LIST[move] >= best_g[child]
+                                for move, child, _ in children))
+            if f - g < best_h:
+                best_h = f - g
+                observer.improve(code, best_h)
+        for move, child, child_h in children:
+            g_new = g + MOVE_COST_LIST[move]
+            known = best_g[child]
+            if known == -1 or g_new < known:
+                best_g[child] = g_new
+                parents[child] = code
+                depths[child] = depth + 1
+                open_list.push(g_new + child_h, g_new, child)
+            else:
+                duplicates += 1
+        if len(open_list) > max_frontier:
+            max_frontier = len(open_list)
+    stats.nodes_expanded, stats.nodes_generated, stats.max_frontier = expanded, generated, max_frontier
+    stats.duplicates_pruned = duplicates
+    stats.heuristic_evaluations = generated + 1
+    stats.max_depth = deepest
+    stats.search_done()
+    if code != goal_code:
+        return None, None, trace
+    path = space.decode_path(reconstruct_path(parents, code))
+    stats.path_done()
+    return path, calculate_costs(path), trace
+
+def bounded_search(cells, blank, h, g, move, bound, goal_cells, update, moves_from,
+                   trace=None, encode=None, code=-1, stop=None, stats=None):
+    """One IDA* contour below the board on ``cells``.
+
+    The node was reached by ``move`` (-1 for none) with cost ``g`` and estimate
+    ``h``. Moves are made and unmade in place, the inverse of the last move is
+    never generated (see ``pruned_moves``), and the walk uses an explicit
+    stack of frames ``(children within the bound, parent blank, move in)``.
+    Children over the bound only lower the next bound.
 
-def ida_star(start, goal):
-    def search(state, g, bound, path, cost, all_paths):
-        all_paths.append((path, cost))
-        f = g + heuristic(state, goal)
-        if f > bound:
-            return f, None, None
-        if state == goal:
-            return f, path, calculate_costs(path)
-        min_bound = float('inf')
-        for neighbor in get_neighbors(state):
-            if neighbor not in path:
-                direction = get_move_direction(state, neighbor)
-                new_cost = cost + (MOVE_COSTS[direction] if direction else 0)
-                g_new = g + (MOVE_COSTS[direction] if direction else 0)
-                new_f, result, result_costs = search(neighbor, g_new, bound, path + [neighbor], new_cost, all_paths)
-                if result:
-                    return new_f, result, result_costs
-                min_bound = min(min_bound, new_f)
-        return min_bound, None, None
+    Generated nodes are recorded in ``trace`` while it keeps entries (``encode``
+    turns the board into node ids) and only counted after that. ``stop`` is an
+    optional event polled every few thousand expansions. Expansions, generated
+    nodes (one heuristic update each) and the depth reached are added to
+    ``stats`` when given, and each expansion is reported to the active
+    observer as the ``cells`` list itself, with the children over the bound
+    as pruned.
+
+    Returns (moves to the goal or None, next bound, nodes counted but not
+    recorded). The board is left on the goal when one is found and restored
+    otherwise, unless the search was stopped.
+    """
+    keeping = trace is not None and trace.keeps_entries
+    # the codes from the root follow ``frames``: a ring trace copies them into
+    # each entry, the indexed modes find each entry's parent along them
+    lineage = [code] if keeping else None
+    if lineage is not None:
+        trace.lineage = lineage
+    observer = current_observer()
+    unrecorded = expanded = generated = deepest = 0
+    next_bound = float('inf')
+    frames = []
+    parent_blank = -1
+    found = None
+    while True:
+        # expand the node on the board: blank at ``blank``, reached by ``move``
+        children = []
+        options = moves_from[blank][move + 1]
+        for child_move, cell, cost in options:
+            child_h = update(h, cells, cells[cell], cell, blank)
+            child_g = g + cost
+            if keeping:
+                cells[blank], cells[cell] = cells[cell], 0
+                trace.record(encode(cells), code, child_g)
+                cells[cell], cells[blank] = cells[blank], 0
+                keeping = trace.keeps_entries
+            else:
+                unrecorded += 1
+            f = child_g + child_h
+            if f > bound:
+                if f < next_bound:
+                    next_bound = f
+            else:
+                children.append((child_move, cell, child_h, child_g))
+        frames.append((children, parent_blank, move))
+        expanded += 1
+        generated += len(options)
+        if observer is not None:
+            observer.expand(cells, g, len(frames), len(options), len(options) - len(children))
+        if len(frames) > deepest:
+            deepest = len(frames)
+        if stop is not None and not expanded & 4095 and stop.is_set():
+            next_bound = float('inf')
+            break
+        # backtrack to the deepest frame with a child left, unmaking moves
+        while frames:
+            children = frames[-1][0]
+            if children:
+                break
+            _, parent_blank, _ = frames.pop()
+            if lineage is not None:
+                lineage.pop()
+            if parent_blank >= 0:
+                cells[blank], cells[parent_blank] = cells[parent_blank], 0
+                blank = parent_blank
+        if not frames:
+            break
+        move, cell, h, g = children.pop()
+        cells[blank], cells[cell] = cells[cell], 0
+        parent_blank, blank = blank, cell
+        if h == 0 and cells == goal_cells:
+            found = [frame[2] for frame in frames[1:]] + [move]
+            deepest = max(deepest, len(found) + 1)
+            break
+        code = encode(cells) if keeping else -1
+        if lineage is not None:
+            lineage.append(code)
+    if stats is not None:
+        stats.nodes_expanded += expanded
+        stats.nodes_generated += generated
+        stats.heuristic_evaluations += generated
+        stats.max_depth = max(stats.max_depth, deepest - 1)
+    return found, next_bound, unrecorded
 
-    all_paths = []
-    bound = heuristic(start, goal)
+@requires_solvable
+def ida_star(start, goal, trace=None, heuristic_name=None):
+    """IDA* over one board mutated in place; each iteration is one ``bounded_search``."""
+    space, start_code, goal_code = encode_problem(start, goal)
+    trace = SearchTrace.attach(trace, space)
+    stats = trace.stats
+    estimate = get_heuristic(heuristic_name, goal)
+    moves_from = pruned_moves(len(start))
+    cells = list(flatten_state(start))
+    goal_cells = list(flatten_state(goal))
+    start_h = bound = estimate.evaluate(cells)
+    stats.heuristic_evaluations = 1
+    blank = cells.index(0)
+    stats.setup_done()
     while True:
-        f, result, costs = search(start, 0, bound, [start], 0, all_paths)
-        if result:
-            return result, costs, all_paths
-        if f == float('inf'):
-            return None, None, all_paths
-        bound = f
\ No newline at end of file
+        stats.iterations += 1
+        trace.record(start_code, start_code, 0)
+        if cells == goal_cells:
+            stats.search_done()
+            return [start], [0], trace
+        moves, next_bound, unrecorded = bounded_search(
+            cells, blank, start_h, 0, -1, bound, goal_cells, estimate.update, moves_from,
+            trace, space.encode, start_code, stats=stats)
+        trace.tally(unrecorded)
+        if moves is not None:
+            stats.search_done()
+            path = space.decode_path(space.follow(start_code, moves))
+            stats.path_done()
+            return path, calculate_costs(path), trace
+        if next_bound == float('inf'):
+            stats.search_done()
+            return None, None, trace
+        bound = next_bound
@@ -1,173 +1,289 @@
 import random
 import math
 import heapq
-from .utils import get_neighbors, get_move_direction, calculate_costs, generate_random_state
-from .informed import heuristic
-from constants import MOVE_COSTS
+from .utils import calculate_costs, flatten_state, unflatten_state, generate_random_state, requires_solvable
+from .heuristics import get_heuristic, scored_successors
+from .space import encode_problem, reconstruct_path, MOVE_COST_LIST
+from .trace import SearchTrace
+from .stats import PathList, SearchStats
+from .hooks import current_observer
 
-def simple_hill_climbing(start, goal):
-    current = start
+def count_step(stats, observer, node, cost, neighbors, visited, depth):
+    """Count one climbing step from ``node``, ``depth`` moves along the path, whose scored ``neighbors`` were just generated.
+
+    Climbers keep no frontier, so the observer sees one of size 0.
+    """
+    stats.iterations += 1
+    stats.nodes_expanded += 1
+    stats.nodes_generated += len(neighbors)
+    stats.heuristic_evaluations += len(neighbors)
+    pruned = sum(1 for _, neighbor, _ in neighbors if neighbor in visited)
+    stats.duplicates_pruned += pruned
+    stats.max_depth = max(stats.max_depth, depth)
+    if observer is not None:
+        observer.expand(node, cost, 0, len(neighbors), pruned)
+
+@requires_solvable
+def simple_hill_climbing(start, goal, trace=None, heuristic_name=None):
+    space, current, goal_code = encode_problem(start, goal)
     path = [current]
+    trace = SearchTrace.attach(trace, space, path)
     costs = [0]
     visited = {current}
-    all_paths = [(path, 0)]
+    trace.record(current, current, 0)
+    estimate = get_heuristic(heuristic_name, goal)
+    current_h = estimate.evaluate(space.cells(current))
+    stats = trace.stats
+    stats.heuristic_evaluations = 1
+    observer = current_observer()
+    stats.setup_done()
     
-    while current != goal:
-        neighbors = get_neighbors(current)
+    while current != goal_code:
         best_neighbor = None
+        best_move = None
         best_heuristic = float('inf')
         
-        for neighbor in neighbors:
+        neighbors = scored_successors(space, current, current_h, estimate)
+        count_step(stats, observer, current, costs[-1], neighbors, visited, len(path) - 1)
+        for move, neighbor, h in neighbors:
             if neighbor not in visited:
-                h = heuristic(neighbor, goal)
                 if h < best_heuristic:
                     best_heuristic = h
                     best_neighbor = neighbor
+                    best_move = move
         
-        if best_neighbor is None or best_heuristic >= heuristic(current, goal):
-            return None, None, all_paths
+        if best_neighbor is None or best_heuristic >= current_h:
+            stats.search_done()
+            return None, None, trace
         
-        direction = get_move_direction(current, best_neighbor)
-        new_cost = costs[-1] + (MOVE_COSTS[direction] if direction else 0)
+        new_cost = costs[-1] + MOVE_COST_LIST[best_move]
         costs.append(new_cost)
         current = best_neighbor
+        current_h = best_heuristic
         path.append(current)
         visited.add(current)
-        all_paths.append((path[:], new_cost))
+        trace.record(current, path[-2], new_cost)
+        if observer is not None:
+            observer.improve(current, current_h)
     
-    return path, costs, all_paths
+    stats.search_done()
+    return space.decode_path(path), costs, trace
 
-def stochastic_hill_climbing(start, goal, max_iterations=100):
-    current = start
+@requires_solvable
+def stochastic_hill_climbing(start, goal, max_iterations=100, trace=None, heuristic_name=None):
+    space, current, goal_code = encode_problem(start, goal)
     path = [current]
+    trace = SearchTrace.attach(trace, space, path)
     costs = [0]
     visited = {current}
-    all_paths = [(path, 0)]
+    trace.record(current, current, 0)
+    estimate = get_heuristic(heuristic_name, goal)
+    current_h = estimate.evaluate(space.cells(current))
+    stats = trace.stats
+    stats.heuristic_evaluations = 1
+    observer = current_observer()
+    stats.setup_done()
     
     for _ in range(max_iterations):
-        neighbors = [n for n in get_neighbors(current) if n not in visited]
-        
-        if not neighbors:
-            return None, None, all_paths
+        neighbors = scored_successors(space, current, current_h, estimate)
+        count_step(stats, observer, current, costs[-1], neighbors, visited, len(path) - 1)
+        neighbor_evals = [(m, n, h) for m, n, h in neighbors if n not in visited]
         
-        current_h = heuristic(current, goal)
-        neighbor_evals = [(n, heuristic(n, goal)) for n in neighbors]
+        if not neighbor_evals:
+            stats.search_done()
+            return None, None, trace
         
-        improving_neighbors = [(n, h) for n, h in neighbor_evals if h < current_h]
+        improving_neighbors = [(m, n, h) for m, n, h in neighbor_evals if h < current_h]
         if not improving_neighbors:
-            return None, None, all_paths
+            stats.search_done()
+            return None, None, trace
         
-        next_state, next_h = random.choice(improving_neighbors)
+        move, next_state, next_h = random.choice(improving_neighbors)
         
-        direction = get_move_direction(current, next_state)
-        new_cost = costs[-1] + (MOVE_COSTS[direction] if direction else 0)
+        new_cost = costs[-1] + MOVE_COST_LIST[move]
         costs.append(next_h)  
         current = next_state
+        current_h = next_h
         path.append(current)
         visited.add(current)
-        all_paths.append((path[:], new_cost))
+        trace.record(current, path[-2], new_cost)
+        if observer is not None:
+            observer.improve(current, current_h)
         
-        if current == goal:
-            return None, None, all_paths
+        if current == goal_code:
+            stats.search_done()
+            return None, None, trace
     
-    return None, None, all_paths
+    stats.search_done()
+    return None, None, trace
 
-def simulated_annealing(start, goal, initial_temperature=1000, cooling_rate=0.995, max_iterations=10000):
-    current = start
+@requires_solvable
+def simulated_annealing(start, goal, initial_temperature=1000, cooling_rate=0.995, max_iterations=10000, trace=None, heuristic_name=None):
+    space, current, goal_code = encode_problem(start, goal)
     path = [current]
+    trace = SearchTrace.attach(trace, space, path)
     costs = [0]
     visited = {current}
-    all_paths = [(path, 0)]
+    trace.record(current, current, 0)
+    estimate = get_heuristic(heuristic_name, goal)
+    current_h = estimate.evaluate(space.cells(current))
     temperature = initial_temperature
+    best_h = current_h
+    stats = trace.stats
+    stats.heuristic_evaluations = 1
+    observer = current_observer()
+    stats.setup_done()
     
     for _ in range(max_iterations):
-        if current == goal:
-            return path, costs, all_paths
-        neighbors = [n for n in get_neighbors(current) if n not in visited]
+        if current == goal_code:
+            stats.search_done()
+            return space.decode_path(path), costs, trace
+        scored = scored_successors(space, current, current_h, estimate)
+        count_step(stats, observer, current, costs[-1], scored, visited, len(path) - 1)
+        neighbors = [(m, n, h) for m, n, h in scored if n not in visited]
         if not neighbors:
-            return None, None, all_paths
-        next_state = random.choice(neighbors)
-        current_h = heuristic(current, goal)
-        next_h = heuristic(next_state, goal)
+            stats.search_done()
+            return None, None, trace
+        move, next_state, next_h = random.choice(neighbors)
         delta_e = next_h - current_h
         if delta_e < 0 or random.random() < math.exp(-delta_e / temperature):
-            direction = get_move_direction(current, next_state)
-            new_cost = costs[-1] + (MOVE_COSTS[direction] if direction else 0)
+            new_cost = costs[-1] + MOVE_COST_LIST[move]
             costs.append(new_cost)
             current = next_state
+            current_h = next_h
             path.append(current)
             visited.add(current)
-            all_paths.append((path[:], new_cost))
+            trace.record(current, path[-2], new_cost)
+            if observer is not None and current_h < best_h:
+                best_h = current_h
+                observer.improve(current, best_h)
         temperature *= cooling_rate
         if temperature < 0.1:
             break
-    return None, None, all_paths
+    stats.search_done()
+    return None, None, trace
 
-def beam_search(start, goal, beam_width=3):
-    queue = [(heuristic(start, goal), start, [start], 0)]
-    visited = {start}
-    all_paths = [(queue[0][2], 0)]
+@requires_solvable
+def beam_search(start, goal, beam_width=3, trace=None, heuristic_name=None):
+    space, start_code, goal_code = encode_problem(start, goal)
+    parents = space.new_parents()
+    trace = SearchTrace.attach(trace, space, parents)
+    estimate = get_heuristic(heuristic_name, goal)
+    queue = [(estimate.evaluate(space.cells(start_code)), start_code, 0)]
+    parents[start_code] = start_code
+    trace.record(start_code, start_code, 0)
+    stats = trace.stats
+    stats.heuristic_evaluations = 1
+    observer = current_observer()
+    best_h = float('inf')
+    stats.setup_done()
     
     while queue:
         queue = sorted(queue, key=lambda x: x[0])[:beam_width]
+        stats.iterations += 1
         next_queue = []
-        for _, state, path, cost in queue:
-            if state == goal:
-                return path, calculate_costs(path), all_paths
-            for neighbor in get_neighbors(state):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    h = heuristic(neighbor, goal)
-                    direction = get_move_direction(state, neighbor)
-                    new_cost = cost + (MOVE_COSTS[direction] if direction else 0)
-                    next_queue.append((h, neighbor, path + [neighbor], new_cost))
-                    all_paths.append((path + [neighbor], new_cost))
+        for code_h, code, cost in queue:
+            if code == goal_code:
+                stats.search_done()
+                path = space.decode_path(reconstruct_path(parents, code))
+                stats.path_done()
+                return path, calculate_costs(path), trace
+            neighbors = scored_successors(space, code, code_h, estimate)
+            stats.nodes_expanded += 1
+            stats.nodes_generated += len(neighbors)
+            stats.heuristic_evaluations += len(neighbors)
+            if observer is not None:
+                observer.expand(code, cost, len(queue), len(neighbors),
+                                sum(parents[neighbor] != -1 for _, neighbor, _ in neighbors))
+                if code_h < best_h:
+                    best_h = code_h
+                    observer.improve(code, best_h)
+            for move, neighbor, h in neighbors:
+                if parents[neighbor] == -1:
+                    parents[neighbor] = code
+                    new_cost = cost + MOVE_COST_LIST[move]
+                    next_queue.append((h, neighbor, new_cost))
+                    trace.record(neighbor, code, new_cost)
+                else:
+                    stats.duplicates_pruned += 1
         queue = next_queue
-    return None, None, all_paths
+        stats.max_frontier = max(stats.max_frontier, len(queue))
+        stats.max_depth = stats.iterations
+    stats.search_done()
+    return None, None, trace
 
-def steepest_ascent_hill_climbing(start, goal, max_iterations=100):
-    current = start
+@requires_solvable
+def steepest_ascent_hill_climbing(start, goal, max_iterations=100, trace=None, heuristic_name=None):
+    space, current, goal_code = encode_problem(start, goal)
     path = [current]
+    trace = SearchTrace.attach(trace, space, path)
     costs = [0]
     visited = {current}
-    all_paths = [(path, 0)]
+    trace.record(current, current, 0)
+    estimate = get_heuristic(heuristic_name, goal)
+    current_h = estimate.evaluate(space.cells(current))
+    stats = trace.stats
+    stats.heuristic_evaluations = 1
+    observer = current_observer()
+    stats.setup_done()
     
     for _ in range(max_iterations):
-        if current == goal:
-            return path, costs, all_paths
+        if current == goal_code:
+            stats.search_done()
+            return space.decode_path(path), costs, trace
             
-        neighbors = get_neighbors(current)
         best_neighbor = None
+        best_move = None
         best_heuristic = float('inf')
-        current_h = heuristic(current, goal)
         
         # Evaluate all neighbors
-        for neighbor in neighbors:
+        neighbors = scored_successors(space, current, current_h, estimate)
+        count_step(stats, observer, current, costs[-1], neighbors, visited, len(path) - 1)
+        for move, neighbor, h in neighbors:
             if neighbor not in visited:
-                h = heuristic(neighbor, goal)
                 if h < best_heuristic:
                     best_heuristic = h
                     best_neighbor = neighbor
+                    best_move = move
         
         # If no better neighbor found, we're at a local maximum
         if best_neighbor is None or best_heuristic >= current_h:
-            return None, None, all_paths
+            stats.search_done()
+            return None, None, trace
             
         # Move to the best neighbor
-        direction = get_move_direction(current, best_neighbor)
-        new_cost = costs[-1] + (MOVE_COSTS[direction] if direction else 0)
+        new_cost = costs[-1] + MOVE_COST_LIST[best_move]
         costs.append(new_cost)
         current = best_neighbor
+        current_h = best_heuristic
         path.append(current)
         visited.add(current)
-        all_paths.append((path[:], new_cost))
+        trace.record(current, path[-2], new_cost)
+        if observer is not None:
+            observer.improve(current, current_h)
     
-    return None, None, all_paths
+    stats.search_done()
+    return None, None, trace
+
+@requires_solvable
+def genetic_algorithm(start, goal, population_size=50, mutation_rate=0.1, max_generations=1000, heuristic_name=None):
+    """Returns (path, costs, all_paths) where ``all_paths`` lists the improvements and carries the stats.
+
+    An individual counts as generated when it is bred (or drawn for the first
+    population), and a bred child already in the new population as a duplicate.
+    """
+    stats = SearchStats()
+    observer = current_observer()
+    estimate = get_heuristic(heuristic_name, goal)
 
-def genetic_algorithm(start, goal, population_size=50, mutation_rate=0.1, max_generations=1000):
     def fitness_fn(state):
-        return -heuristic(state, goal)  # Negative because lower heuristic is better
+        stats.heuristic_evaluations += 1
+        return -estimate.evaluate(flatten_state(state))  # Negative because lower heuristic is better
     
+    cell_count = len(start) * len(start)
+    # a 2x2 board has only 12 reachable states, fewer than a default population
+    population_size = min(population_size, math.factorial(cell_count) // 2)
+
     def reproduce(x, y):
         x_flat = [num for row in x for num in row]
         y_flat = [num for row in y for num in row]
@@ -177,32 +293,24 @@ def genetic_algorithm(start, goal, population_size=50, mutation_rate=0.1, max_ge
         used = set(child_flat[:c])
         for i in range(c, n):
             if child_flat[i] in used:
-                for num in range(9):
+                for num in range(cell_count):
                     if num not in used:
                         child_flat[i] = num
                         used.add(num)
                         break
             else:
                 used.add(child_flat[i])
-        if len(set(child_flat)) != 9:
+        if len(set(child_flat)) != cell_count:
             return reproduce(x, y)
-        return (
-            tuple(child_flat[0:3]),
-            tuple(child_flat[3:6]),
-            tuple(child_flat[6:9])
-        )
+        return unflatten_state(child_flat)
     
     def mutate(state):
         state_flat = [num for row in state for num in row]
-        i, j = random.sample(range(9), 2)
+        i, j = random.sample(range(cell_count), 2)
         state_flat[i], state_flat[j] = state_flat[j], state_flat[i]
-        if len(set(state_flat)) != 9:
+        if len(set(state_flat)) != cell_count:
             return mutate(state)
-        return (
-            tuple(state_flat[0:3]),
-            tuple(state_flat[3:6]),
-            tuple(state_flat[6:9])
-        )
+        return unflatten_state(state_flat)
     
     def random_selection(population, fitness_fn):
         # Tournament selection
@@ -213,17 +321,24 @@ def genetic_algorithm(start, goal, population_size=50, mutation_rate=0.1, max_ge
     # Initialize population with start state and random states (no duplicates)
     population = [start]
     while len(population) < population_size:
-        state = generate_random_state()
+        state = generate_random_state(len(start), goal)
+        stats.nodes_generated += 1
         if state not in population:
             population.append(state)
+        else:
+            stats.duplicates_pruned += 1
+    stats.nodes_expanded = stats.max_frontier = len(population)
     best_individual = max(population, key=fitness_fn)
     best_fitness = fitness_fn(best_individual)
     
     path = [best_individual]
     costs = [0]
-    all_paths = [(path[:], 0)]
+    all_paths = PathList([(path[:], 0)], stats)
+    stats.setup_done()
     
     for generation in range(max_generations):
+        stats.iterations += 1
+        bred = stats.nodes_generated
         new_population = set()
 
         # Create new population (avoid duplicates)
@@ -236,10 +351,18 @@ def genetic_algorithm(start, goal, population_size=50, mutation_rate=0.1, max_ge
             if random.random() < mutation_rate:
                 child = mutate(child)
 
+            stats.nodes_generated += 1
+            if child in new_population:
+                stats.duplicates_pruned += 1
             new_population.add(child)
 
         # Convert set back to list for next generation
         population = list(new_population)
+        stats.nodes_expanded += len(population)
+        if observer is not None:
+            # one generation reads as one expansion of the best parent
+            bred = stats.nodes_generated - bred
+            observer.expand(best_individual, -best_fitness, len(population), bred, bred - len(population))
 
                 
         # Update best individual
@@ -252,9 +375,13 @@ def genetic_algorithm(start, goal, population_size=50, mutation_rate=0.1, max_ge
             path.append(best_individual)
             costs.append(-best_fitness)  # Convert back to positive cost
             all_paths.append((path[:], costs[-1]))
+            if observer is not None:
+                observer.improve(best_individual, costs[-1])
         
         # Check if we've found the goal
         if best_individual == goal:
-            return path, costs, all_paths
+            break
     
+    stats.max_depth = len(path) - 1
+    stats.search_done()
     return path, costs, all_paths
\ No newline at end of file
@@ -0,0 +1,127 @@
+import os
+import multiprocessing
+from collections import deque
+from .utils import calculate_costs, flatten_state, requires_solvable
+from .space import encode_problem, pruned_moves
+from .heuristics import get_heuristic
+from .informed import bounded_search
+from .trace import SearchTrace
+from .stats import SearchStats
+
+# per-process state set up by _init_worker
+_worker = {}
+
+def _init_worker(goal, heuristic_name, stop):
+    estimate = get_heuristic(heuristic_name, goal)
+    _worker.update(goal_cells=list(flatten_state(goal)), update=estimate.update,
+                   moves_from=pruned_moves(len(goal)), stop=stop)
+
+def _search_subtree(task):
+    index, cells, blank, h, g, move, depth, bound = task
+    stop = _worker["stop"]
+    stats = SearchStats()
+    if stop.is_set():
+        return index, None, float('inf'), stats
+    moves, next_bound, _ = bounded_search(
+        list(cells), blank, h, g, move, bound,
+        _worker["goal_cells"], _worker["update"], _worker["moves_from"], stop=stop, stats=stats)
+    if moves is not None:
+        stop.set()
+    # depths inside the subtree count from its root
+    stats.max_depth += depth
+    return index, moves, next_bound, stats
+
+def split_root(cells, h, goal_cells, update, moves_from, size):
+    """Expand the root breadth-first until there are at least ``size`` subtree roots.
+
+    Each root is (cells, blank, h, g, last move, moves from the start). Goal
+    boards are kept as roots rather than expanded. Returns (roots, nodes
+    expanded, nodes generated).
+    """
+    frontier = deque([(tuple(cells), cells.index(0), h, 0, -1, ())])
+    goals = []
+    expanded = generated = 0
+    while frontier and len(frontier) + len(goals) < size:
+        node_cells, blank, node_h, g, move, path = frontier.popleft()
+        if node_h == 0 and list(node_cells) == goal_cells:
+            goals.append((node_cells, blank, node_h, g, move, path))
+            continue
+        board = list(node_cells)
+        expanded += 1
+        for child_move, cell, cost in moves_from[blank][move + 1]:
+            child_h = update(node_h, board, board[cell], cell, blank)
+            board[blank], board[cell] = board[cell], 0
+            frontier.append((tuple(board), cell, child_h, g + cost, child_move, path + (child_move,)))
+            board[cell], board[blank] = board[blank], 0
+            generated += 1
+    return list(frontier) + goals, expanded, generated
+
+@requires_solvable
+def parallel_ida_star(start, goal, workers=None, frontier_size=2000, trace=None, heuristic_name=None):
+    """IDA* with each contour split over a process pool.
+
+    The root is expanded once into about ``frontier_size`` subtrees. For each
+    bound, the subtrees within it are handed out in small chunks (about 16
+    per worker) to whichever worker is free, and the first
+    worker to reach the goal sets a shared event that makes the others
+    abandon their subtrees. Every solution found within a bound is optimal,
+    so the cost matches ``ida_star`` even when the path differs.
+    """
+    space, start_code, goal_code = encode_problem(start, goal)
+    trace = SearchTrace.attach(trace, space)
+    stats = trace.stats
+    # built (and saved, for pattern databases) here so the workers only load it
+    estimate = get_heuristic(heuristic_name, goal)
+    cells = list(flatten_state(start))
+    goal_cells = list(flatten_state(goal))
+    bound = estimate.evaluate(cells)
+    stats.heuristic_evaluations = 1
+    trace.record(start_code, start_code, 0)
+    if cells == goal_cells:
+        return [start], [0], trace
+    roots, split_expanded, split_count = split_root(cells, bound, goal_cells, estimate.update,
+                                                    pruned_moves(len(start)), frontier_size)
+    stats.max_depth = max(len(root[5]) for root in roots)
+    stop = multiprocessing.Event()
+    workers = workers or os.cpu_count()
+    with multiprocessing.Pool(workers, _init_worker, (goal, heuristic_name, stop)) as pool:
+        stats.setup_done()
+        while True:
+            # every pass re-walks the split as sequential IDA* would
+            stats.iterations += 1
+            stats.nodes_expanded += split_expanded
+            stats.nodes_generated += split_count
+            stats.heuristic_evaluations += split_count
+            trace.tally(split_count)
+            next_bound = float('inf')
+            moves = None
+            tasks = []
+            for index, (root_cells, blank, h, g, move, path) in enumerate(roots):
+                f = g + h
+                if f > bound:
+                    next_bound = min(next_bound, f)
+                elif h == 0 and list(root_cells) == goal_cells:
+                    moves = list(path)
+                    break
+                else:
+                    tasks.append((index, root_cells, blank, h, g, move, len(path), bound))
+            if moves is None:
+                stop.clear()
+                chunk = max(1, len(tasks) // (workers * 16))
+                for index, found, sub_bound, sub_stats in pool.imap_unordered(_search_subtree, tasks, chunk):
+                    trace.tally(sub_stats.nodes_generated)
+                    stats.merge(sub_stats)
+                    if found is not None:
+                        moves = list(roots[index][5]) + found
+                        break
+                    next_bound = min(next_bound, sub_bound)
+            if moves is not None:
+                stats.search_done()
+                path = space.decode_path(space.follow(start_code, moves))
+                stats.path_done()
+                return path, calculate_costs(path), trace
+            if next_bound == float('inf'):
+                stats.search_done()
+                return None, None, trace
+            bound = next_bound
+            trace.record(start_code, start_code, 0)
@@ -0,0 +1,126 @@
+import os
+from collections import deque
+from functools import lru_cache
+from .utils import flatten_state, pack_state
+from .space import map_cache_file, save_cache_file
+from constants import CACHE_DIR, PDB_LAYOUTS
+
+def parse_layout(layout):
+    return tuple(int(part) for part in layout.split("-"))
+
+def pattern_groups(goal, layout):
+    """Split the goal's tiles, in row-major goal order, into consecutive groups of the layout sizes."""
+    tiles = [t for t in flatten_state(goal) if t]
+    sizes = parse_layout(layout)
+    if sum(sizes) != len(tiles):
+        raise ValueError(f"Layout {layout} does not cover {len(tiles)} tiles")
+    groups, start = [], 0
+    for size in sizes:
+        groups.append(tuple(tiles[start:start + size]))
+        start += size
+    return groups
+
+def build_pattern_table(goal, tiles):
+    """Backward BFS over placements of ``tiles`` from their goal cells.
+
+    A placement is indexed as the base-n number of the tiles' cells. Every
+    other cell counts as free, so each abstract move slides one pattern tile
+    into a free neighbour; the resulting move counts are admissible and add
+    up across disjoint patterns.
+    """
+    size = len(goal)
+    n = size * size
+    k = len(tiles)
+    cells = flatten_state(goal)
+    weights = [n ** (k - 1 - i) for i in range(k)]
+    neighbours = []
+    for cell in range(n):
+        r, c = divmod(cell, size)
+        neighbours.append([nr * size + nc for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1))
+                           if 0 <= nr < size and 0 <= nc < size])
+    table = bytearray(b"\xff") * (n ** k)
+    goal_index = sum(cells.index(t) * w for t, w in zip(tiles, weights))
+    table[goal_index] = 0
+    queue = deque([goal_index])
+    while queue:
+        index = queue.popleft()
+        dist = table[index] + 1
+        positions = []
+        rest = index
+        for w in weights:
+            cell, rest = divmod(rest, w)
+            positions.append(cell)
+        for i, cell in enumerate(positions):
+            w = weights[i]
+            for nxt in neighbours[cell]:
+                if nxt in positions:
+                    continue
+                child = index + (nxt - cell) * w
+                if table[child] == 0xFF:
+                    table[child] = dist
+                    queue.append(child)
+    return table
+
+class PatternDatabase:
+    """Disjoint additive pattern databases for one goal and layout.
+
+    ``update`` re-reads only the pattern holding the moved tile, so a child's
+    h costs one lookup on top of locating that pattern's tiles.
+    """
+
+    def __init__(self, goal, layout=None):
+        self.size = len(goal)
+        self.cell_count = n = self.size * self.size
+        self.layout = layout or PDB_LAYOUTS[self.size]
+        self.groups = pattern_groups(goal, self.layout)
+        self.path = os.path.join(CACHE_DIR, f"pdb_{self.size}x{self.size}_{self.layout}_{pack_state(goal):x}.bin")
+        self.tables = self._load(goal)
+        self.weights = [[n ** (len(tiles) - 1 - i) for i in range(len(tiles))] for tiles in self.groups]
+        self.tile_slot = {}
+        for g, tiles in enumerate(self.groups):
+            for i, tile in enumerate(tiles):
+                self.tile_slot[tile] = (g, self.weights[g][i])
+
+    def _load(self, goal):
+        n = self.cell_count
+        lengths = [n ** len(tiles) for tiles in self.groups]
+        mapped = map_cache_file(self.path, sum(lengths))
+        if mapped is None:
+            tables = [build_pattern_table(goal, tiles) for tiles in self.groups]
+            try:
+                save_cache_file(self.path, tables)
+            except OSError:
+                pass
+            return tables
+        mapped = memoryview(mapped)
+        tables, offset = [], 0
+        for length in lengths:
+            tables.append(mapped[offset:offset + length])
+            offset += length
+        return tables
+
+    def _pattern_index(self, group, cells):
+        return sum(cells.index(t) * w for t, w in zip(self.groups[group], self.weights[group]))
+
+    def evaluate(self, cells):
+        position = [0] * self.cell_count
+        for cell, tile in enumerate(cells):
+            position[tile] = cell
+        total = 0
+        for tiles, weights, table in zip(self.groups, self.weights, self.tables):
+            total += table[sum(position[t] * w for t, w in zip(tiles, weights))]
+        return total
+
+    def update(self, h, cells, tile, src, dst):
+        """h after ``tile`` slides from ``src`` to ``dst`` on the parent board ``cells``."""
+        group, weight = self.tile_slot[tile]
+        table = self.tables[group]
+        index = self._pattern_index(group, cells)
+        return h - table[index] + table[index + (dst - src) * weight]
+
+    def file_size(self):
+        return os.path.getsize(self.path) if os.path.exists(self.path) else sum(len(t) for t in self.tables)
+
+@lru_cache(maxsize=8)
+def pattern_database(goal, layout=None):
+    return PatternDatabase(goal, layout)
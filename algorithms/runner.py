@@ -0,0 +1,253 @@
+import inspect
+import json
+import math
+import multiprocessing
+import os
+import queue
+import re
+import signal
+import time
+from .uninformed import bfs, dfs, ucs, ids
+from .informed import greedy, astar, ida_star
+from .bidirectional import bidirectional_bfs, bidirectional_ucs, bidirectional_astar
+from .local import simple_hill_climbing, stochastic_hill_climbing, simulated_annealing, beam_search, genetic_algorithm, steepest_ascent_hill_climbing
+from .complex import and_or_graph_search
+from .constraint import solve
+from .Reforcement_learning import q_learning
+from .database import table_lookup, table_lookup_cost
+from .trace import SearchTrace
+from .stats import PathList, SearchStats, search_stats
+from .hooks import observing, NodeBudget, BudgetExceeded
+from .utils import calculate_costs, flatten_state, unflatten_state, goal_state, UNSOLVABLE
+
+def constraint_search(method):
+    """Adapt the CSP ``solve`` (which fills the standard goal) to the (path, costs, all_paths) interface."""
+    def search(start, goal):
+        stats = SearchStats()
+        result = solve(start, method=method)
+        stats.search_done()
+        stats.nodes_expanded, stats.max_depth = result['nodes_expanded'], result['max_depth']
+        path = result['path']
+        if not result['solution'] or not path:
+            return None, None, PathList(stats=stats)
+        costs = calculate_costs(path)
+        all_paths = PathList(((path[:i+1], costs[i]) for i in range(len(path))), stats)
+        stats.path_done()
+        return path, costs, all_paths
+    return search
+
+def q_learning_search(start, goal):
+    return q_learning(start, goal, episodes=2000, alpha=0.1, gamma=0.9,
+                      epsilon_start=1.0, epsilon_end=0.01, max_steps=100)
+
+# Every algorithm that needs nothing but a start and a goal, by its ALGORITHM_CATEGORIES name.
+# The belief-state searches read their inputs from the GUI and are not listed.
+ALGORITHMS = {
+    "BFS": bfs,
+    "DFS": dfs,
+    "UCS": ucs,
+    "IDS": ids,
+    "Bidirectional BFS": bidirectional_bfs,
+    "Bidirectional UCS": bidirectional_ucs,
+    "Greedy": greedy,
+    "A*": astar,
+    "IDA*": ida_star,
+    "Bidirectional A*": bidirectional_astar,
+    "Simple HC": simple_hill_climbing,
+    "Stochastic HC": stochastic_hill_climbing,
+    "Simulated Annealing": simulated_annealing,
+    "Beam Search": beam_search,
+    "Steepest Ascent HC": steepest_ascent_hill_climbing,
+    "Genetic Algorithm": genetic_algorithm,
+    "And-Or Graph Search": and_or_graph_search,
+    "Backtracking": constraint_search('backtracking'),
+    "AC-3": constraint_search('ac3'),
+    "Forward Checking": constraint_search('forward'),
+    "Q-Learning": q_learning_search,
+    "Table Lookup": table_lookup,
+    "Table Lookup (Cost)": table_lookup_cost,
+}
+
+class SolveTimeout(Exception):
+    """Raised inside a search when its per-instance time limit runs out."""
+
+def _on_alarm(signum, frame):
+    raise SolveTimeout()
+
+def enable_timeouts():
+    """Make SIGALRM raise SolveTimeout in this process; False where there is no SIGALRM (Windows)."""
+    if not hasattr(signal, "setitimer"):
+        return False
+    signal.signal(signal.SIGALRM, _on_alarm)
+    return True
+
+def run_algorithm(name, start, goal, heuristic_name=None):
+    """Run one registered algorithm; returns (path, costs, SearchStats), the stats None when unsolvable.
+
+    Searches that take a trace get a counting one, so memory does not grow
+    with the explored nodes; ``heuristic_name`` is passed to those that take it.
+    """
+    solver = ALGORITHMS[name]
+    params = inspect.signature(solver).parameters
+    kwargs = {}
+    if "trace" in params:
+        kwargs["trace"] = SearchTrace("count")
+    if heuristic_name is not None and "heuristic_name" in params:
+        kwargs["heuristic_name"] = heuristic_name
+    path, costs, explored = solver(start, goal, **kwargs)
+    if explored is UNSOLVABLE:
+        return None, None, None
+    return path, costs, search_stats(explored)
+
+def solve_job(target, args, node_budget, progress, results, trace_limit=None):
+    """Subprocess entry point of the GUI's solves; puts one (status, payload) pair on ``results``.
+
+    ``target`` is an ALGORITHMS name or a picklable search function, called
+    with ``args``. ``progress`` is a shared integer holding the expansions so
+    far; past ``node_budget`` expansions (None for no limit) the search is
+    stopped. Only the searches that report to observers see the budget; the
+    caller enforces the wall-clock limit by terminating the process.
+    Searches that take a trace keep its first ``trace_limit`` entries (the
+    default trace when None).
+
+    The statuses are "solved" or "no_solution" with (path, costs, all_paths,
+    seconds), "unsolvable", "budget" with the expansions reached, and "error"
+    with the message. A returned trace comes back detached: set its
+    ``space`` before reading entries.
+    """
+    solver = ALGORITHMS[target] if isinstance(target, str) else target
+    kwargs = {}
+    if trace_limit and "trace" in inspect.signature(solver).parameters:
+        kwargs["trace"] = SearchTrace("first", trace_limit)
+    def report(nodes):
+        progress.value = nodes
+    started = time.perf_counter()
+    try:
+        with observing(NodeBudget(node_budget, report)):
+            path, costs, all_paths = solver(*args, **kwargs)
+    except BudgetExceeded as e:
+        results.put(("budget", e.args[0]))
+        return
+    except Exception as e:
+        results.put(("error", f"{type(e).__name__}: {e}"))
+        return
+    seconds = time.perf_counter() - started
+    if all_paths is UNSOLVABLE:
+        results.put(("unsolvable", None))
+        return
+    if isinstance(all_paths, SearchTrace):
+        all_paths.detach()
+    results.put(("solved" if path else "no_solution", (path, costs, all_paths, seconds)))
+
+def parse_board(line):
+    """Board and extra fields from one input line, or None for a blank or ``#`` line.
+
+    A line is a JSON list (flat or nested), a JSON object with ``board`` and
+    optionally ``goal`` and ``id``, or n*n integers separated by commas or
+    whitespace. Raises ValueError when it is none of these.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    extra = {}
+    if line[0] in "[{":
+        data = json.loads(line)
+        if isinstance(data, dict):
+            extra = {k: v for k, v in data.items() if k != "board"}
+            data = data.get("board")
+    else:
+        data = [int(part) for part in re.split(r"[\s,;]+", line) if part]
+    return _board(data), extra
+
+def _board(data):
+    if not isinstance(data, list):
+        raise ValueError("board must be a list of numbers")
+    cells = [int(v) for row in data for v in (row if isinstance(row, list) else [row])]
+    size = math.isqrt(len(cells))
+    if size < 2 or size * size != len(cells) or sorted(cells) != list(range(len(cells))):
+        raise ValueError(f"not a permutation of 0..n*n-1 for a square board: {cells}")
+    return unflatten_state(cells)
+
+def solve_instance(task):
+    """Worker entry point: solve one parsed line and return its JSON-ready result record."""
+    line_no, text, name, heuristic_name, timeout = task
+    record = {"line": line_no, "algorithm": name}
+    started = time.perf_counter()
+    try:
+        start, extra = parse_board(text)
+        record.update(extra)
+        record["board"] = list(flatten_state(start))
+        goal = _board(extra["goal"]) if "goal" in extra else goal_state(len(start))
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            path, costs, stats = run_algorithm(name, start, goal, heuristic_name)
+        finally:
+            if timeout:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        if stats is None:
+            record["status"] = "unsolvable"
+        elif path:
+            record.update(status="solved", moves=len(path) - 1, cost=costs[-1], nodes=stats.nodes_expanded,
+                          stats=stats.as_dict(), path=[list(flatten_state(state)) for state in path])
+        else:
+            record.update(status="no_solution", nodes=stats.nodes_expanded, stats=stats.as_dict())
+    except SolveTimeout:
+        record["status"] = "timeout"
+    except MemoryError:
+        record["status"] = "out_of_memory"
+    except Exception as e:
+        # one bad board or solver failure must not stop a long batch
+        record.update(status="error", error=f"{type(e).__name__}: {e}")
+    record["seconds"] = round(time.perf_counter() - started, 6)
+    return record
+
+def board_line(start, goal):
+    """The input line ``solve_instance`` reads back as ``start`` and ``goal``."""
+    return json.dumps({"board": list(flatten_state(start)), "goal": list(flatten_state(goal))})
+
+def _init_batch_worker(memory_limit):
+    enable_timeouts()
+    if memory_limit:
+        try:
+            import resource
+        except ImportError:
+            return  # no address-space limits on Windows
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+def solver_pool(workers=None, memory_limit=None):
+    """Process pool for ``solve_instance`` tasks: per-task timeouts work and each worker's address space is capped at ``memory_limit`` bytes."""
+    return multiprocessing.Pool(workers or os.cpu_count(), _init_batch_worker, (memory_limit,))
+
+def solve_stream(lines, name, workers=None, timeout=None, heuristic_name=None,
+                 memory_limit=None, window=None):
+    """Solve the boards on ``lines`` across a process pool, yielding result records in completion order.
+
+    Lines are read lazily and at most ``window`` (four per worker by
+    default) are in flight, so memory stays flat however long the input is.
+    ``timeout`` is in seconds per board and needs SIGALRM (not on Windows);
+    ``memory_limit`` caps each worker's address space in bytes.
+    """
+    if name not in ALGORITHMS:
+        raise ValueError(f"Unknown or GUI-only algorithm: {name}")
+    workers = workers or os.cpu_count()
+    window = window or workers * 4
+    if timeout and not hasattr(signal, "setitimer"):
+        timeout = None
+    done = queue.Queue()
+    pending = 0
+    with solver_pool(workers, memory_limit) as pool:
+        for line_no, text in enumerate(lines, 1):
+            if not text.strip() or text.lstrip().startswith("#"):
+                continue
+            pool.apply_async(solve_instance, ((line_no, text, name, heuristic_name, timeout),),
+                             callback=done.put,
+                             error_callback=lambda e, n=line_no: done.put(
+                                 {"line": n, "algorithm": name, "status": "error", "error": repr(e)}))
+            pending += 1
+            while pending >= window or not done.empty():
+                yield done.get()
+                pending -= 1
+        while pending:
+            yield done.get()
+            pending -= 1
@@ -0,0 +1,306 @@
+import os
+import mmap
+import tempfile
+from array import array
+from functools import lru_cache
+from .utils import rank_state, unrank_cells, unflatten_state, state_parity, half_permutations, cell_bits, pack_state, unpack_cells
+from constants import CACHE_DIR, MOVE_COSTS
+
+MOVES = ("up", "down", "left", "right")
+MOVE_OFFSETS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+MOVE_COST_LIST = tuple(MOVE_COSTS[m] for m in MOVES)
+
+_spaces = {}
+
+@lru_cache(maxsize=None)
+def blank_moves(size):
+    """For each blank cell, the (move index, cell the blank moves to) pairs that stay on the board."""
+    table = []
+    for blank in range(size * size):
+        row, col = divmod(blank, size)
+        moves = []
+        for move, (dr, dc) in enumerate(MOVE_OFFSETS):
+            nr, nc = row + dr, col + dc
+            if 0 <= nr < size and 0 <= nc < size:
+                moves.append((move, nr * size + nc))
+        table.append(tuple(moves))
+    return tuple(table)
+
+@lru_cache(maxsize=None)
+def pruned_moves(size):
+    """``[blank][last move + 1]``: (move, cell, cost) for every move except the one undoing ``last move``.
+
+    The entries are in reverse MOVES order, so a search popping them from a
+    stack tries the moves in MOVES order; ``last move == -1`` keeps them all.
+    """
+    return tuple(
+        tuple(tuple((move, cell, MOVE_COST_LIST[move]) for move, cell in reversed(moves)
+                    if last < 0 or move != last ^ 1)
+              for last in range(-1, 4))
+        for moves in blank_moves(size))
+
+def _table_file(size, parity):
+    return os.path.join(CACHE_DIR, f"successors_{size}x{size}_p{parity}.bin")
+
+def build_successor_table(size=3, parity=0):
+    """Successor rank for every (rank, move) of one parity class, -1 off the board.
+
+    Horizontal moves keep the tile order, so only the blank part of the rank
+    changes; vertical moves need one re-rank.
+    """
+    cell_count = size * size
+    half = half_permutations(cell_count)
+    count = half * cell_count
+    table = array('i', [-1]) * (count * 4)
+    for rank in range(count):
+        cells = unrank_cells(rank, parity, cell_count)
+        blank = rank // half
+        row, col = divmod(blank, size)
+        base = rank * 4
+        for move, (dr, dc) in enumerate(MOVE_OFFSETS):
+            nr, nc = row + dr, col + dc
+            if 0 <= nr < size and 0 <= nc < size:
+                nb = nr * size + nc
+                if dc:
+                    table[base + move] = rank + (nb - blank) * half
+                else:
+                    cells[blank], cells[nb] = cells[nb], cells[blank]
+                    table[base + move] = rank_state(cells)
+                    cells[blank], cells[nb] = cells[nb], cells[blank]
+    return table
+
+def save_cache_file(path, chunks):
+    """Write ``chunks`` to ``path`` through a temporary file of this process's own in CACHE_DIR.
+
+    Other processes building the same file at the same time each replace it
+    whole, so readers never map a half-written one.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    f = tempfile.NamedTemporaryFile(dir=CACHE_DIR, prefix=os.path.basename(path) + ".", suffix=".tmp", delete=False)
+    try:
+        with f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(f.name, path)
+    except BaseException:
+        try:
+            os.unlink(f.name)
+        except OSError:
+            pass
+        raise
+
+def map_cache_file(path, size):
+    """Read-only memory map of a cache file, or None if it is missing or not ``size`` bytes long."""
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size != size:
+                return None
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        return None
+
+def load_successor_table(size=3, parity=0):
+    """Memory-map the table from the cache directory, building and saving it when missing or truncated."""
+    path = _table_file(size, parity)
+    cell_count = size * size
+    mapped = map_cache_file(path, half_permutations(cell_count) * cell_count * 4 * array('i').itemsize)
+    if mapped is not None:
+        return memoryview(mapped).cast('i')
+    table = build_successor_table(size, parity)
+    try:
+        save_cache_file(path, [table])
+    except OSError:
+        pass
+    return table
+
+class StateSpace:
+    """Rank-indexed state space of one parity class.
+
+    Codes are ranks from ``rank_state``; expansion is a lookup in the
+    successor table instead of building new boards.
+    """
+
+    def __init__(self, size=3, parity=0):
+        self.size = size
+        self.parity = parity
+        self.cell_count = size * size
+        self.half = half_permutations(self.cell_count)
+        self.count = self.half * self.cell_count
+        self._table = None
+
+    @property
+    def table(self):
+        if self._table is None:
+            self._table = load_successor_table(self.size, self.parity)
+        return self._table
+
+    def contains(self, state):
+        return len(state) == self.size and state_parity(state) == self.parity
+
+    def encode(self, state):
+        return rank_state(state)
+
+    def decode(self, code):
+        return unflatten_state(unrank_cells(code, self.parity, self.cell_count))
+
+    def cells(self, code):
+        return unrank_cells(code, self.parity, self.cell_count)
+
+    def blank(self, code):
+        return code // self.half
+
+    def decode_path(self, codes):
+        return [self.decode(code) for code in codes]
+
+    def follow(self, code, moves):
+        """Codes visited by applying move indices from ``code``, starting with ``code``."""
+        codes = [code]
+        for move in moves:
+            codes.append(self.successor(codes[-1], move))
+        return codes
+
+    def new_parents(self):
+        """Parent array indexed by code, -1 for states not reached yet."""
+        return array('i', [-1]) * self.count
+
+    def new_costs(self):
+        """Best-known g per code, -1 for states not reached yet."""
+        return array('i', [-1]) * self.count
+
+    def new_path_flags(self):
+        """On-path bitmap indexed by code (one byte per state)."""
+        return bytearray(self.count)
+
+    def new_action_values(self):
+        """Float per (code, move) at ``code * 4 + move``, all 0.0; 8 bytes per entry."""
+        return array('d', [0.0]) * (4 * self.count)
+
+    def successors(self, code):
+        """List of (move index, child code) pairs."""
+        base = code * 4
+        return [(move, child) for move, child in enumerate(self.table[base:base + 4]) if child >= 0]
+
+    def successor(self, code, move):
+        return self.table[code * 4 + move]
+
+class ParentMap(dict):
+    """Sparse stand-in for the parent array: unseen codes read as -1."""
+
+    def __missing__(self, code):
+        return -1
+
+class PathFlags(dict):
+    """Sparse stand-in for the on-path bitmap: unset codes read as 0.
+
+    Searches delete a code when it leaves the path, so it only ever holds the path.
+    """
+
+    def __missing__(self, code):
+        return 0
+
+class ActionValues(dict):
+    """Sparse stand-in for the action-value array: unset (code, move) entries read as 0.0."""
+
+    def __missing__(self, key):
+        return 0.0
+
+class PackedSpace:
+    """State space of boards too big to rank into a table (4x4 and up).
+
+    Codes are ``pack_state`` ints and successors are computed by moving one
+    tile's bits, so nothing is allocated per state count; parents live in a
+    dict instead of an array.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.cell_count = size * size
+        self.bits = cell_bits(self.cell_count)
+        self.mask = (1 << self.bits) - 1
+        self.count = None
+        self.neighbours = blank_moves(size)
+
+    def contains(self, state):
+        return len(state) == self.size
+
+    def encode(self, state):
+        return pack_state(state)
+
+    def decode(self, code):
+        return unflatten_state(unpack_cells(code, self.cell_count))
+
+    def cells(self, code):
+        return unpack_cells(code, self.cell_count)
+
+    def blank(self, code):
+        return code & self.mask
+
+    def decode_path(self, codes):
+        return [self.decode(code) for code in codes]
+
+    def follow(self, code, moves):
+        """Codes visited by applying move indices from ``code``, starting with ``code``."""
+        codes = [code]
+        for move in moves:
+            codes.append(self.successor(codes[-1], move))
+        return codes
+
+    def new_parents(self):
+        return ParentMap()
+
+    def new_costs(self):
+        return ParentMap()
+
+    def new_path_flags(self):
+        return PathFlags()
+
+    def new_action_values(self):
+        return ActionValues()
+
+    def _slide(self, code, blank, cell):
+        # the tile on ``cell`` moves onto ``blank`` and the blank index becomes ``cell``
+        bits = self.bits
+        tile = (code >> ((cell + 1) * bits)) & self.mask
+        return code + (tile << ((blank + 1) * bits)) - (tile << ((cell + 1) * bits)) + cell - blank
+
+    def successors(self, code):
+        blank = code & self.mask
+        return [(move, self._slide(code, blank, cell)) for move, cell in self.neighbours[blank]]
+
+    def successor(self, code, move):
+        blank = code & self.mask
+        for m, cell in self.neighbours[blank]:
+            if m == move:
+                return self._slide(code, blank, cell)
+        return -1
+
+def get_space(state):
+    """Ranked table space for 3x3, packed space for every other size.
+
+    The ranked space is one tile-parity class, which is closed under moves
+    only on odd widths; on even widths a vertical move flips the parity.
+    """
+    size = len(state)
+    ranked = size == 3
+    key = (size, state_parity(state)) if ranked else (size,)
+    space = _spaces.get(key)
+    if space is None:
+        space = _spaces[key] = StateSpace(*key) if ranked else PackedSpace(size)
+    return space
+
+def encode_problem(start, goal):
+    """Return (space, start code, goal code); the goal code is -1 if the goal is outside the start's space."""
+    space = get_space(start)
+    goal_code = space.encode(goal) if space.contains(goal) else -1
+    return space, space.encode(start), goal_code
+
+def reconstruct_path(parents, code):
+    """Walk parent pointers back to the root (whose parent is itself)."""
+    path = [code]
+    parent = parents[code]
+    while parent != code:
+        code = parent
+        path.append(code)
+        parent = parents[code]
+    path.reverse()
+    return path
@@ -0,0 +1,74 @@
+import time
+from dataclasses import dataclass, field, asdict
+
+@dataclass(slots=True)
+class SearchStats:
+    """Counters every solver fills in, read through ``search_stats``.
+
+    Counters a solver has no notion of stay 0 (a hill climber has no
+    frontier, IDA* prunes no duplicates). ``max_depth`` is the most moves
+    from the root of any node expanded. ``iterations`` counts deepening
+    passes, climbing steps, generations or episodes, whichever the solver
+    repeats. The three times split the wall time at the ``*_done`` calls.
+    """
+    nodes_expanded: int = 0
+    nodes_generated: int = 0
+    duplicates_pruned: int = 0
+    max_frontier: int = 0
+    max_depth: int = 0
+    heuristic_evaluations: int = 0
+    iterations: int = 0
+    setup_time: float = 0.0
+    search_time: float = 0.0
+    path_time: float = 0.0
+    _mark: float = field(default_factory=time.perf_counter, repr=False)
+
+    def _lap(self):
+        now = time.perf_counter()
+        elapsed, self._mark = now - self._mark, now
+        return elapsed
+
+    def setup_done(self):
+        self.setup_time += self._lap()
+
+    def search_done(self):
+        self.search_time += self._lap()
+
+    def path_done(self):
+        self.path_time += self._lap()
+
+    def merge(self, other):
+        """Add another search's counters (a worker's share of one search); peaks take the larger value."""
+        self.nodes_expanded += other.nodes_expanded
+        self.nodes_generated += other.nodes_generated
+        self.duplicates_pruned += other.duplicates_pruned
+        self.heuristic_evaluations += other.heuristic_evaluations
+        self.iterations += other.iterations
+        self.max_frontier = max(self.max_frontier, other.max_frontier)
+        self.max_depth = max(self.max_depth, other.max_depth)
+
+    @property
+    def total_time(self):
+        return self.setup_time + self.search_time + self.path_time
+
+    def as_dict(self):
+        data = asdict(self)
+        del data["_mark"]
+        return data
+
+class PathList(list):
+    """``all_paths`` list of (path, cost) pairs that also carries the solver's SearchStats."""
+
+    def __init__(self, entries=(), stats=None):
+        super().__init__(entries)
+        self.stats = stats if stats is not None else SearchStats()
+
+def search_stats(all_paths):
+    """The SearchStats behind a solver's third return value.
+
+    Lists from solvers that keep no counters read as that many expanded nodes.
+    """
+    stats = getattr(all_paths, "stats", None)
+    if stats is None:
+        stats = SearchStats(nodes_expanded=len(all_paths) if all_paths else 0)
+    return stats
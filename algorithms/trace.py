@@ -0,0 +1,219 @@
+from array import array
+from collections import deque
+from constants import TRACE_MODE, TRACE_LIMIT
+from .stats import SearchStats
+from .space import reconstruct_path
+
+TRACE_MODES = ("count", "ring", "first", "full")
+
+class SearchTrace:
+    """Bounded log of expanded nodes, returned by the searches as ``all_paths``.
+
+    ``len(trace)`` is the number of recorded nodes whatever the policy;
+    indexing and iteration give ``(path, cost)`` for the entries the policy
+    kept, with paths rebuilt from the stored parent links on demand:
+
+    - ``count``: keep nothing, only count.
+    - ``ring``: keep the last ``limit`` entries, each with its own path (see ``lineage``).
+    - ``first``: keep the first ``limit`` entries.
+    - ``full``: keep every entry as compact (node, parent id, cost) records.
+
+    ``stats`` holds the search's SearchStats counters; ``attach`` starts a fresh one.
+
+    The ring cannot rebuild paths from its own records, since the ancestors
+    of its entries have usually left it, so the search names the ``lineage``
+    of what it records: its parent map (graph searches; paths are read from
+    it when the ring is first read, detached or pickled), or its live list
+    of codes from the root to the node being recorded or its parent (tree
+    searches and climbers; copied into the entry when recording).
+
+    The indexed modes find the parent's entry by its code, except along a
+    list lineage: a tree search reaches the same code again on other
+    branches, so there the parent is the entry recorded for it one level up
+    on the current path.
+    """
+
+    def __init__(self, mode=TRACE_MODE, limit=TRACE_LIMIT, space=None):
+        if mode not in TRACE_MODES:
+            raise ValueError(f"Unknown trace mode: {mode}")
+        self.mode = mode
+        self.limit = limit
+        self.space = space
+        self.count = 0
+        self._codes = array('q')
+        self._parents = array('i')
+        self._costs = array('q')
+        self._ids = {}
+        self._levels = []
+        self._ring = deque(maxlen=limit)
+        self.lineage = None
+        self._pending = False
+        self.stats = SearchStats()
+        self._bind()
+
+    @classmethod
+    def attach(cls, trace, space, lineage=None):
+        """Use the caller's trace (or a default one) for a search over ``space`` that records along ``lineage``."""
+        if trace is None:
+            trace = cls()
+        trace.space = space
+        trace.lineage = lineage
+        trace.stats = SearchStats()
+        if space.count is None and isinstance(trace._codes, array):
+            # packed 4x4+ codes are wider than 64 bits
+            trace._codes = list(trace._codes)
+        return trace
+
+    def detach(self):
+        """Drop the space and the recording-time id index, so a finished trace pickles compactly.
+
+        Set ``space`` again before reading entries. Returns the trace.
+        """
+        self._resolve()
+        self.space = None
+        self.lineage = None
+        self._ids = {}
+        self._levels = []
+        return self
+
+    def _bind(self):
+        if self.mode == "count" or (self.mode == "first" and self.count >= self.limit):
+            self.record = self._record_count
+        elif self.mode == "ring":
+            self.record = self._record_ring
+        else:
+            self.record = self._record_indexed
+
+    def __getstate__(self):
+        self._resolve()
+        state = self.__dict__.copy()
+        del state["record"]
+        state["lineage"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._bind()
+
+    def _record_count(self, code, parent, cost):
+        self.count += 1
+
+    def _record_ring(self, code, parent, cost):
+        self.count += 1
+        lineage = self.lineage
+        if parent == code:
+            self._ring.append(((code,), cost, None))
+        elif isinstance(lineage, list):
+            self._ring.append((tuple(lineage) if lineage[-1] == code else (*lineage, code), cost, None))
+        elif lineage is not None:
+            self._ring.append((code, cost, lineage))
+            self._pending = True
+        else:
+            self._ring.append(((parent, code), cost, None))
+
+    def _resolve(self):
+        """Turn ring entries still pointing into a parent map into their own paths, releasing the map."""
+        if self._pending:
+            self._ring = deque(((item if parents is None else tuple(reconstruct_path(parents, item)), cost, None)
+                                for item, cost, parents in self._ring), maxlen=self.limit)
+            self._pending = False
+
+    def _record_indexed(self, code, parent, cost):
+        index = len(self._codes)
+        if parent == code or isinstance(self.lineage, list):
+            parent_index = self._enter_level(code, parent, index)
+        else:
+            parent_index = self._ids.get(parent, -1)
+        self._ids[code] = index
+        self._codes.append(code)
+        self._parents.append(parent_index)
+        self._costs.append(cost)
+        self.count += 1
+        if self.mode == "first" and self.count >= self.limit:
+            # nothing after the first ``limit`` entries can be kept
+            self._ids = {}
+            self._levels = []
+            self.record = self._record_count
+
+    def _enter_level(self, code, parent, index):
+        """Entry id of the parent of a root or tree-search node, noting ``index`` as the node's.
+
+        ``_levels[d]`` is (parent id, {code: id}) for the depth-d children of
+        the node last expanded at depth d - 1, so the parent is looked up one
+        level above the node; deeper levels belong to a branch the search has
+        left.
+        """
+        levels = self._levels
+        if parent == code:
+            depth, parent_index = 0, -1
+        else:
+            lineage = self.lineage
+            depth = len(lineage) - 1 if lineage[-1] == code else len(lineage)
+            if depth > len(levels):
+                return -1
+            parent_index = levels[depth - 1][1].get(parent, -1)
+        del levels[depth + 1:]
+        if len(levels) > depth and levels[depth][0] == parent_index:
+            levels[depth][1][code] = index
+        else:
+            levels[depth:] = [(parent_index, {code: index})]
+        return parent_index
+
+    def record(self, code, parent, cost):
+        """Log an expanded node; ``parent == code`` marks the root.
+
+        Replaced per instance by the recorder of the active mode (see ``_bind``).
+        """
+
+    def __len__(self):
+        return self.count
+
+    def tally(self, n):
+        """Count ``n`` nodes that were not recorded one by one (searched after the trace stopped keeping, or in a worker process)."""
+        self.count += n
+
+    @property
+    def keeps_entries(self):
+        """False once further records are only counted, so callers may skip building node ids."""
+        return self.record != self._record_count
+
+    @property
+    def retained(self):
+        return len(self._ring) if self.mode == "ring" else len(self._codes)
+
+    def _decode(self, code):
+        return self.space.decode(code) if self.space is not None else code
+
+    def _indexed_path(self, index):
+        codes = []
+        while index >= 0:
+            codes.append(self._codes[index])
+            index = self._parents[index]
+        codes.reverse()
+        return codes
+
+    def entry(self, index):
+        """(path, cost) of the index-th kept entry."""
+        if self.mode == "ring":
+            self._resolve()
+            codes, cost, _ = self._ring[index]
+        else:
+            codes = self._indexed_path(range(len(self._codes))[index])
+            cost = self._costs[index]
+        return [self._decode(code) for code in codes], cost
+
+    def records(self):
+        """Raw (node id, parent id, cost) records of the indexed modes."""
+        return zip(self._codes, self._parents, self._costs)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.entry(i) for i in range(self.retained)[index]]
+        return self.entry(index)
+
+    def __iter__(self):
+        for i in range(self.retained):
+            yield self.entry(i)
+
+    def __bool__(self):
+        return self.count > 0
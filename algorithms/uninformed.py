@@ -1,90 +1,219 @@
 from collections import deque
 import heapq
-from .utils import get_neighbors, get_move_direction, calculate_costs
-from constants import MOVE_COSTS
+from .utils import calculate_costs, requires_solvable
+from .space import encode_problem, reconstruct_path, MOVE_COST_LIST
+from .trace import SearchTrace
+from .hooks import current_observer
+from constants import DFS_MAX_DEPTH, IDS_MAX_DEPTH
 
-def bfs(start, goal):
-    queue = deque([(start, [start], 0)])
-    visited = {start}
-    all_paths = []
+@requires_solvable
+def bfs(start, goal, trace=None):
+    space, start_code, goal_code = encode_problem(start, goal)
+    parents = space.new_parents()
+    trace = SearchTrace.attach(trace, space, parents)
+    stats = trace.stats
+    queue = deque([(start_code, 0)])
+    parents[start_code] = start_code
+    observer = current_observer()
+    stats.setup_done()
+    expanded = generated = 0
+    max_frontier = 1
+    code = start_code
     while queue:
-        state, path, cost = queue.popleft()
-        all_paths.append((path, cost))
-        if state == goal:
-            return path, calculate_costs(path), all_paths
-        for neighbor in get_neighbors(state):
-            if neighbor not in visited:
-                visited.add(neighbor)
-                direction = get_move_direction(state, neighbor)
-                new_cost = cost + (MOVE_COSTS[direction] if direction else 0)
-                queue.append((neighbor, path + [neighbor], new_cost))
-    return None, None, all_paths
+        code, cost = queue.popleft()
+        expanded += 1
+        trace.record(code, parents[code], cost)
+        if code == goal_code:
+            break
+        children = space.successors(code)
+        generated += len(children)
+        if observer is not None:
+            observer.expand(code, cost, len(queue), len(children),
+                            sum(parents[child] != -1 for _, child in children))
+        for move, child in children:
+            if parents[child] == -1:
+                parents[child] = code
+                queue.append((child, cost + MOVE_COST_LIST[move]))
+        if len(queue) > max_frontier:
+            max_frontier = len(queue)
+    stats.nodes_expanded, stats.nodes_generated, stats.max_frontier = expanded, generated, max_frontier
+    # every node reached is either expanded or still queued
+    stats.duplicates_pruned = generated - (expanded + len(queue) - 1)
+    stats.search_done()
+    codes = reconstruct_path(parents, code)
+    # nodes leave the queue in depth order, so the last one expanded is the deepest
+    stats.max_depth = len(codes) - 1
+    if code != goal_code:
+        return None, None, trace
+    path = space.decode_path(codes)
+    stats.path_done()
+    return path, calculate_costs(path), trace
 
+def depth_limited_search(space, start_code, goal_code, limit, trace):
+    """Depth-first search to ``limit`` moves over an explicit stack.
 
+    Only states on the current path are skipped, so a state reached again by
+    a shorter branch is searched again and no shallow solution is missed.
+    Membership is one lookup in ``space.new_path_flags()``, and the path,
+    its costs and one list of untried successors per depth are the only
+    per-node state. Once ``trace`` stops keeping entries, nodes are only
+    counted and tallied at the end; the pass's counters are added to
+    ``trace.stats``, and each expansion is reported to the active observer
+    with the stack depth as its frontier. Returns (codes from the start to the goal or None,
+    whether the limit cut any branch off).
+    """
+    on_path = space.new_path_flags()
+    packed = isinstance(on_path, dict)
+    stats = trace.stats
+    observer = current_observer()
+    path = [start_code]
+    costs = [0]
+    frames = [space.successors(start_code)[::-1]]
+    on_path[start_code] = 1
+    trace.lineage = path
+    trace.record(start_code, start_code, 0)
+    if start_code == goal_code:
+        stats.nodes_expanded += 1
+        return path, False
+    cutoff = False
+    keeping = trace.keeps_entries
+    unrecorded = on_path_skips = 0
+    expanded, generated, deepest = 1, len(frames[0]), 0
+    found = None
+    while frames:
+        children = frames[-1]
+        if not children:
+            frames.pop()
+            costs.pop()
+            code = path.pop()
+            if packed:
+                del on_path[code]
+            else:
+                on_path[code] = 0
+            continue
+        move, child = children.pop()
+        if on_path[child]:
+            on_path_skips += 1
+            continue
+        cost = costs[-1] + MOVE_COST_LIST[move]
+        if keeping:
+            trace.record(child, path[-1], cost)
+            keeping = trace.keeps_entries
+        else:
+            unrecorded += 1
+        if child == goal_code:
+            path.append(child)
+            found = path
+            break
+        if len(path) >= limit:
+            cutoff = True
+            continue
+        path.append(child)
+        costs.append(cost)
+        on_path[child] = 1
+        successors = space.successors(child)[::-1]
+        frames.append(successors)
+        expanded += 1
+        generated += len(successors)
+        if observer is not None:
+            observer.expand(child, cost, len(frames), len(successors),
+                            sum(on_path[successor] for _, successor in successors))
+        if len(path) > deepest:
+            deepest = len(path)
+    trace.tally(unrecorded)
+    stats.nodes_expanded += expanded
+    stats.nodes_generated += generated
+    stats.duplicates_pruned += on_path_skips
+    stats.max_depth = max(stats.max_depth, deepest - 1, len(path) - 1 if found else 0)
+    return found, cutoff
 
-def dfs(start, goal, max_depth=30):
-    def dfs_recursive(state, path, visited, depth, cost_so_far, all_paths):
-        all_paths.append((path, cost_so_far))
-        if state == goal:
-            return path, calculate_costs(path)
-        if depth >= max_depth:
-            return None, None
-        for neighbor in get_neighbors(state):
-            if neighbor not in visited:
-                visited.add(neighbor)
-                direction = get_move_direction(state, neighbor)
-                new_cost = cost_so_far + (MOVE_COSTS[direction] if direction else 0)
-                result_path, result_costs = dfs_recursive(neighbor, path + [neighbor], visited, depth + 1, new_cost, all_paths)
-                if result_path:
-                    return result_path, result_costs
-        return None, None
-    
-    visited = {start}
-    all_paths = []
-    path, costs = dfs_recursive(start, [start], visited, 0, 0, all_paths)
-    return path, costs, all_paths
+@requires_solvable
+def dfs(start, goal, max_depth=DFS_MAX_DEPTH, trace=None):
+    space, start_code, goal_code = encode_problem(start, goal)
+    trace = SearchTrace.attach(trace, space)
+    trace.stats.setup_done()
+    codes, _ = depth_limited_search(space, start_code, goal_code, max_depth, trace)
+    trace.stats.search_done()
+    if codes is None:
+        return None, None, trace
+    path = space.decode_path(codes)
+    trace.stats.path_done()
+    return path, calculate_costs(path), trace
 
-def ucs(start, goal):
-    pq = [(0, start, [start])]
-    visited = {start}
-    all_paths = []
+@requires_solvable
+def ucs(start, goal, trace=None):
+    """Dijkstra under MOVE_COSTS: a child is pushed again whenever its g drops, and stale entries are skipped when popped."""
+    space, start_code, goal_code = encode_problem(start, goal)
+    parents = space.new_parents()
+    trace = SearchTrace.attach(trace, space, parents)
+    stats = trace.stats
+    pq = [(0, start_code)]
+    parents[start_code] = start_code
+    best_g = space.new_costs()
+    best_g[start_code] = 0
+    depths = space.new_costs()
+    depths[start_code] = 0
+    observer = current_observer()
+    stats.setup_done()
+    expanded = generated = duplicates = deepest = 0
+    max_frontier = 1
+    code = start_code
     while pq:
-        cost, state, path = heapq.heappop(pq)
-        all_paths.append((path, cost))
-        if state == goal:
-            return path, calculate_costs(path), all_paths
-        for neighbor in get_neighbors(state):
-            if neighbor not in visited:
-                visited.add(neighbor)
-                direction = get_move_direction(state, neighbor)
-                new_cost = cost + (MOVE_COSTS[direction] if direction else 0)
-                heapq.heappush(pq, (new_cost, neighbor, path + [neighbor]))
-    return None, None, all_paths
+        cost, code = heapq.heappop(pq)
+        if cost > best_g[code]:
+            duplicates += 1
+            continue  # stale entry: a cheaper path to code was pushed after it
+        expanded += 1
+        trace.record(code, parents[code], cost)
+        depth = depths[code]
+        if depth > deepest:
+            deepest = depth
+        if code == goal_code:
+            break
+        children = space.successors(code)
+        generated += len(children)
+        if observer is not None:
+            observer.expand(code, cost, len(pq), len(children),
+                            sum(best_g[child] != -1 and cost + MOVE_COST_LIST[move] >= best_g[child]
+                                for move, child in children))
+        for move, child in children:
+            g_new = cost + MOVE_COST_LIST[move]
+            known = best_g[child]
+            if known == -1 or g_new < known:
+                best_g[child] = g_new
+                parents[child] = code
+                depths[child] = depth + 1
+                heapq.heappush(pq, (g_new, child))
+            else:
+                duplicates += 1
+        if len(pq) > max_frontier:
+            max_frontier = len(pq)
+    stats.nodes_expanded, stats.nodes_generated, stats.max_frontier = expanded, generated, max_frontier
+    stats.duplicates_pruned = duplicates
+    stats.max_depth = deepest
+    stats.search_done()
+    if code != goal_code:
+        return None, None, trace
+    path = space.decode_path(reconstruct_path(parents, code))
+    stats.path_done()
+    return path, calculate_costs(path), trace
 
-def ids(start, goal):
-    def dls(state, path, depth, cost, visited, all_paths):
-        all_paths.append((path, cost))
-        if depth < 0:
-            return None, None
-        if state == goal:
-            return path, calculate_costs(path)
-        for neighbor in get_neighbors(state):
-            if neighbor not in visited:
-                visited.add(neighbor)
-                direction = get_move_direction(state, neighbor)
-                new_cost = cost + (MOVE_COSTS[direction] if direction else 0)
-                result, result_costs = dls(neighbor, path + [neighbor], depth - 1, new_cost, visited, all_paths)
-                if result:
-                    return result, result_costs
-        return None, None
-    
-    all_paths = []
-    depth = 0
-    while True:
-        visited = {start}
-        result, costs = dls(start, [start], depth, 0, visited, all_paths)
-        if result:
-            return result, costs, all_paths
-        depth += 1
-        if depth > 50:
-            return None, None, all_paths
\ No newline at end of file
+@requires_solvable
+def ids(start, goal, trace=None, max_depth=IDS_MAX_DEPTH):
+    """Depth-limited passes at limits 0, 1, ... ``max_depth``; stops early once a pass is not cut off."""
+    space, start_code, goal_code = encode_problem(start, goal)
+    trace = SearchTrace.attach(trace, space)
+    stats = trace.stats
+    stats.setup_done()
+    for limit in range(max_depth + 1):
+        stats.iterations += 1
+        codes, cutoff = depth_limited_search(space, start_code, goal_code, limit, trace)
+        if codes is not None:
+            stats.search_done()
+            path = space.decode_path(codes)
+            stats.path_done()
+            return path, calculate_costs(path), trace
+        if not cutoff:
+            break
+    stats.search_done()
+    return None, None, trace
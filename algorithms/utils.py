@@ -1,12 +1,142 @@
 import random
+import functools
+from math import factorial
+
+_FACTORIALS = [factorial(i) for i in range(26)]
 
 def get_zero_position(state):
-    for i in range(3):
-        for j in range(3):
-            if state[i][j] == 0:
-                return i, j
+    for i, row in enumerate(state):
+        if 0 in row:
+            return i, row.index(0)
     return None
 
+def flatten_state(state):
+    return tuple(v for row in state for v in row)
+
+def unflatten_state(cells):
+    size = int(len(cells) ** 0.5)
+    return tuple(tuple(cells[i:i + size]) for i in range(0, len(cells), size))
+
+def state_parity(state):
+    """Parity of the tile inversions (blank ignored)."""
+    tiles = [v for v in flatten_state(state) if v]
+    inversions = 0
+    for i, t in enumerate(tiles):
+        for u in tiles[i + 1:]:
+            if u < t:
+                inversions += 1
+    return inversions & 1
+
+def is_solvable(state, goal):
+    """Parity test for any goal: on odd widths the tile inversion parities must
+    match, on even widths the parity of inversions plus blank row must match."""
+    if sorted(flatten_state(state)) != sorted(flatten_state(goal)):
+        return False
+    state_key, goal_key = state_parity(state), state_parity(goal)
+    if len(state) % 2 == 0:
+        state_key ^= get_zero_position(state)[0] & 1
+        goal_key ^= get_zero_position(goal)[0] & 1
+    return state_key == goal_key
+
+class Unsolvable(tuple):
+    """Empty explored-path list returned for a start that cannot reach the goal."""
+
+UNSOLVABLE = Unsolvable()
+
+def requires_solvable(solver):
+    """Return (None, None, UNSOLVABLE) before searching when the parity test fails."""
+    @functools.wraps(solver)
+    def wrapper(start, goal, *args, **kwargs):
+        if not is_solvable(start, goal):
+            return None, None, UNSOLVABLE
+        return solver(start, goal, *args, **kwargs)
+    return wrapper
+
+def half_permutations(cell_count):
+    """Number of tile orders of one parity class, i.e. states per blank position."""
+    return _FACTORIALS[cell_count - 1] // 2
+
+def rank_state(state):
+    """Rank a state into 0 .. n!/2 - 1 inside its parity class.
+
+    The rank is ``blank * (n-1)!/2 + lehmer(tiles) // 2``: the blank position is
+    recoverable with a single division (see ``rank_blank``) and the last Lehmer
+    digit, which is fixed by the parity, is dropped.
+    """
+    cells = flatten_state(state) if isinstance(state[0], tuple) else state
+    blank = cells.index(0)
+    tiles = cells[:blank] + cells[blank + 1:]
+    n = len(tiles)
+    lehmer = 0
+    for i in range(n - 2):
+        t = tiles[i]
+        smaller = 0
+        for u in tiles[i + 1:]:
+            if u < t:
+                smaller += 1
+        lehmer += smaller * _FACTORIALS[n - 1 - i]
+    return blank * (_FACTORIALS[n] // 2) + (lehmer >> 1)
+
+def rank_blank(rank, cell_count=9):
+    return rank // half_permutations(cell_count)
+
+def unrank_cells(rank, parity=0, cell_count=9):
+    """Inverse of ``rank_state`` returning the flat cell list."""
+    n = cell_count - 1
+    blank, lehmer = divmod(rank, _FACTORIALS[n] // 2)
+    lehmer <<= 1
+    available = list(range(1, cell_count))
+    cells = []
+    inversions = 0
+    for i in range(n - 2):
+        digit, lehmer = divmod(lehmer, _FACTORIALS[n - 1 - i])
+        inversions += digit
+        cells.append(available.pop(digit))
+    a, b = available
+    if inversions & 1 == parity:
+        cells += (a, b)
+    else:
+        cells += (b, a)
+    cells.insert(blank, 0)
+    return cells
+
+def unrank_state(rank, parity=0, cell_count=9):
+    return unflatten_state(unrank_cells(rank, parity, cell_count))
+
+def cell_bits(cell_count):
+    """Bits per cell (and for the blank index) in a packed state: 4 up to 4x4, 5 up to 5x5."""
+    return max(4, (cell_count - 1).bit_length())
+
+def pack_state(state):
+    """Pack a state into one int: ``cell_bits`` bits per cell above the blank index."""
+    cells = flatten_state(state) if isinstance(state[0], tuple) else state
+    bits = cell_bits(len(cells))
+    code = 0
+    for v in reversed(cells):
+        code = (code << bits) | v
+    return (code << bits) | cells.index(0)
+
+def packed_blank(code, cell_count=9):
+    return code & ((1 << cell_bits(cell_count)) - 1)
+
+def unpack_cells(code, cell_count=9):
+    bits = cell_bits(cell_count)
+    mask = (1 << bits) - 1
+    code >>= bits
+    cells = []
+    for _ in range(cell_count):
+        cells.append(code & mask)
+        code >>= bits
+    return cells
+
+def unpack_state(code, cell_count=9):
+    return unflatten_state(unpack_cells(code, cell_count))
+
+def goal_state(size):
+    """Tiles 1 .. n-1 in row-major order with the blank last."""
+    cells = list(range(1, size * size)) + [0]
+    return unflatten_state(cells)
+
 def get_move_direction(prev_state, curr_state):
     prev_x, prev_y = get_zero_position(prev_state)
     curr_x, curr_y = get_zero_position(curr_state)
@@ -17,13 +147,14 @@ def get_move_direction(prev_state, curr_state):
     return None
 
 def get_neighbors(state):
+    size = len(state)
     state_list = [list(row) for row in state]
     x, y = get_zero_position(state)
     moves = []
     directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
     for dx, dy in directions:
         nx, ny = x + dx, y + dy
-        if 0 <= nx < 3 and 0 <= ny < 3:
+        if 0 <= nx < size and 0 <= ny < size:
             new_state = [row[:] for row in state_list]
             new_state[x][y], new_state[nx][ny] = new_state[nx][ny], new_state[x][y]
             moves.append(tuple(tuple(row) for row in new_state))
@@ -37,42 +168,15 @@ def calculate_costs(path):
         costs.append(costs[-1] + (MOVE_COSTS[direction] if direction else 0))
     return costs
 
-def generate_random_state():
-    """Generate a random valid 8-puzzle state"""
-    numbers = list(range(9)) 
-    random.shuffle(numbers)
-    
-    state = (
-        tuple(numbers[0:3]),
-        tuple(numbers[3:6]),
-        tuple(numbers[6:9])
-    )
-    
-    flat_state = [num for row in state for num in row if num != 0]
-    inversions = 0
-    for i in range(len(flat_state)):
-        for j in range(i+1, len(flat_state)):
-            if flat_state[i] > flat_state[j]:
-                inversions += 1
-    
-   
-    if inversions % 2 != 0:
-        for i in range(len(flat_state) - 1):
-            if flat_state[i] != 0 and flat_state[i+1] != 0:
-                flat_state[i], flat_state[i+1] = flat_state[i+1], flat_state[i]
-                break
-        
-        counter = 0
-        new_state = []
-        for i in range(3):
-            row = []
-            for j in range(3):
-                if state[i][j] == 0:
-                    row.append(0)
-                else:
-                    row.append(flat_state[counter])
-                    counter += 1
-            new_state.append(tuple(row))
-        state = tuple(new_state)
-    
-    return state
\ No newline at end of file
+def generate_random_state(size=3, goal=None):
+    """Generate a random state of a size x size puzzle that can reach ``goal`` (the standard goal by default)"""
+    goal = goal or goal_state(size)
+    cells = list(range(size * size))
+    random.shuffle(cells)
+    state = unflatten_state(cells)
+    if not is_solvable(state, goal):
+        # swapping two tiles flips the parity; the blank stays put
+        i, j = [k for k, v in enumerate(cells) if v][:2]
+        cells[i], cells[j] = cells[j], cells[i]
+        state = unflatten_state(cells)
+    return state
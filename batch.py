@@ -0,0 +1,35 @@
+"""Solve boards in bulk without the GUI, streaming JSONL results in completion order.
+
+Each input line is a board: n*n numbers separated by commas or spaces, a JSON
+list, or a JSON object {"board": [...], "goal": [...], "id": ...}.
+
+    python batch.py boards.txt --algorithm "A*" --workers 8 --timeout 30 > results.jsonl
+    cat boards.csv | python batch.py - --algorithm IDA*
+"""
+import argparse
+import json
+import sys
+from algorithms.runner import ALGORITHMS, solve_stream
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", nargs="?", default="-", help="instance file, or - for stdin (default)")
+    parser.add_argument("-a", "--algorithm", default="A*", choices=sorted(ALGORITHMS))
+    parser.add_argument("-w", "--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("-t", "--timeout", type=float, help="seconds allowed per board")
+    parser.add_argument("--heuristic", help="heuristic name for the searches that take one")
+    parser.add_argument("--memory-mb", type=int, help="address-space cap per worker")
+    parser.add_argument("--no-path", action="store_true", help="leave the solution path out of the results")
+    args = parser.parse_args()
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    memory = args.memory_mb * 1024 * 1024 if args.memory_mb else None
+    with source:
+        for record in solve_stream(source, args.algorithm, args.workers, args.timeout,
+                                   args.heuristic, memory):
+            if args.no_path:
+                record.pop("path", None)
+            sys.stdout.write(json.dumps(record) + "\n")
+            sys.stdout.flush()
+
+if __name__ == "__main__":
+    main()
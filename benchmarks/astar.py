@@ -0,0 +1,40 @@
+"""A* throughput (nodes/second) and cost optimality checked against the exhaustive Dijkstra table.
+
+Run from the project root:  python -m benchmarks.astar [--instances 50] [--heuristics manhattan,pdb]
+"""
+import argparse
+import random
+import time
+from algorithms.database import distance_to_goal
+from algorithms.informed import astar
+from algorithms.space import get_space
+from algorithms.trace import SearchTrace
+from constants import GOAL_STATE
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--instances", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--heuristics", default="manhattan,walking_distance,pdb")
+    args = parser.parse_args()
+    goal = GOAL_STATE
+    space = get_space(goal)
+    rng = random.Random(args.seed)
+    starts = [space.decode(rng.randrange(space.count)) for _ in range(args.instances)]
+    # backward Dijkstra over the whole parity class under MOVE_COSTS
+    optimal = [distance_to_goal(start, goal, weighted=True) for start in starts]
+    print(f"{len(starts)} random instances, mean optimal cost {sum(optimal) / len(optimal):.1f}")
+    print(f"{'heuristic':<18}{'nodes':>10}{'seconds':>9}{'nodes/s':>10}{'wrong cost':>12}")
+    for name in args.heuristics.split(","):
+        nodes, seconds, wrong = 0, 0.0, 0
+        for start, best in zip(starts, optimal):
+            trace = SearchTrace("count")
+            began = time.perf_counter()
+            _, costs, _ = astar(start, goal, trace=trace, heuristic_name=name)
+            seconds += time.perf_counter() - began
+            nodes += len(trace)
+            wrong += costs[-1] != best
+        print(f"{name:<18}{nodes:>10}{seconds:>9.2f}{nodes / seconds:>10.0f}{wrong:>12}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Show where one slow board spends its search: expansion rate over time, frontier sizes and a profile window.
+
+Run from the project root:
+    python -m benchmarks.diagnose "8 6 7 2 5 4 3 0 1" [--algorithm A*] [--window 10000:50000] [--every 1]
+
+The board is any line batch.py accepts; the profile window covers the
+given range of expansions (cProfile plus tracemalloc unless --no-memory).
+"""
+import argparse
+from algorithms.hooks import observing, NodeRate, FrontierHistogram, ProfileWindow
+from algorithms.runner import ALGORITHMS, parse_board, run_algorithm, _board
+from algorithms.utils import goal_state
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("board")
+    parser.add_argument("-a", "--algorithm", default="A*", choices=sorted(ALGORITHMS))
+    parser.add_argument("--heuristic")
+    parser.add_argument("--window", default="0:100000", help="first:length of the profiled expansions")
+    parser.add_argument("--no-memory", action="store_true", help="profile time only, without tracemalloc")
+    parser.add_argument("--every", type=int, default=1, help="sample every Nth event")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between rate samples")
+    parser.add_argument("--top", type=int, default=15, help="profile and allocation lines shown")
+    args = parser.parse_args()
+    start, extra = parse_board(args.board)
+    goal = _board(extra["goal"]) if "goal" in extra else goal_state(len(start))
+    first, _, length = args.window.partition(":")
+    rate = NodeRate(args.interval, args.every)
+    frontier = FrontierHistogram(args.every)
+    window = ProfileWindow(int(first), int(length or 100000), not args.no_memory, args.every)
+    with observing(rate, frontier, window):
+        path, costs, stats = run_algorithm(args.algorithm, start, goal, args.heuristic)
+    if stats is None:
+        print("unsolvable")
+        return
+    print(f"{args.algorithm}: " + (f"{len(path) - 1} moves, cost {costs[-1]}" if path else "no solution"))
+    print(", ".join(f"{key} {value:.4g}" if isinstance(value, float) else f"{key} {value}"
+                    for key, value in stats.as_dict().items()))
+    print(rate.report())
+    print(frontier.report())
+    print(window.report(args.top))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Compare the named heuristics: mean h, and A*/IDA* expansions on instances of a given depth.
+
+Run from the project root:  python -m benchmarks.heuristics [--depth 22] [--instances 10]
+"""
+import argparse
+import random
+import time
+from algorithms.heuristics import HEURISTICS, get_heuristic
+from algorithms.informed import astar, ida_star
+from algorithms.space import get_space
+from algorithms.trace import SearchTrace
+from constants import GOAL_STATE
+from .instances import instances_at_depth
+
+def measure(search, starts, goal, name):
+    nodes, began = 0, time.perf_counter()
+    for start in starts:
+        trace = SearchTrace("count")
+        search(start, goal, trace=trace, heuristic_name=name)
+        nodes += len(trace)
+    return nodes, time.perf_counter() - began
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depth", type=int, default=22)
+    parser.add_argument("--instances", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--heuristics", help="comma separated names, default: all plus pdb")
+    parser.add_argument("--no-ida", action="store_true", help="skip IDA*, which is slow under the weighted move costs")
+    args = parser.parse_args()
+    names = args.heuristics.split(",") if args.heuristics else list(HEURISTICS) + ["pdb"]
+    goal = GOAL_STATE
+    starts = instances_at_depth(goal, args.depth, args.instances, args.seed)
+    space = get_space(goal)
+    sample = [space.cells(code) for code in random.Random(args.seed).sample(range(space.count), 2000)]
+    print(f"{len(starts)} instances at depth {args.depth}")
+    print(f"{'heuristic':<18}{'mean h':>8}{'A* nodes':>12}{'A* s':>8}{'IDA* nodes':>13}{'IDA* s':>9}")
+    for name in names:
+        estimate = get_heuristic(name, goal)
+        mean_h = sum(estimate.evaluate(cells) for cells in sample) / len(sample)
+        row = f"{name:<18}{mean_h:>8.2f}"
+        nodes, seconds = measure(astar, starts, goal, name)
+        row += f"{nodes:>12}{seconds:>8.2f}"
+        if not args.no_ida:
+            nodes, seconds = measure(ida_star, starts, goal, name)
+            row += f"{nodes:>13}{seconds:>9.2f}"
+        print(row)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Seeded 8-puzzle instance sets drawn from the exhaustive distance table."""
+import random
+from algorithms.database import load_distance_table
+from algorithms.space import get_space
+
+def boards_by_depth(goal):
+    """Codes of the goal's parity class grouped by optimal solution length in moves."""
+    space = get_space(goal)
+    table = load_distance_table(space, space.encode(goal))
+    groups = {}
+    for code in range(space.count):
+        if table[code] != 0xFF:
+            groups.setdefault(table[code] >> 2, []).append(code)
+    return space, groups
+
+def instances_at_depth(goal, depth, count, seed):
+    """Random boards whose optimal solution is exactly ``depth`` moves."""
+    space, groups = boards_by_depth(goal)
+    codes = groups.get(depth, [])
+    rng = random.Random(seed)
+    return [space.decode(code) for code in rng.sample(codes, min(count, len(codes)))]
+
+def stratified_instances(goal, per_depth, seed, depths=None):
+    """{depth: boards}, up to ``per_depth`` boards per optimal length (all of them where fewer exist).
+
+    Each depth draws from its own generator seeded with (seed, depth), so the
+    set for one depth does not change when others are added or dropped.
+    """
+    space, groups = boards_by_depth(goal)
+    sets = {}
+    for depth in sorted(groups) if depths is None else depths:
+        codes = groups.get(depth, [])
+        rng = random.Random(f"{seed}:{depth}")
+        sets[depth] = [space.decode(code) for code in rng.sample(codes, min(per_depth, len(codes)))]
+    return sets
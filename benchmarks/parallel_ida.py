@@ -0,0 +1,64 @@
+"""Parallel IDA* scaling: wall time and speedup over sequential IDA* for several worker counts.
+
+Run from the project root:  python -m benchmarks.parallel_ida [--size 4] [--walk 30] [--workers 1,2,4,8,16]
+"""
+import argparse
+import random
+import time
+from algorithms.informed import ida_star
+from algorithms.parallel import parallel_ida_star
+from algorithms.trace import SearchTrace
+from algorithms.utils import goal_state, get_neighbors, pack_state
+
+def random_walk(goal, length, rng):
+    """Board ``length`` non-backtracking random moves away from ``goal``."""
+    state, seen = goal, {pack_state(goal)}
+    for _ in range(length):
+        options = [s for s in get_neighbors(state) if pack_state(s) not in seen]
+        if not options:
+            break
+        state = rng.choice(options)
+        seen.add(pack_state(state))
+    return state
+
+def timed(search, start, goal, **kwargs):
+    trace = SearchTrace("count")
+    began = time.perf_counter()
+    _, costs, _ = search(start, goal, trace=trace, **kwargs)
+    return costs[-1], len(trace), time.perf_counter() - began
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=4)
+    parser.add_argument("--walk", type=int, default=30, help="random-walk length of each instance")
+    parser.add_argument("--instances", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", default="1,2,4,8,16")
+    parser.add_argument("--frontier", type=int, default=2000)
+    parser.add_argument("--heuristic")
+    args = parser.parse_args()
+    goal = goal_state(args.size)
+    rng = random.Random(args.seed)
+    starts = [random_walk(goal, args.walk, rng) for _ in range(args.instances)]
+    counts = [int(w) for w in args.workers.split(",")]
+    print(f"{len(starts)} {args.size}x{args.size} instances, {args.walk}-move random walks")
+    print(f"{'workers':<10}{'nodes':>12}{'seconds':>10}{'speedup':>9}{'same cost':>11}")
+    costs, nodes, base = [], 0, 0.0
+    for start in starts:
+        cost, n, seconds = timed(ida_star, start, goal, heuristic_name=args.heuristic)
+        costs.append(cost)
+        nodes += n
+        base += seconds
+    print(f"{'seq':<10}{nodes:>12}{base:>10.2f}{1:>9.2f}{'yes':>11}")
+    for workers in counts:
+        nodes, total, same = 0, 0.0, True
+        for start, best in zip(starts, costs):
+            cost, n, seconds = timed(parallel_ida_star, start, goal, workers=workers,
+                                     frontier_size=args.frontier, heuristic_name=args.heuristic)
+            nodes += n
+            total += seconds
+            same = same and cost == best
+        print(f"{workers:<10}{nodes:>12}{total:>10.2f}{base / total:>9.2f}{'yes' if same else 'NO':>11}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compare pattern-database layouts: build time, file size, mean h and A* expansions.
+
+Run from the project root:  python -m benchmarks.pdb_layouts [--size 4] [--layouts 5-5-5,6-6-3]
+"""
+import argparse
+import random
+import time
+from algorithms.pdb import build_pattern_table, pattern_groups
+from algorithms.heuristics import get_heuristic, manhattan_table
+from algorithms.informed import astar
+from algorithms.space import get_space
+from algorithms.trace import SearchTrace
+from algorithms.utils import goal_state
+
+DEFAULT_LAYOUTS = {3: ["2-3-3", "4-4", "3-5"], 4: ["5-5-5", "6-6-3"]}
+
+def sample_boards(goal, count, seed):
+    rng = random.Random(seed)
+    size = len(goal)
+    boards = []
+    for _ in range(count):
+        cells = list(range(size * size))
+        rng.shuffle(cells)
+        boards.append(cells)
+    return boards
+
+def search_instances(goal, count, seed):
+    space = get_space(goal)
+    rng = random.Random(seed)
+    return [space.decode(rng.randrange(space.count)) for _ in range(count)]
+
+def report(size, layouts, samples, instances, seed):
+    goal = goal_state(size)
+    boards = sample_boards(goal, samples, seed)
+    manhattan = manhattan_table(goal)
+    base_h = sum(manhattan.evaluate(b) for b in boards) / len(boards)
+    starts = search_instances(goal, instances, seed) if size == 3 else []
+
+    def expansions(name):
+        total = 0
+        for start in starts:
+            trace = SearchTrace("count")
+            astar(start, goal, trace=trace, heuristic_name=name)
+            total += len(trace)
+        return total
+
+    base_nodes = expansions("manhattan")
+    print(f"{size}x{size}  manhattan  mean h {base_h:.2f}" + (f"  A* expansions {base_nodes}" if starts else ""))
+    print(f"{'layout':<10}{'build s':>10}{'bytes':>12}{'mean h':>9}{'A* nodes':>12}{'vs MD':>8}")
+    for layout in layouts:
+        began = time.perf_counter()
+        size_bytes = sum(len(build_pattern_table(goal, tiles)) for tiles in pattern_groups(goal, layout))
+        built = time.perf_counter() - began
+        estimate = get_heuristic("pdb:" + layout, goal)
+        mean_h = sum(estimate.evaluate(b) for b in boards) / len(boards)
+        row = f"{layout:<10}{built:>10.2f}{size_bytes:>12}{mean_h:>9.2f}"
+        if starts:
+            nodes = expansions("pdb:" + layout)
+            row += f"{nodes:>12}{nodes / base_nodes:>8.2f}"
+        print(row)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=3)
+    parser.add_argument("--layouts", help="comma separated, e.g. 4-4,3-5")
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--instances", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    layouts = args.layouts.split(",") if args.layouts else DEFAULT_LAYOUTS[args.size]
+    report(args.size, layouts, args.samples, args.instances, args.seed)
+
+if __name__ == "__main__":
+    main()
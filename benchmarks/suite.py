@@ -0,0 +1,171 @@
+"""Benchmark the registered algorithms on seeded 8-puzzle sets stratified by optimal solution length.
+
+Run from the project root:
+    python -m benchmarks.suite [--per-depth 100] [--algorithms "A*,IDA*"] [--output bench.json]
+    python -m benchmarks.suite --baseline benchmarks/baseline.json [--threshold 0.15]
+    python -m benchmarks.suite --save-baseline
+
+Every run writes JSON with per-(algorithm, depth) wall-time percentiles,
+nodes expanded and generated, the largest frontier, peak traced memory, solved/timeout counts and how many costs missed
+the weighted optimum. With a baseline, cells whose median time or mean nodes
+grew by more than the threshold are listed and the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import signal
+import sys
+import time
+import tracemalloc
+from algorithms.database import distance_to_goal
+from algorithms.runner import ALGORITHMS, SolveTimeout, enable_timeouts, run_algorithm
+from constants import GOAL_STATE
+from .instances import stratified_instances
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+def percentile(values, q):
+    """Nearest-rank percentile of a non-empty list, ``q`` in 0..100."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+def parse_depths(text):
+    """"0-31" or "10,20,25-28" -> list of depths."""
+    depths = []
+    for part in text.split(","):
+        low, _, high = part.partition("-")
+        depths.extend(range(int(low), int(high or low) + 1))
+    return depths
+
+def timed_run(name, start, goal, timeout):
+    """(seconds, path, costs, SearchStats) of one run, or None on timeout."""
+    if timeout:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    began = time.perf_counter()
+    try:
+        path, costs, stats = run_algorithm(name, start, goal)
+    except SolveTimeout:
+        return None
+    finally:
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    return time.perf_counter() - began, path, costs, stats
+
+def peak_memory(name, start, goal, timeout):
+    """Peak Python allocation of one run in bytes (None on timeout), traced apart from the timed runs."""
+    tracemalloc.start()
+    try:
+        result = timed_run(name, start, goal, timeout)
+        return None if result is None else tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def bench_cell(name, boards, goal, optimal, args):
+    """Stats of one algorithm on the boards of one depth."""
+    times, nodes, generated, frontiers, memory = [], [], [], [], []
+    solved = timeouts = suboptimal = 0
+    for i, start in enumerate(boards):
+        for _ in range(args.warmup if i == 0 else 0):
+            timed_run(name, start, goal, args.timeout)
+        result = None
+        for _ in range(args.repeat):
+            result = timed_run(name, start, goal, args.timeout)
+            if result is None:
+                break
+            times.append(result[0])
+        if result is None:
+            timeouts += 1
+            continue
+        _, path, costs, stats = result
+        if stats is not None:
+            nodes.append(stats.nodes_expanded)
+            generated.append(stats.nodes_generated)
+            frontiers.append(stats.max_frontier)
+        if path:
+            solved += 1
+            suboptimal += costs[-1] != optimal[i]
+        if i < args.memory_samples:
+            peak = peak_memory(name, start, goal, args.timeout)
+            if peak is not None:
+                memory.append(peak)
+    cell = {"boards": len(boards), "solved": solved, "timeouts": timeouts, "suboptimal": suboptimal}
+    if times:
+        cell.update(p50=percentile(times, 50), p90=percentile(times, 90), p99=percentile(times, 99),
+                    max=max(times), mean=sum(times) / len(times))
+    if nodes:
+        cell["nodes_mean"] = sum(nodes) / len(nodes)
+        cell["generated_mean"] = sum(generated) / len(generated)
+        cell["frontier_max"] = max(frontiers)
+    if memory:
+        cell["peak_bytes_max"] = max(memory)
+    return cell
+
+def compare(current, baseline, threshold):
+    """Regressions as (algorithm, depth, metric, baseline value, current value)."""
+    regressions = []
+    for name, cells in current["results"].items():
+        for depth, cell in cells.items():
+            old = baseline.get("results", {}).get(name, {}).get(depth)
+            if not old:
+                continue
+            for metric in ("p50", "nodes_mean"):
+                if metric in cell and old.get(metric) and cell[metric] > old[metric] * (1 + threshold):
+                    regressions.append((name, depth, metric, old[metric], cell[metric]))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--per-depth", type=int, default=100)
+    parser.add_argument("--depths", default="0-31", help='e.g. "0-31" or "20,25-28"')
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--algorithms", help="comma separated ALGORITHMS names, default: all")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs before each cell")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per board")
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds per run, 0 for none")
+    parser.add_argument("--memory-samples", type=int, default=3, help="boards per cell traced for peak memory")
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--baseline", help=f"JSON of an earlier run to compare against (e.g. {DEFAULT_BASELINE})")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed relative growth before flagging")
+    parser.add_argument("--save-baseline", action="store_true", help=f"also write the results to {DEFAULT_BASELINE}")
+    args = parser.parse_args()
+    if not enable_timeouts():
+        args.timeout = 0
+    names = args.algorithms.split(",") if args.algorithms else list(ALGORITHMS)
+    goal = GOAL_STATE
+    sets = stratified_instances(goal, args.per_depth, args.seed, parse_depths(args.depths))
+    optimal = {depth: [distance_to_goal(board, goal, weighted=True) for board in boards]
+               for depth, boards in sets.items()}
+    report = {
+        "meta": {"seed": args.seed, "per_depth": args.per_depth, "depths": sorted(sets),
+                 "warmup": args.warmup, "repeat": args.repeat, "timeout": args.timeout,
+                 "python": platform.python_version(), "machine": platform.machine(),
+                 "cpus": os.cpu_count(), "date": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": {},
+    }
+    print(f"{'algorithm':<22}{'depth':>6}{'solved':>8}{'p50 s':>10}{'p90 s':>10}{'nodes':>12}{'peak KiB':>10}")
+    for name in names:
+        cells = report["results"][name] = {}
+        for depth, boards in sets.items():
+            if not boards:
+                continue
+            cell = cells[str(depth)] = bench_cell(name, boards, goal, optimal[depth], args)
+            print(f"{name:<22}{depth:>6}{cell['solved']:>5}/{cell['boards']:<2}"
+                  f"{cell.get('p50', float('nan')):>10.4f}{cell.get('p90', float('nan')):>10.4f}"
+                  f"{cell.get('nodes_mean', 0):>12.0f}{cell.get('peak_bytes_max', 0) / 1024:>10.0f}")
+    for path in [args.output] + ([DEFAULT_BASELINE] if args.save_baseline else []):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for name, depth, metric, old, new in regressions:
+            print(f"REGRESSION {name} depth {depth} {metric}: {old:.4g} -> {new:.4g} (+{new / old - 1:.0%})")
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%} against {args.baseline}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
+import os
+
 SIZE = 100  
 GRID_SIZE = 3
 WIDTH, HEIGHT = 1000, 800  
@@ -14,6 +16,39 @@ BUTTON_COLOR = "#2ECC71"
 BUTTON_HOVER = "#27AE60"
 RED = "#FF0000"
 
-START_STATE = ((1, 2 ,3 ), (4, 0, 5), (6, 7, 8))
-GOAL_STATE = ((1, 2, 3), (4, 5, 6), (7, 8, 0))
-MOVE_COSTS = {"up": 1, "down": 2, "left": 3, "right": 4}
\ No newline at end of file
+# Tiles 1 .. n-1 in row-major order with the blank last, for the GRID_SIZE board
+GOAL_STATE = tuple(tuple((r * GRID_SIZE + c + 1) % (GRID_SIZE * GRID_SIZE) for c in range(GRID_SIZE)) for r in range(GRID_SIZE))
+START_STATES = {
+    3: ((1, 2 ,3 ), (4, 0, 5), (6, 7, 8)),
+    4: ((1, 6, 2, 4), (9, 5, 3, 11), (13, 10, 8, 7), (14, 15, 12, 0)),
+    5: ((6, 1, 2, 4, 5), (11, 7, 9, 0, 10), (13, 8, 3, 14, 15), (16, 12, 17, 19, 20), (21, 22, 18, 23, 24)),
+}
+START_STATE = START_STATES.get(GRID_SIZE, GOAL_STATE)
+MOVE_COSTS = {"up": 1, "down": 2, "left": 3, "right": 4}
+
+# Default move limits of the depth-first searches (DFS, and the last IDS pass)
+DFS_MAX_DEPTH = 30
+IDS_MAX_DEPTH = 50
+
+# Default limits of a GUI solve: wall-clock seconds and expanded nodes (0 for none)
+SOLVE_TIME_LIMIT = 60
+SOLVE_NODE_BUDGET = 5000000
+# Milliseconds between the window's checks on a running solve
+SOLVE_POLL_MS = 100
+# Tile slide during playback: longest slide and milliseconds between animation frames
+TILE_SLIDE_MS = 150
+TILE_FRAME_MS = 16
+
+# Explored entries a GUI solve keeps for the paths panel (the whole 8-puzzle space fits)
+SOLVE_TRACE_LIMIT = 200000
+# Address-space cap of each Run All worker process, in MiB
+RUN_ALL_MEMORY_MB = 2048
+
+# Explored-node trace kept by the searches: "count", "ring", "first" or "full"
+TRACE_MODE = "first"
+TRACE_LIMIT = 100
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+# Default disjoint pattern-database layout per board width
+PDB_LAYOUTS = {3: "4-4", 4: "5-5-5", 5: "4-4-4-4-4-4"}
@@ -1,17 +1,24 @@
 import tkinter as tk
 from tkinter import ttk
 from .theme import COLORS, FONTS, apply_style, STYLES
+from .paths_view import PathsView
 from algorithms import ALGORITHM_CATEGORIES
+from constants import GRID_SIZE, SOLVE_TIME_LIMIT, SOLVE_NODE_BUDGET
 
 class ControlPanel(tk.Frame):
-    def __init__(self, parent, solve_callback, navigate_callback, play_pause_callback):
+    def __init__(self, parent, solve_callback, navigate_callback, play_pause_callback, cancel_callback, seek_callback):
         super().__init__(parent, bg=COLORS["surface"])
         self.solve_callback = solve_callback
         self.navigate_callback = navigate_callback
         self.play_pause_callback = play_pause_callback
+        self.cancel_callback = cancel_callback
+        self.seek_callback = seek_callback
         
         self.selected_algorithm = tk.StringVar()
         self.animation_speed = tk.DoubleVar(value=0.5)
+        self.slide_tiles = tk.BooleanVar(value=True)
+        self.time_limit = tk.StringVar(value=str(SOLVE_TIME_LIMIT))
+        self.node_budget = tk.StringVar(value=str(SOLVE_NODE_BUDGET))
         self.is_running = False
         self.solution_info = {}
         
@@ -71,7 +78,8 @@ class ControlPanel(tk.Frame):
                 )
                 rb.pack(anchor="w", pady=2)
         
-        self.selected_algorithm.set("BFS")
+        # the 15-puzzle and up is out of reach for the memory-hungry searches
+        self.selected_algorithm.set("BFS" if GRID_SIZE <= 3 else "IDA*")
     
     def create_paths_section(self, parent):
         paths_frame = tk.Frame(parent, bg=COLORS["surface"])
@@ -81,28 +89,8 @@ class ControlPanel(tk.Frame):
         apply_style(heading, "heading")
         heading.pack(fill="x", pady=5)
         
-        text_frame = tk.Frame(paths_frame, bg=COLORS["surface"])
-        text_frame.pack(fill="both", expand=True)
-        
-        h_scrollbar = ttk.Scrollbar(text_frame, orient="horizontal")
-        h_scrollbar.pack(side=tk.BOTTOM, fill="x")
-        
-        v_scrollbar = ttk.Scrollbar(text_frame, orient="vertical")
-        v_scrollbar.pack(side=tk.RIGHT, fill="y")
-        
-        self.paths_text = tk.Text(
-            text_frame, 
-            height=10, 
-            width=40, 
-            font=FONTS["body"],
-            wrap="none",
-            xscrollcommand=h_scrollbar.set,
-            yscrollcommand=v_scrollbar.set
-        )
-        self.paths_text.pack(side=tk.LEFT, fill="both", expand=True)
-        
-        h_scrollbar.config(command=self.paths_text.xview)
-        v_scrollbar.config(command=self.paths_text.yview)
+        self.paths_view = PathsView(paths_frame, height=10, width=40)
+        self.paths_view.pack(fill="both", expand=True)
         
     def create_controls_section(self):
         control_frame = tk.Frame(self.control_group_frame, bg=COLORS["surface"])
@@ -123,6 +111,25 @@ class ControlPanel(tk.Frame):
         apply_style(self.solve_btn, "button")
         self.solve_btn.pack(side="left", padx=2)
         
+        self.cancel_btn = tk.Button(
+            btn_frame,
+            text="Cancel",
+            command=self.cancel_callback,
+            state="disabled"
+        )
+        apply_style(self.cancel_btn, "secondary_button")
+        self.cancel_btn.pack(side="left", padx=2)
+        
+        limits_frame = tk.Frame(control_frame, bg=COLORS["surface"])
+        limits_frame.pack(fill="x", pady=2)
+        
+        for text, variable in (("Time limit (s):", self.time_limit), ("Node budget:", self.node_budget)):
+            label = tk.Label(limits_frame, text=text, anchor="w")
+            apply_style(label, "label")
+            label.pack(side="left")
+            entry = tk.Entry(limits_frame, textvariable=variable, width=9, font=FONTS["small"])
+            entry.pack(side="left", padx=(2, 8))
+        
         speed_frame = tk.Frame(control_frame, bg=COLORS["surface"])
         speed_frame.pack(fill="x", pady=5)
         
@@ -145,6 +152,16 @@ class ControlPanel(tk.Frame):
         )
         self.speed_scale.pack(side="left", fill="x", expand=True, padx=5)
         
+        self.slide_check = tk.Checkbutton(
+            speed_frame,
+            text="Slide tiles",
+            variable=self.slide_tiles,
+            bg=COLORS["surface"],
+            activebackground=COLORS["surface"],
+            font=FONTS["small"]
+        )
+        self.slide_check.pack(side="left")
+        
     def create_navigation_section(self):
         nav_frame = tk.Frame(self.control_group_frame, bg=COLORS["surface"])
         nav_frame.pack(fill="x", pady=5)
@@ -176,6 +193,23 @@ class ControlPanel(tk.Frame):
         self.nav_buttons["last"] = tk.Button(btn_frame, text="⏭", command=lambda: self.navigate_callback("last"), state="disabled")
         apply_style(self.nav_buttons["last"], "button")
         self.nav_buttons["last"].pack(side="left", padx=1)
+        
+        # one position per step of the path; dragging seeks straight to a step
+        self.timeline = tk.Scale(
+            nav_frame,
+            from_=0,
+            to=0,
+            orient="horizontal",
+            showvalue=False,
+            command=lambda value: self.seek_callback(int(float(value))),
+            state="disabled",
+            bg=COLORS["surface"],
+            highlightthickness=0,
+            troughcolor=COLORS["primary_light"],
+            activebackground=COLORS["primary"],
+            sliderrelief="flat"
+        )
+        self.timeline.pack(fill="x", pady=2)
     
     def create_info_section(self):
         info_frame = tk.Frame(self.control_group_frame, bg=COLORS["surface"])
@@ -197,7 +231,9 @@ class ControlPanel(tk.Frame):
             ("Total Cost", "total_cost"), 
             ("Current Cost", "current_cost"),
             ("Execution Time", "execution_time"),  
-            ("States Explored", "states_explored")
+            ("States Explored", "states_explored"),
+            ("States Generated", "states_generated"),
+            ("Max Frontier", "max_frontier")
         ]
         
         for i, (label_text, key) in enumerate(info_fields):
@@ -213,44 +249,33 @@ class ControlPanel(tk.Frame):
         info_grid.columnconfigure(3, weight=1)
     
     def update_paths(self, all_paths):
-        self.paths_text.delete(1.0, tk.END)
-        if not all_paths:
-            self.paths_text.insert(tk.END, "No paths explored yet.")
-            return
-            
-        max_display = 100
-        paths_to_show = all_paths[:max_display]
-        
-        for i, (path, cost) in enumerate(paths_to_show):
-            if i > 0:
-                self.paths_text.insert(tk.END, "-" * 40 + "\n\n")
-                
-            self.paths_text.insert(tk.END, f"Path {i+1} (Cost: {cost}):\n\n")
-            
-            for state in path:
-                self.paths_text.insert(tk.END, "\n")
-                
-                for row in state:
-                    formatted_row = "  ".join(" _" if num is None or num == 0 else f"{num:2d}" for num in row)
-                    self.paths_text.insert(tk.END, f"  {formatted_row}\n")
-                
-                self.paths_text.insert(tk.END, "\n")
-            
-            self.paths_text.insert(tk.END, "\n")
-            
-        if len(all_paths) > max_display:
-            self.paths_text.insert(tk.END, f"...and {len(all_paths) - max_display} more paths (not shown).\n")
+        """Point the explored-paths view at ``all_paths``; cheap when it is already showing them."""
+        self.paths_view.set_entries(all_paths)
             
     def update_info(self, info_dict):
-        self.solution_info.update(info_dict)
         for key, value in info_dict.items():
-            if key in self.info_labels:
+            # skip labels that already show the value
+            if key in self.info_labels and self.solution_info.get(key, self) != value:
                 self.info_labels[key].config(text=str(value))
+        self.solution_info.update(info_dict)
+
+    def set_timeline(self, last_step):
+        """Size the timeline for a path of ``last_step`` moves and move it to the start."""
+        # a disabled Scale ignores set()
+        state = self.timeline.cget("state")
+        self.timeline.config(state="normal", to=max(last_step, 0))
+        self.timeline.set(0)
+        self.timeline.config(state=state)
+
+    def set_timeline_position(self, step):
+        if self.timeline.get() != step:
+            self.timeline.set(step)
                 
     def enable_navigation(self, enable=True):
         state = "normal" if enable else "disabled"
         for button in self.nav_buttons.values():
             button.config(state=state)
+        self.timeline.config(state=state)
         
     def lock_animation_speed(self, lock=True):
         if lock:
@@ -266,6 +291,23 @@ class ControlPanel(tk.Frame):
         else:
             self.status_msg.config(text="Please select an algorithm first!")
             
+    def solve_limits(self):
+        """(seconds, expanded nodes) allowed per solve, None where the field is 0, blank or not a number."""
+        limits = []
+        for variable in (self.time_limit, self.node_budget):
+            try:
+                value = float(variable.get())
+            except ValueError:
+                value = 0
+            limits.append(value if value > 0 else None)
+        seconds, nodes = limits
+        return seconds, int(nodes) if nodes else None
+
+    def set_solving(self, solving):
+        """Swap Solve for Cancel while a solve runs."""
+        self.solve_btn.config(state="disabled" if solving else "normal")
+        self.cancel_btn.config(state="normal" if solving else "disabled")
+            
     def on_play_pause(self):
         if self.is_running:
             self.is_running = False
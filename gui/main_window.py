@@ -1,22 +1,24 @@
 import tkinter as tk
+import multiprocessing
+import os
+import queue
 import time
 from tkinter import messagebox
 from .control_panel import ControlPanel
 from .puzzle_frame import PuzzleFrame
-from constants import START_STATE, GOAL_STATE, WIDTH, HEIGHT
-from algorithms.uninformed import bfs, dfs, ucs, ids
-from algorithms.informed import greedy, astar, ida_star, heuristic
-from algorithms.local import simple_hill_climbing, stochastic_hill_climbing, simulated_annealing, beam_search, genetic_algorithm, steepest_ascent_hill_climbing
-from algorithms.constraint import solve as solve
-from algorithms.complex import and_or_graph_search,no_observation_belief_state_search, partially_observable_search
-from algorithms.utils import generate_random_state, calculate_costs
-from algorithms.Reforcement_learning import q_learning
+from constants import START_STATE, GOAL_STATE, GRID_SIZE, WIDTH, HEIGHT, SOLVE_POLL_MS, SOLVE_TRACE_LIMIT, RUN_ALL_MEMORY_MB, TILE_SLIDE_MS
+from algorithms.runner import ALGORITHMS, board_line, solve_instance, solve_job, solver_pool
+from algorithms.complex import no_observation_belief_state_search, partially_observable_search
+from algorithms.utils import generate_random_state, is_solvable, UNSOLVABLE
+from algorithms.stats import search_stats
+from algorithms.space import get_space
+from algorithms.trace import SearchTrace
 from .theme import COLORS, apply_style
 
 class MainWindow(tk.Tk):
     def __init__(self):
         super().__init__()
-        self.title("8-Puzzle Solver")
+        self.title(f"{GRID_SIZE * GRID_SIZE - 1}-Puzzle Solver")
         self.geometry(f"{WIDTH}x{HEIGHT}")
         self.configure(bg=COLORS["background"])
         
@@ -29,87 +31,32 @@ class MainWindow(tk.Tk):
         self.start_time = None
         self.execution_time = None  
         self.is_playing = False
+        self.solve_job = None
         
-        self.algorithms = {
-            "BFS": bfs,
-            "DFS": dfs,
-            "UCS": ucs,
-            "IDS": ids,
-            "Greedy": greedy,
-            "A*": astar,
-            "IDA*": ida_star,
-            "Simple HC": simple_hill_climbing,
-            "Stochastic HC": stochastic_hill_climbing,
-            "Simulated Annealing": simulated_annealing,
-            "Beam Search": beam_search,
-            "Steepest Ascent HC": steepest_ascent_hill_climbing,
-            "Genetic Algorithm": genetic_algorithm,
-            "And-Or Graph Search": and_or_graph_search,
-            "No Observation Belief State Search": self.adapt_no_observable_search,
-            "Partially Observable Search": self.adapt_partially_observable_search,
-            "Backtracking": self.adapt_backtracking,
-            "AC-3": self.adapt_ac3,
-            "Forward Checking": self.adapt_forward_checking,
-            "Q-Learning": self.adapt_q_learning
-        }
+        self.algorithms = dict(ALGORITHMS)
+        # the belief-state searches read their inputs from this window
+        self.algorithms["No Observation Belief State Search"] = self.adapt_no_observable_search
+        self.algorithms["Partially Observable Search"] = self.adapt_partially_observable_search
         
-        # Định nghĩa 3 nhóm thuật toán
+        # Định nghĩa các nhóm thuật toán cho Run All
         self.algorithm_groups = {
-            "Uninformed": ["BFS", "DFS", "UCS", "IDS"],
-            "Informed":   ["Greedy", "A*", "IDA*"],
-            "Local":      ["Simple HC", "Stochastic HC", "Simulated Annealing", "Beam Search", "Steepest Ascent HC", "Genetic Algorithm"]
-            
+            "Uninformed": ["BFS", "DFS", "UCS", "IDS", "Bidirectional BFS", "Bidirectional UCS"],
+            "Informed":   ["Greedy", "A*", "IDA*", "Bidirectional A*"],
+            "Local":      ["Simple HC", "Stochastic HC", "Simulated Annealing", "Beam Search", "Steepest Ascent HC", "Genetic Algorithm"],
+            # the belief-state searches need the belief lists and are left out
+            "Complex":    ["And-Or Graph Search"],
+            "Constraint": ["Backtracking", "AC-3", "Forward Checking"],
+            "Reinforcement": ["Q-Learning"]
         }
         
         self.create_widgets()
     
-    def adapt_backtracking(self, start_state, goal_state):
-        result = solve(start_state, method='backtracking')
-
-        if result['solution']:
-            path = result['path']
-            if path:
-                costs = calculate_costs(path)
-                all_paths = [(path[:i+1], costs[i]) for i in range(len(path))]
-                return path, costs, all_paths
-            else:
-                return None, None, []
-        else:
-            return None, None, []
-    
-    def adapt_forward_checking(self, start_state, goal_state):
-        result = solve(start_state, method='forward')
-        
-        if result['solution']:
-            path = result['path']
-            if path:
-                costs = calculate_costs(path)
-                all_paths = [(path[:i+1], costs[i]) for i in range(len(path))]
-                return path, costs, all_paths
-            else:
-                return None, None, []
-        else:
-            return None, None, []
-    
-    def adapt_ac3(self, start_state, goal_state):
-        result = solve(start_state, method='ac3')
-        
-        if result['solution']:
-            path = result['path']
-            if path:
-                costs = calculate_costs(path)
-                all_paths = [(path[:i+1], costs[i]) for i in range(len(path))]
-                return path, costs, all_paths
-            else:
-                return None, None, []
-        else:
-            return None, None, []
-    
-    def adapt_partially_observable_search(self, initial_state, goal_state):
+    def partially_observable_inputs(self):
+        """(visible part, belief states, goal states) from the window, or None after telling the user what is missing."""
         visible = []
-        for i in range(3):
+        for i in range(GRID_SIZE):
             row = []
-            for j in range(3):
+            for j in range(GRID_SIZE):
                 e = self.goal_matrix_entries[i][j]
                 if e.cget('state') == 'disabled':
                     row.append(int(e.get()))
@@ -120,49 +67,37 @@ class MainWindow(tk.Tk):
         # bắt buộc phải có ít nhất 1 ô visible
         if not any(cell is not None for row in visible for cell in row):
             messagebox.showerror("Lỗi", "Vui lòng khóa ít nhất một ô trong phần nhìn thấy!")
-            return [], {}, []
+            return None
 
+        beliefs = self.no_observation_inputs()
+        if beliefs is None:
+            return None
+        return (visible,) + beliefs
+
+    def no_observation_inputs(self):
+        """(belief states, goal states) from the window, or None after telling the user what is missing."""
         initial_states = self.get_states_from_listbox(self.belief_listbox)
         goal_states = self.get_states_from_listbox(self.goal_listbox)
         if not initial_states or not goal_states:
             messagebox.showerror("Lỗi", "Vui lòng nhập ít nhất một trạng thái belief và một mục tiêu belief!")
-            return [], {}, []
+            return None
 
         self.start_state = initial_states[0]
         self.puzzle_frame.draw_state(self.start_state)
+        return initial_states, goal_states
 
-        path, costs, all_paths = partially_observable_search(
-            visible, initial_states, goal_states
-        )
-        return path, costs, all_paths
+    def adapt_partially_observable_search(self, initial_state, goal_state):
+        inputs = self.partially_observable_inputs()
+        if inputs is None:
+            return [], {}, []
+        return partially_observable_search(*inputs)
 
     def adapt_no_observable_search(self, initial_state, goal_state):
-        initial_states = self.get_states_from_listbox(self.belief_listbox)
-        goal_states = self.get_states_from_listbox(self.goal_listbox)
-        if not initial_states or not goal_states:
-            messagebox.showerror("Lỗi", "Vui lòng nhập ít nhất một trạng thái belief và một mục tiêu belief!")
+        inputs = self.no_observation_inputs()
+        if inputs is None:
             return [], {}, []
+        return no_observation_belief_state_search(*inputs)
 
-        self.start_state = initial_states[0]
-        self.puzzle_frame.draw_state(self.start_state)
-
-        path, costs, all_paths = no_observation_belief_state_search(
-            initial_states, goal_states
-        )
-        return path, costs, all_paths
-    def adapt_q_learning(self, start_state, goal_state):
-        # nếu GUI cần theo dõi Q và cache riêng
-        distance_cache = {}
-        Q = {}
-        # gọi vào hàm q_learning chính
-        path, costs, all_paths = q_learning(
-            start_state, goal_state,
-            episodes=2000, alpha=0.1, gamma=0.9,
-            epsilon_start=1.0, epsilon_end=0.01,
-            max_steps=100,
-            Q=Q, distance_cache=distance_cache
-        )
-        return path, costs, all_paths
     def create_widgets(self):
         left_panel = tk.Frame(self, bg=COLORS["surface"])
         left_panel.pack(side=tk.LEFT, padx=20, pady=20)
@@ -177,9 +112,9 @@ class MainWindow(tk.Tk):
         self.belief_matrix_entries = []
         belief_matrix_frame = tk.Frame(self.belief_matrices_frame, bg=COLORS["surface"])
         belief_matrix_frame.grid(row=1, column=0, padx=5)
-        for i in range(3):
+        for i in range(GRID_SIZE):
             row_entries = []
-            for j in range(3):
+            for j in range(GRID_SIZE):
                 entry = tk.Entry(belief_matrix_frame, width=5, font=('Arial', 12))  # Tăng kích thước ô nhập
                 entry.grid(row=i, column=j, padx=2, pady=2)  # Tăng padding
                 # Bind keyboard events
@@ -209,9 +144,9 @@ class MainWindow(tk.Tk):
         self.goal_matrix_entries = []
         goal_matrix_frame = tk.Frame(self.belief_matrices_frame, bg=COLORS["surface"])
         goal_matrix_frame.grid(row=1, column=1, padx=5)
-        for i in range(3):
+        for i in range(GRID_SIZE):
             row_entries = []
-            for j in range(3):
+            for j in range(GRID_SIZE):
                 entry = tk.Entry(goal_matrix_frame, width=5, font=('Arial', 12))
                 entry.grid(row=i, column=j, padx=2, pady=2)
                 # Bind keyboard events
@@ -274,12 +209,12 @@ class MainWindow(tk.Tk):
         # Frame cho input thông thường
         self.input_frame = tk.Frame(left_panel, bg=COLORS["surface"])
         self.input_frame.pack(fill="x", pady=5)
-        input_label = tk.Label(self.input_frame, text="Enter 1D array (0-8):", bg=COLORS["surface"])
+        input_label = tk.Label(self.input_frame, text=f"Enter 1D array (0-{GRID_SIZE * GRID_SIZE - 1}):", bg=COLORS["surface"])
         apply_style(input_label, "label")
         input_label.pack(side=tk.LEFT, padx=5)
-        self.array_input = tk.Entry(self.input_frame, width=15)
+        self.array_input = tk.Entry(self.input_frame, width=max(15, 3 * GRID_SIZE * GRID_SIZE))
         self.array_input.pack(side=tk.LEFT, padx=5)
-        self.array_input.insert(0, "1,2,3,4,0,5,6,7,8")  
+        self.array_input.insert(0, ",".join(str(v) for row in START_STATE for v in row))
         apply_button = tk.Button(
             self.input_frame,
             text="Apply Array",
@@ -297,7 +232,7 @@ class MainWindow(tk.Tk):
         apply_style(random_button, "button")
         random_button.pack(side=tk.LEFT, padx=5)
 
-        self.puzzle_frame = PuzzleFrame(left_panel)
+        self.puzzle_frame = PuzzleFrame(left_panel, size=min(90, 360 // GRID_SIZE), grid_size=GRID_SIZE)
         self.puzzle_frame.pack(pady=10)
         self.puzzle_frame.draw_state(self.start_state)
         
@@ -307,29 +242,29 @@ class MainWindow(tk.Tk):
         self.run_all_btn.pack(side=tk.TOP, anchor="ne", padx=10, pady=5)
         
         # sau đó mới vẽ control panel
-        self.control_panel = ControlPanel(self, self.solve, self.navigate, self.play_pause)
+        self.control_panel = ControlPanel(self, self.solve, self.navigate, self.play_pause, self.cancel_solve, self.seek)
         self.control_panel.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=20, pady=20)
         self.control_panel.selected_algorithm.trace_add("write", self.on_algorithm_change)
     
     def save_belief_state(self):
-        # Kiểm tra ma trận có đủ số từ 0-8 không
+        # Kiểm tra ma trận có đủ số từ 0 đến n-1 không
         numbers = set()
-        for i in range(3):
-            for j in range(3):
+        for i in range(GRID_SIZE):
+            for j in range(GRID_SIZE):
                 value = self.belief_matrix_entries[i][j].get().strip()
                 if value and value.isdigit():
                     num = int(value)
-                    if 0 <= num <= 8:
+                    if 0 <= num < GRID_SIZE * GRID_SIZE:
                         numbers.add(num)
         
-        if len(numbers) != 9:
-            messagebox.showerror("Lỗi", "Ma trận phải chứa đủ các số từ 0 đến 8!")
+        if len(numbers) != GRID_SIZE * GRID_SIZE:
+            messagebox.showerror("Lỗi", f"Ma trận phải chứa đủ các số từ 0 đến {GRID_SIZE * GRID_SIZE - 1}!")
             return
             
         # Lưu trạng thái niềm tin từ ma trận vào listbox
         state = []
-        for i in range(3):
-            for j in range(3):
+        for i in range(GRID_SIZE):
+            for j in range(GRID_SIZE):
                 value = self.belief_matrix_entries[i][j].get().strip()
                 if value:
                     state.append(value)
@@ -341,24 +276,24 @@ class MainWindow(tk.Tk):
         self.clear_belief_matrix()
 
     def save_goal_state(self):
-        # Kiểm tra ma trận có đủ số từ 0-8 không
+        # Kiểm tra ma trận có đủ số từ 0 đến n-1 không
         numbers = set()
-        for i in range(3):
-            for j in range(3):
+        for i in range(GRID_SIZE):
+            for j in range(GRID_SIZE):
                 value = self.goal_matrix_entries[i][j].get().strip()
                 if value and value.isdigit():
                     num = int(value)
-                    if 0 <= num <= 8:
+                    if 0 <= num < GRID_SIZE * GRID_SIZE:
                         numbers.add(num)
         
-        if len(numbers) != 9:
-            messagebox.showerror("Lỗi", "Ma trận phải chứa đủ các số từ 0 đến 8!")
+        if len(numbers) != GRID_SIZE * GRID_SIZE:
+            messagebox.showerror("Lỗi", f"Ma trận phải chứa đủ các số từ 0 đến {GRID_SIZE * GRID_SIZE - 1}!")
             return
             
         # Lưu mục tiêu niềm tin từ ma trận vào listbox
         state = []
-        for i in range(3):
-            for j in range(3):
+        for i in range(GRID_SIZE):
+            for j in range(GRID_SIZE):
                 value = self.goal_matrix_entries[i][j].get().strip()
                 if value:
                     state.append(value)
@@ -368,15 +303,15 @@ class MainWindow(tk.Tk):
         self.goal_listbox.insert('end', ','.join(state))
         
         # Xóa nội dung trong ma trận nhưng giữ lại các ô đã bị khóa
-        for i in range(3):
-            for j in range(3):
+        for i in range(GRID_SIZE):
+            for j in range(GRID_SIZE):
                 if self.goal_matrix_entries[i][j].cget('state') != 'disabled':
                     self.goal_matrix_entries[i][j].delete(0, tk.END)
                     self.goal_matrix_entries[i][j].config(state='normal')
         
         # Focus vào ô đầu tiên có thể nhập được
-        for i in range(3):
-            for j in range(3):
+        for i in range(GRID_SIZE):
+            for j in range(GRID_SIZE):
                 if self.goal_matrix_entries[i][j].cget('state') == 'normal':
                     self.goal_matrix_entries[i][j].focus_set()
                     return
@@ -386,16 +321,16 @@ class MainWindow(tk.Tk):
 
     def clear_belief_matrix(self):
         # Xóa nội dung trong ma trận belief
-        for i in range(3):
-            for j in range(3):
+        for i in range(GRID_SIZE):
+            for j in range(GRID_SIZE):
                 self.belief_matrix_entries[i][j].delete(0, tk.END)
         # Focus vào ô đầu tiên
         self.belief_matrix_entries[0][0].focus_set()
 
     def clear_goal_matrix(self):
         """Xóa nội dung trong ma trận goal và mở khóa tất cả các ô"""
-        for i in range(3):
-            for j in range(3):
+        for i in range(GRID_SIZE):
+            for j in range(GRID_SIZE):
                 self.goal_matrix_entries[i][j].config(state='normal')  # Mở khóa tất cả các ô
                 self.goal_matrix_entries[i][j].delete(0, tk.END)
         # Enable lại nút Khóa khi reset ma trận
@@ -444,26 +379,26 @@ class MainWindow(tk.Tk):
                 values = [int(x) for x in input_text.split()]
             
             # Validate input
-            if len(values) != 9:
-                messagebox.showerror("Input Error", "Please enter exactly 9 values (0-8)")
+            cell_count = GRID_SIZE * GRID_SIZE
+            if len(values) != cell_count:
+                messagebox.showerror("Input Error", f"Please enter exactly {cell_count} values (0-{cell_count - 1})")
                 return
             
-            if sorted(values) != list(range(9)):
-                messagebox.showerror("Input Error", "Input must contain exactly the numbers 0-8")
+            if sorted(values) != list(range(cell_count)):
+                messagebox.showerror("Input Error", f"Input must contain exactly the numbers 0-{cell_count - 1}")
                 return
             
-            new_state = (
-                tuple(values[0:3]),
-                tuple(values[3:6]),
-                tuple(values[6:9])
-            )
+            new_state = tuple(tuple(values[i * GRID_SIZE:(i + 1) * GRID_SIZE]) for i in range(GRID_SIZE))
             
             self.start_state = new_state
             self.puzzle_frame.draw_state(self.start_state)
             
             self.reset_solution_data()
             
-            self.control_panel.status_msg.config(text="Initial state updated from 1D array.")
+            if is_solvable(self.start_state, self.goal_state):
+                self.control_panel.status_msg.config(text="Initial state updated from 1D array.")
+            else:
+                self.control_panel.status_msg.config(text="Initial state updated, but it cannot reach the goal (parity).")
             
         except Exception as e:
             messagebox.showerror("Input Error", f"Invalid input format: {str(e)}")
@@ -471,7 +406,7 @@ class MainWindow(tk.Tk):
     def randomize_state(self):
         """Generate a random puzzle, write it to the entry and apply."""
         # generate_random_state returns a tuple-of-tuples, e.g. ((1,2,3),(4,0,5),(6,7,8))
-        new_state = generate_random_state()
+        new_state = generate_random_state(GRID_SIZE, self.goal_state)
         # flatten and format as comma‐separated
         flat = [str(v) for row in new_state for v in row]
         self.array_input.delete(0, tk.END)
@@ -480,6 +415,9 @@ class MainWindow(tk.Tk):
         self.apply_array_input()
     
     def reset_solution_data(self):
+        if self.solve_job is not None:
+            # the board it was solving is gone
+            self.end_solve_job()
         self.start_time = None
         self.execution_time = None
         self.is_playing = False
@@ -497,7 +435,9 @@ class MainWindow(tk.Tk):
             "total_cost": 0,
             "current_cost": 0,
             "execution_time": "0.00s",  
-            "states_explored": 0
+            "states_explored": 0,
+            "states_generated": 0,
+            "max_frontier": 0
         }
         self.control_panel.update_info(info)
         self.control_panel.update_paths([])
@@ -509,30 +449,107 @@ class MainWindow(tk.Tk):
             first_line = initial_text.split('\n')[0]
             if first_line.strip():
                 values = [int(x.strip()) for x in first_line.split(',')]
-                if len(values) == 9:
-                    for i in range(3):
-                        for j in range(3):
+                if len(values) == GRID_SIZE * GRID_SIZE:
+                    for i in range(GRID_SIZE):
+                        for j in range(GRID_SIZE):
                             self.goal_matrix_entries[i][j].delete(0, tk.END)
-                            self.goal_matrix_entries[i][j].insert(0, str(values[i*3+j]))
+                            self.goal_matrix_entries[i][j].insert(0, str(values[i*GRID_SIZE+j]))
      
-        self.control_panel.status_msg.config(text=f"Đang giải với thuật toán {algorithm_name}...")
-        self.update()  
-        
-        self.start_time = time.time()
-
+        if self.solve_job is not None:
+            return
         if algorithm_name == "No Observation Belief State Search":
-            self.path, self.costs, self.all_paths = self.adapt_no_observable_search(None, None)
+            target, args = no_observation_belief_state_search, self.no_observation_inputs()
         elif algorithm_name == "Partially Observable Search":
-            self.path, self.costs, self.all_paths = self.adapt_partially_observable_search(None, None)
+            target, args = partially_observable_search, self.partially_observable_inputs()
         else:
-            self.path, self.costs, self.all_paths = self.algorithms[algorithm_name](self.start_state, self.goal_state)
-        
-        self.execution_time = time.time() - self.start_time
-        
+            target, args = algorithm_name, (self.start_state, self.goal_state)
+        if args is None:
+            return
+
+        time_limit, node_budget = self.control_panel.solve_limits()
+        progress = multiprocessing.Value('q', 0, lock=False)
+        results = multiprocessing.Queue()
+        process = multiprocessing.Process(target=solve_job, daemon=True,
+                                          args=(target, args, node_budget, progress, results, SOLVE_TRACE_LIMIT))
+        process.start()
+        self.solve_job = {"name": algorithm_name, "process": process, "results": results,
+                          "progress": progress, "time_limit": time_limit, "started": time.time()}
+        self.control_panel.set_solving(True)
+        self.control_panel.status_msg.config(text=f"Đang giải với thuật toán {algorithm_name}...")
+        self.after(SOLVE_POLL_MS, self.poll_solve)
+
+    def poll_solve(self):
+        """Check on the running solve: show its progress, hand a finished result to ``finish_solve``, enforce the time limit."""
+        job = self.solve_job
+        if job is None:
+            return
+        try:
+            status, payload = job["results"].get_nowait()
+        except queue.Empty:
+            elapsed = time.time() - job["started"]
+            if job["process"].is_alive():
+                if job["time_limit"] and elapsed > job["time_limit"]:
+                    self.cancel_solve(f"Timed out after {job['time_limit']}s.")
+                else:
+                    self.control_panel.status_msg.config(
+                        text=f"Solving with {job['name']}... {job['progress'].value:,} nodes, {elapsed:.1f}s")
+                    self.after(SOLVE_POLL_MS, self.poll_solve)
+                return
+            # the result may have been put just after the first read, right before the process exited
+            try:
+                status, payload = job["results"].get(timeout=1)
+            except queue.Empty:
+                self.cancel_solve("The solver process stopped without a result (out of memory?).")
+                return
+        self.end_solve_job()
+        self.finish_solve(status, payload, time.time() - job["started"])
+
+    def end_solve_job(self):
+        job, self.solve_job = self.solve_job, None
+        if job["process"].is_alive():
+            job["process"].terminate()
+        job["process"].join()
+        self.control_panel.set_solving(False)
+
+    def cancel_solve(self, message="Cancelled."):
+        """Terminate the running solve, if any."""
+        if self.solve_job is None:
+            return
+        self.end_solve_job()
+        self.path, self.costs, self.all_paths = None, None, []
+        self.execution_time = None
+        self.current_step = 0
+        self.update_display()
+        self.control_panel.enable_navigation(False)
+        self.control_panel.update_info({"status": "Stopped"})
+        self.control_panel.status_msg.config(text=message)
+
+    def finish_solve(self, status, payload, elapsed):
+        """Show the result of a solve: ``status`` and ``payload`` as ``solve_job`` puts them."""
+        self.execution_time = elapsed
+        if status in ("solved", "no_solution"):
+            self.path, self.costs, self.all_paths, self.execution_time = payload
+            if isinstance(self.all_paths, SearchTrace):
+                self.all_paths.space = get_space(self.start_state)
+        elif status == "unsolvable":
+            self.path, self.costs, self.all_paths = None, None, UNSOLVABLE
+        else:
+            self.path, self.costs, self.all_paths = None, None, []
+
         self.current_step = 0
         self.update_display()
         self.control_panel.enable_navigation(self.path is not None)
-        self.control_panel.status_msg.config(text=f"Solution found in {self.execution_time:.2f}s!" if self.path else "No solution found!")
+        if status == "unsolvable":
+            self.control_panel.update_info({"status": "Unsolvable"})
+            self.control_panel.status_msg.config(text="Unsolvable: start and goal have different parity.")
+        elif status == "budget":
+            self.control_panel.update_info({"status": "Stopped"})
+            self.control_panel.status_msg.config(text=f"Node budget reached after {payload:,} expansions.")
+        elif status == "error":
+            self.control_panel.status_msg.config(text="Error!")
+            messagebox.showerror("Error", payload)
+        else:
+            self.control_panel.status_msg.config(text=f"Solution found in {self.execution_time:.2f}s!" if self.path else "No solution found!")
         
     def navigate(self, direction):
         if not self.path:
@@ -546,7 +563,13 @@ class MainWindow(tk.Tk):
             self.current_step += 1
         elif direction == "last":
             self.current_step = len(self.path) - 1
-            self.update_display()
+        self.show_step()
+
+    def seek(self, step):
+        """Jump to ``step`` of the path, from the timeline."""
+        if self.path and step != self.current_step and 0 <= step < len(self.path):
+            self.current_step = step
+            self.show_step()
         
     def play_pause(self, is_playing):
         self.is_playing = is_playing
@@ -557,7 +580,7 @@ class MainWindow(tk.Tk):
     def auto_step(self):
         if self.is_playing and self.current_step < len(self.path) - 1:
             self.current_step += 1
-            self.update_display()
+            self.show_step()
             delay = int(self.control_panel.animation_speed.get() * 1000)
             self.after(delay, self.auto_step)
         else:
@@ -568,40 +591,56 @@ class MainWindow(tk.Tk):
             elif not self.is_playing:
                 self.control_panel.set_play_pause_state(False)
             
+    def slide_duration(self):
+        """Milliseconds a tile takes to slide one step: short enough to finish before the next playback step."""
+        if not self.control_panel.slide_tiles.get():
+            return 0
+        return min(TILE_SLIDE_MS, int(self.control_panel.animation_speed.get() * 800))
+
     def update_display(self):
+        """Refresh everything that depends on the result, once per solve or reset; playback only needs ``show_step``."""
+        stats = search_stats(self.all_paths)
         if self.path:
-            prev_state = self.path[max(0, self.current_step - 1)] if self.current_step > 0 else self.path[0]
-            self.puzzle_frame.draw_state(self.path[self.current_step])
-            self.puzzle_frame.show_move(prev_state, self.path[self.current_step])
-            total_steps = len(self.path) - 1
-            total_cost = self.costs[-1] if self.costs else 0
-            
             info = {
                 "algorithm": self.control_panel.selected_algorithm.get(),
-                "status": "Solved" if self.path else "No Solution",
-                "steps": total_steps,
-                "current_step": self.current_step,
-                "total_cost": total_cost,
-                "current_cost": self.costs[self.current_step],
+                "status": "Solved",
+                "steps": len(self.path) - 1,
+                "total_cost": self.costs[-1] if self.costs else 0,
                 "execution_time": f"{self.execution_time:.2f}s",  
-                "states_explored": len(self.all_paths)
             }
-            self.control_panel.update_info(info)
-            self.control_panel.update_paths(self.all_paths)
         else:
-            self.puzzle_frame.draw_state(self.start_state)
             info = {
                 "algorithm": self.control_panel.selected_algorithm.get(),
                 "status": "No Solution",
                 "steps": 0,
-                "current_step": 0,
                 "total_cost": 0,
-                "current_cost": 0,
                 "execution_time": f"{self.execution_time:.2f}s" if self.execution_time else "0.00s",  
-                "states_explored": len(self.all_paths) if self.all_paths else 0
             }
-            self.control_panel.update_info(info)
-            self.control_panel.update_paths(self.all_paths if self.all_paths else [])
+        info.update({
+            "states_explored": stats.nodes_expanded,
+            "states_generated": stats.nodes_generated,
+            "max_frontier": stats.max_frontier
+        })
+        self.control_panel.update_info(info)
+        self.control_panel.update_paths(self.all_paths if self.all_paths else [])
+        self.control_panel.set_timeline(len(self.path) - 1 if self.path else 0)
+        self.show_step()
+
+    def show_step(self):
+        """Show ``current_step`` of the path: the board, the move and the two step fields."""
+        if self.path:
+            state = self.path[self.current_step]
+            prev_state = self.path[self.current_step - 1] if self.current_step > 0 else state
+            self.puzzle_frame.draw_state(state, self.slide_duration())
+            self.puzzle_frame.show_move(prev_state, state)
+            self.control_panel.update_info({
+                "current_step": self.current_step,
+                "current_cost": self.costs[self.current_step],
+            })
+            self.control_panel.set_timeline_position(self.current_step)
+        else:
+            self.puzzle_frame.draw_state(self.start_state)
+            self.control_panel.update_info({"current_step": 0, "current_cost": 0})
     
   
     def handle_matrix_keypress(self, event, row, col, matrix_type):
@@ -610,19 +649,19 @@ class MainWindow(tk.Tk):
         
         if event.keysym == 'Return':
             # Move to next cell or save state if at last cell
-            if col < 2:
+            if col < GRID_SIZE - 1:
                 next_col = col + 1
-                while next_col < 3 and entries[row][next_col].cget('state') == 'disabled':
+                while next_col < GRID_SIZE and entries[row][next_col].cget('state') == 'disabled':
                     next_col += 1
-                if next_col < 3:
+                if next_col < GRID_SIZE:
                     entries[row][next_col].focus_set()
-            elif row < 2:
+            elif row < GRID_SIZE - 1:
                 next_row = row + 1
                 next_col = 0
-                while next_row < 3:
-                    while next_col < 3 and entries[next_row][next_col].cget('state') == 'disabled':
+                while next_row < GRID_SIZE:
+                    while next_col < GRID_SIZE and entries[next_row][next_col].cget('state') == 'disabled':
                         next_col += 1
-                    if next_col < 3:
+                    if next_col < GRID_SIZE:
                         entries[next_row][next_col].focus_set()
                         break
                     next_row += 1
@@ -645,11 +684,11 @@ class MainWindow(tk.Tk):
                     entries[prev_row][col].focus_set()
                 
         elif event.keysym == 'Down':
-            if row < 2:
+            if row < GRID_SIZE - 1:
                 next_row = row + 1
-                while next_row < 3 and entries[next_row][col].cget('state') == 'disabled':
+                while next_row < GRID_SIZE and entries[next_row][col].cget('state') == 'disabled':
                     next_row += 1
-                if next_row < 3:
+                if next_row < GRID_SIZE:
                     entries[next_row][col].focus_set()
                 
         elif event.keysym == 'Left':
@@ -661,26 +700,26 @@ class MainWindow(tk.Tk):
                     entries[row][prev_col].focus_set()
                 
         elif event.keysym == 'Right':
-            if col < 2:
+            if col < GRID_SIZE - 1:
                 next_col = col + 1
-                while next_col < 3 and entries[row][next_col].cget('state') == 'disabled':
+                while next_col < GRID_SIZE and entries[row][next_col].cget('state') == 'disabled':
                     next_col += 1
-                if next_col < 3:
+                if next_col < GRID_SIZE:
                     entries[row][next_col].focus_set()
 
     def save_visible_part(self):
-        # chỉ cho phép khóa khi có ít nhất một ô được nhập số 0-8
+        # chỉ cho phép khóa khi có ít nhất một ô được nhập số hợp lệ
         if not any(
             self.goal_matrix_entries[i][j].get().strip().isdigit()
-            for i in range(3) for j in range(3)
+            for i in range(GRID_SIZE) for j in range(GRID_SIZE)
         ):
             messagebox.showerror("Lỗi", "Vui lòng nhập ít nhất một ô để khóa!")
             return
-        # Kiểm tra và lưu các ô đã nhập số từ 0-8
-        for i in range(3):
-            for j in range(3):
+        # Kiểm tra và lưu các ô đã nhập số hợp lệ
+        for i in range(GRID_SIZE):
+            for j in range(GRID_SIZE):
                 value = self.goal_matrix_entries[i][j].get().strip()
-                if value and value.isdigit() and 0 <= int(value) <= 8:
+                if value and value.isdigit() and 0 <= int(value) < GRID_SIZE * GRID_SIZE:
                     # Khóa ô này
                     self.goal_matrix_entries[i][j].config(state='disabled')
                 else:
@@ -697,55 +736,68 @@ class MainWindow(tk.Tk):
         states = []
         for line in listbox.get(0, tk.END):
             parts = [None if s.strip() == 'None' else int(s) for s in line.split(',')]
-            # chia thành 3 hàng
+            # chia thành GRID_SIZE hàng
             state = tuple(
-                tuple(parts[i*3:(i+1)*3]) 
-                for i in range(3)
+                tuple(parts[i*GRID_SIZE:(i+1)*GRID_SIZE]) 
+                for i in range(GRID_SIZE)
             )
             states.append(state)
         return states
 
     def run_all(self):
-        """Chạy lần lượt tất cả các thuật toán trong 3 nhóm, thu thập thời gian, steps, cost và states explored."""
-        results = []
-        original_start = self.start_state
-        original_goal  = self.goal_state
-        for group, names in self.algorithm_groups.items():
-            for name in names:
-                fn = self.algorithms[name]
-                # reset
-                self.reset_solution_data()
-                self.start_state, self.goal_state = original_start, original_goal
-                t0 = time.time()
-                path, costs, all_paths = fn(self.start_state, self.goal_state)
-                t1 = time.time()
-                if path:
-                    steps = len(path) - 1
-                    cost  = costs[-1]
-                    explored = len(all_paths)
-                else:
-                    steps = None
-                    cost  = None
-                    explored = len(all_paths) if all_paths else 0
-                results.append({
-                    "Group": group,
-                    "Algorithm": name,
-                    "Time (s)": f"{t1-t0:.3f}",
-                    "Steps": steps,
-                    "Cost": cost,
-                    "States": explored
-                })
+        """So sánh các thuật toán trong algorithm_groups: mỗi thuật toán chạy trong một tiến trình riêng của pool,
+        với giới hạn thời gian và bộ nhớ riêng, và mỗi dòng kết quả hiện ra ngay khi thuật toán đó xong."""
+        tasks = [(group, name) for group, names in self.algorithm_groups.items() for name in names]
+        time_limit, _ = self.control_panel.solve_limits()
+        line = board_line(self.start_state, self.goal_state)
+        pool = solver_pool(min(len(tasks), os.cpu_count() or 1), RUN_ALL_MEMORY_MB * 1024 * 1024)
+        done = queue.Queue()
+        for line_no, (group, name) in enumerate(tasks):
+            pool.apply_async(solve_instance, ((line_no, line, name, None, time_limit),),
+                             callback=done.put,
+                             error_callback=lambda e, n=line_no, a=name: done.put(
+                                 {"line": n, "algorithm": a, "status": "error", "error": repr(e)}))
+        pool.close()
+
         # hiển thị kết quả trong cửa sổ phụ
         win = tk.Toplevel(self)
         win.title("Run All Comparison")
-        txt = tk.Text(win, width=70, height=15, font=('Consolas',10))
+        txt = tk.Text(win, width=84, height=len(tasks) + 4, font=('Consolas',10))
         txt.pack(padx=10, pady=10)
         # header
-        txt.insert("end", f"{'Group':12} {'Algo':25} {'Time':>8} {'Steps':>6} {'Cost':>6} {'States':>7}\n")
-        txt.insert("end", "-"*70 + "\n")
-        for r in results:
-            txt.insert("end",
-              f"{r['Group']:12} {r['Algorithm']:25} {r['Time (s)']:>8} {str(r['Steps']):>6} {str(r['Cost']):>6} {str(r['States']):>7}\n"
-            )
+        txt.insert("end", f"{'Group':14} {'Algo':25} {'Time':>8} {'Steps':>6} {'Cost':>6} {'States':>9} {'Status':>11}\n")
+        txt.insert("end", "-"*84 + "\n")
         txt.config(state='disabled')
+        progress = tk.Label(win, anchor="w")
+        progress.pack(fill="x", padx=10, pady=(0, 10))
+        started = time.time()
+        received = []
+
+        def poll():
+            if not win.winfo_exists():
+                return
+            txt.config(state='normal')
+            while True:
+                try:
+                    record = done.get_nowait()
+                except queue.Empty:
+                    break
+                received.append(record)
+                group, name = tasks[record["line"]]
+                steps = record.get("moves")
+                time_text = f"{record['seconds']:.3f}" if "seconds" in record else "--"
+                txt.insert("end",
+                  f"{group:14} {name:25} {time_text:>8} {str(steps):>6} {str(record.get('cost')):>6} "
+                  f"{str(record.get('nodes')):>9} {record['status']:>11}\n"
+                )
+            txt.config(state='disabled')
+            finished = len(received) == len(tasks)
+            progress.config(text=f"{len(received)}/{len(tasks)} done in {time.time() - started:.1f}s")
+            if finished:
+                pool.join()
+            else:
+                win.after(SOLVE_POLL_MS, poll)
 
+        # closing the window stops whatever is still running
+        win.protocol("WM_DELETE_WINDOW", lambda: (pool.terminate(), win.destroy()))
+        poll()
@@ -0,0 +1,122 @@
+import tkinter as tk
+import tkinter.font as tkfont
+from tkinter import ttk
+from collections import OrderedDict
+from .theme import COLORS, FONTS
+
+class PathsView(tk.Frame):
+    """Scrollable list of explored (path, cost) entries that only formats the rows in view.
+
+    ``entries`` is anything with ``len()`` and indexing, such as a
+    SearchTrace, whose paths are then rebuilt one entry at a time as they
+    scroll into view. The position is (entry, line within that entry); the
+    scrollbar maps to entries, the wheel and arrows move by lines.
+    """
+    CACHE_SIZE = 256
+
+    def __init__(self, parent, height=10, width=40):
+        super().__init__(parent, bg=COLORS["surface"])
+        self.entries = None
+        self.total = 0
+        self.first = 0
+        self.offset = 0
+        self._formatted = OrderedDict()
+
+        h_scrollbar = ttk.Scrollbar(self, orient="horizontal")
+        h_scrollbar.pack(side=tk.BOTTOM, fill="x")
+        self.v_scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.v_scrollbar.pack(side=tk.RIGHT, fill="y")
+        self.text = tk.Text(self, height=height, width=width, font=FONTS["body"], wrap="none",
+                            xscrollcommand=h_scrollbar.set, state="disabled")
+        self.text.pack(side=tk.LEFT, fill="both", expand=True)
+        h_scrollbar.config(command=self.text.xview)
+        self._line_height = tkfont.Font(font=FONTS["body"]).metrics("linespace")
+
+        self.text.bind("<Configure>", lambda event: self.render())
+        self.text.bind("<MouseWheel>", lambda event: self.scroll_lines(-3 if event.delta > 0 else 3))
+        self.text.bind("<Button-4>", lambda event: self.scroll_lines(-3))
+        self.text.bind("<Button-5>", lambda event: self.scroll_lines(3))
+        for key, lines in (("<Up>", -1), ("<Down>", 1)):
+            self.text.bind(key, lambda event, n=lines: self.scroll_lines(n) or "break")
+        self.text.bind("<Prior>", lambda event: self.scroll_lines(-self.visible_lines()) or "break")
+        self.text.bind("<Next>", lambda event: self.scroll_lines(self.visible_lines()) or "break")
+
+    def set_entries(self, entries):
+        """Show ``entries`` from the top; showing the same object again keeps the position."""
+        if entries is self.entries:
+            return
+        self.entries = entries
+        # a trace counts more nodes than it keeps; only kept ones can be shown
+        self.total = getattr(entries, "retained", len(entries) if entries else 0)
+        self.first = self.offset = 0
+        self._formatted.clear()
+        self.render()
+
+    def visible_lines(self):
+        return max(1, self.text.winfo_height() // self._line_height)
+
+    def entry_lines(self, index):
+        """Formatted lines of entry ``index``, from a small cache of recently shown entries."""
+        lines = self._formatted.get(index)
+        if lines is None:
+            path, cost = self.entries[index]
+            lines = [f"Path {index + 1} (Cost: {cost}):", ""]
+            for state in path:
+                for row in state:
+                    lines.append("  " + "  ".join(" _" if num is None or num == 0 else f"{num:2d}" for num in row))
+                lines.append("")
+            lines.append("-" * 40)
+            self._formatted[index] = lines
+            if len(self._formatted) > self.CACHE_SIZE:
+                self._formatted.popitem(last=False)
+        else:
+            self._formatted.move_to_end(index)
+        return lines
+
+    def scroll_lines(self, count):
+        """Move the view ``count`` lines down (up when negative), clamped to the first and last entries."""
+        if not self.total:
+            return
+        offset = self.offset + count
+        first = self.first
+        while offset < 0 and first > 0:
+            first -= 1
+            offset += len(self.entry_lines(first))
+        while first < self.total - 1 and offset >= len(self.entry_lines(first)):
+            offset -= len(self.entry_lines(first))
+            first += 1
+        self.first = first
+        self.offset = max(0, min(offset, len(self.entry_lines(first)) - 1))
+        self.render()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if not self.total:
+            return
+        if action == "moveto":
+            self.first = min(self.total - 1, max(0, int(float(amount) * self.total)))
+            self.offset = 0
+            self.render()
+        else:
+            step = self.visible_lines() if unit == "pages" else 3
+            self.scroll_lines(int(amount) * step)
+
+    def render(self):
+        """Redraw the rows in view with a single insert."""
+        self.text.config(state="normal")
+        self.text.delete("1.0", tk.END)
+        if not self.total:
+            self.text.insert(tk.END, "No paths explored yet.")
+            self.text.config(state="disabled")
+            self.v_scrollbar.set(0, 1)
+            return
+        wanted = self.visible_lines()
+        lines = self.entry_lines(self.first)[self.offset:]
+        last = self.first
+        while len(lines) < wanted and last + 1 < self.total:
+            last += 1
+            lines += self.entry_lines(last)
+        if last == self.total - 1 and len(self.entries) > self.total:
+            lines.append(f"...and {len(self.entries) - self.total} more explored (not kept).")
+        self.text.insert(tk.END, "\n".join(lines[:wanted]))
+        self.text.config(state="disabled")
+        self.v_scrollbar.set(self.first / self.total, (last + 1) / self.total)
@@ -1,80 +1,163 @@
+import time
 import tkinter as tk
+from algorithms.utils import get_move_direction
+from constants import TILE_FRAME_MS
 from .theme import COLORS, FONTS, apply_style
 
 class PuzzleFrame(tk.Frame):
-    def __init__(self, parent, size=90, grid_size=3):  
+    """The board: one rectangle and label per tile, created once and moved as the state changes.
+
+    ``draw_state`` moves only the items whose cell changed; with a
+    ``duration`` it slides them there over that many milliseconds, one
+    ``after`` frame every TILE_FRAME_MS. States that arrive between frames
+    only retarget the slides, so a fast playback draws at most one frame per
+    tick however many steps it makes.
+    """
+    def __init__(self, parent, size=90, grid_size=3):
         super().__init__(parent, bg=COLORS["surface"])
         self.size = size
         self.grid_size = grid_size
         self.tiles = {}
         self.current_state = None
-        
+        self.rows = []  # current_state as a list of row tuples
+        self.drawn = {}  # tile value -> (x, y) of its top-left corner on the canvas
+        self.slides = {}  # tile value -> (from x, from y, to x, to y, start, duration)
+        self.frame_job = None
+
         self.canvas = tk.Canvas(
-            self, 
+            self,
             width=self.size * self.grid_size,
             height=self.size * self.grid_size,
             bg=COLORS["background"],
             highlightthickness=0
         )
-        self.canvas.pack(padx=10, pady=10)  
-        
+        self.canvas.pack(padx=10, pady=10)
+
         self.direction_label = tk.Label(self, text="", bg=COLORS["surface"])
         apply_style(self.direction_label, "label")
         self.direction_label.pack(pady=5)
 
-    def draw_state(self, state):
-        self.current_state = state
+    def build(self, state):
+        """Recreate every canvas item for ``state``; needed only when the set of tiles changes."""
+        self.stop_slides()
         self.canvas.delete("all")
-        
+        self.tiles = {}
+        self.rows = [tuple(row) for row in state]
+        self.drawn = {}
+
         self.canvas.create_rectangle(
-            0, 0, 
-            self.size * self.grid_size, 
+            0, 0,
+            self.size * self.grid_size,
             self.size * self.grid_size,
-            width=2, 
+            width=2,
             outline=COLORS["primary"]
         )
-        
+
         for i in range(self.grid_size):
             for j in range(self.grid_size):
                 value = state[i][j]
+                x0, y0 = j * self.size, i * self.size
+                x1, y1 = x0 + self.size, y0 + self.size
+                tag = f"tile{value}"
                 if value != 0:
-                    x0, y0 = j * self.size, i * self.size
-                    x1, y1 = x0 + self.size, y0 + self.size
-                    
                     tile = self.canvas.create_rectangle(
-                        x0 + 2, y0 + 2, 
+                        x0 + 2, y0 + 2,
                         x1 - 2, y1 - 2,
                         fill=COLORS["tile"],
                         outline=COLORS["primary_dark"],
-                        width=2
+                        width=2,
+                        tags=tag
                     )
-                    
+
                     text = self.canvas.create_text(
                         (x0 + x1) // 2,
                         (y0 + y1) // 2,
                         text=str(value),
                         fill=COLORS["on_primary"],
-                        font=FONTS["tile"]
+                        font=FONTS["tile"],
+                        tags=tag
                     )
-                    
+
                     self.tiles[value] = (tile, text)
                 else:
-                    x0, y0 = j * self.size, i * self.size
-                    x1, y1 = x0 + self.size, y0 + self.size
-                    
                     self.canvas.create_rectangle(
-                        x0 + 2, y0 + 2, 
+                        x0 + 2, y0 + 2,
                         x1 - 2, y1 - 2,
                         fill=COLORS["empty_tile"],
                         outline=COLORS["primary_light"],
                         width=1,
-                        dash=(4, 4)
+                        dash=(4, 4),
+                        tags=tag
                     )
-                    
+                    # the blank stays under the tile sliding into it
+                    self.canvas.tag_lower(tag)
+                self.drawn[value] = (x0, y0)
+
+    def draw_state(self, state, duration=0):
+        """Show ``state``, sliding a tile moved by one step over ``duration`` milliseconds; other changes jump."""
+        previous, self.current_state = self.current_state, state
+        if previous is None or len(state) != len(self.rows):
+            self.build(state)
+            return
+        moved = self.changed_cells(state)
+        if any(value not in self.drawn for value, _ in moved):
+            self.build(state)  # different tiles, not a rearrangement
+            return
+        if len(moved) > 2:
+            duration = 0
+        for value, (i, j) in moved:
+            target = (j * self.size, i * self.size)
+            if duration > 0 and value != 0:
+                x, y = self.drawn[value]
+                self.slides[value] = (x, y) + target + (time.perf_counter(), duration / 1000)
+            else:
+                # the blank jumps to the cell the sliding tile leaves
+                self.slides.pop(value, None)
+                self.place(value, *target)
+        if self.slides and self.frame_job is None:
+            self.frame_job = self.after(TILE_FRAME_MS, self.next_frame)
+
+    def changed_cells(self, state):
+        """(value, new cell) of each tile whose cell differs between the shown state and ``state``.
+
+        Whole rows are compared first, so a move touches at most two rows' cells.
+        """
+        moved = []
+        for i, row in enumerate(state):
+            row = tuple(row)
+            if row != self.rows[i]:
+                old = self.rows[i]
+                moved.extend((value, (i, j)) for j, value in enumerate(row) if value != old[j])
+                self.rows[i] = row
+        return moved
+
+    def place(self, value, x, y):
+        old_x, old_y = self.drawn[value]
+        if (x, y) != (old_x, old_y):
+            self.canvas.move(f"tile{value}", x - old_x, y - old_y)
+            self.drawn[value] = (x, y)
+
+    def next_frame(self):
+        self.frame_job = None
+        now = time.perf_counter()
+        for value, (x0, y0, x1, y1, start, duration) in list(self.slides.items()):
+            t = min(1.0, (now - start) / duration)
+            t = t * t * (3 - 2 * t)  # ease in and out
+            self.place(value, round(x0 + (x1 - x0) * t), round(y0 + (y1 - y0) * t))
+            if t >= 1.0:
+                del self.slides[value]
+        if self.slides:
+            self.frame_job = self.after(TILE_FRAME_MS, self.next_frame)
+
+    def stop_slides(self):
+        """Cancel the running slides, leaving every tile where it is."""
+        if self.frame_job is not None:
+            self.after_cancel(self.frame_job)
+            self.frame_job = None
+        self.slides.clear()
+
     def show_move(self, prev_state, curr_state):
-        from algorithms.utils import get_move_direction
         direction = get_move_direction(prev_state, curr_state)
-        if direction:
-            self.direction_label.config(text=f"Move: {direction.upper()}")
-        else:
-            self.direction_label.config(text="")
\ No newline at end of file
+        text = f"Move: {direction.upper()}" if direction else ""
+        if self.direction_label.cget("text") != text:
+            self.direction_label.config(text=text)
@@ -0,0 +1,19 @@
+from algorithms import astar, bidirectional_astar, bidirectional_ucs, ucs
+from algorithms.database import distance_to_goal
+from algorithms.utils import goal_state
+
+GOAL = goal_state(3)
+BOARDS = [((3, 0, 6), (2, 5, 7), (4, 1, 8)), ((0, 2, 4), (6, 3, 5), (8, 1, 7))]
+
+def test_cost_searches_match_the_weighted_table():
+    for start in BOARDS:
+        optimum = distance_to_goal(start, GOAL, weighted=True)
+        for search in (ucs, astar, bidirectional_ucs, bidirectional_astar):
+            _, costs, _ = search(start, GOAL)
+            assert costs[-1] == optimum, search.__name__
+
+def test_bidirectional_astar_expands_fewer_nodes_than_astar():
+    for start in BOARDS:
+        _, _, one_sided = astar(start, GOAL)
+        _, _, two_sided = bidirectional_astar(start, GOAL)
+        assert 4 * two_sided.stats.nodes_expanded < one_sided.stats.nodes_expanded
@@ -0,0 +1,17 @@
+from algorithms import astar, bfs, ida_star
+from algorithms.space import PackedSpace, get_space
+from algorithms.utils import calculate_costs
+
+START = ((0, 1), (3, 2))
+GOAL = ((1, 2), (3, 0))
+
+def test_even_width_uses_packed_space():
+    # vertical moves flip the tile parity on even widths, so no parity-class table fits
+    assert isinstance(get_space(START), PackedSpace)
+
+def test_2x2_searches_find_the_two_move_solution():
+    for search in (bfs, astar, ida_star):
+        path, costs, _ = search(START, GOAL)
+        assert path[0] == START and path[-1] == GOAL
+        assert len(path) == 3
+        assert costs == calculate_costs(path)
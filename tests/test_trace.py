@@ -0,0 +1,13 @@
+from algorithms import ida_star
+from algorithms.trace import SearchTrace
+from algorithms.utils import calculate_costs, goal_state
+
+GOAL = goal_state(3)
+# IDA* reaches many of this board's states again on other branches
+START = ((1, 8, 2), (3, 0, 5), (4, 7, 6))
+
+def test_ida_star_entries_follow_their_own_branch():
+    _, _, trace = ida_star(START, GOAL, trace=SearchTrace("full"))
+    for path, cost in trace:
+        assert path[0] == START
+        assert calculate_costs(path)[-1] == cost